@@ -0,0 +1,43 @@
+"""
+ Title:         Command Line
+ Description:   For running campaigns of optimisations from the command line
+ Author:        Janzen Choi
+
+"""
+
+# Libraries
+import argparse
+from moga_neml.campaign import Campaign
+
+def main() -> None:
+    """
+    Parses the command line arguments and runs the command; e.g.,
+    `python -m moga_neml campaign study.json --cores 8`
+    """
+
+    # Define the commands
+    parser = argparse.ArgumentParser(prog="moga_neml", description="Runs campaigns of MOGA optimisations")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    campaign_parser = subparsers.add_parser("campaign", help="runs (or resumes) the runs of a study specification")
+    campaign_parser.add_argument("spec", help="the path to the JSON file of the study specification")
+    campaign_parser.add_argument("--cores", type=int, default=None, help="the maximum number of runs at once")
+    campaign_parser.add_argument("--retry", action="store_true", help="runs the failed runs again")
+    status_parser = subparsers.add_parser("status", help="prints the status of the runs of a study specification")
+    status_parser.add_argument("spec", help="the path to the JSON file of the study specification")
+    run_parser = subparsers.add_parser("run", help="conducts a single run of a study specification")
+    run_parser.add_argument("spec", help="the path to the JSON file of the study specification")
+    run_parser.add_argument("run_name", help="the name of the run")
+    args = parser.parse_args()
+
+    # Run the command
+    campaign = Campaign(args.spec)
+    if args.command == "campaign":
+        campaign.run(args.cores, args.retry)
+        print("\n".join(campaign.get_summary()))
+    elif args.command == "status":
+        print("\n".join(campaign.get_summary()))
+    elif args.command == "run":
+        campaign.run_single(args.run_name)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,354 @@
+"""
+ Title:         Campaign
+ Description:   For running a campaign of optimisations over a bounded number of cores
+ Author:        Janzen Choi
+
+"""
+
+# Libraries
+import glob, json, os, re, signal, subprocess, sys, time
+from moga_neml.interface import Interface
+
+# Constants
+STATUS_FILE   = "campaign.json"
+LOG_FILE      = "log.txt"
+DONE_FILE     = "done.txt"
+POLL_TIME     = 1 # seconds between checking on the runs
+STUDY_KEYS    = ["title", "model", "data", "recorder", "optimise", "seeds", "repeats"]
+EXCLUDED_LIST = ["define_model", "read_data", "set_recorder", "optimise", "serve"]
+
+# The Campaign class
+class Campaign:
+
+    def __init__(self, spec_path:str):
+        """
+        Class for running the optimisations of a study specification, with each study
+        repeated over a number of seeds; the status and wall time of each run are
+        recorded, so that the campaign can be resumed after an interruption
+
+        Parameters:
+        * `spec_path`: The path to the JSON file of the study specification
+        """
+
+        # Read the specification
+        self.spec_path = os.path.abspath(spec_path)
+        with open(self.spec_path, "r") as file:
+            self.spec = json.load(file)
+        check_spec(self.spec)
+
+        # Define the paths, relative to the specification
+        spec_dir = os.path.dirname(self.spec_path)
+        self.name        = self.spec.get("name", os.path.splitext(os.path.basename(spec_path))[0])
+        self.input_path  = os.path.join(spec_dir, self.spec.get("input_path", "./data"))
+        self.output_path = os.path.join(spec_dir, self.spec.get("output_path", "./results"), get_slug(self.name))
+        self.status_path = f"{self.output_path}/{STATUS_FILE}"
+
+        # Define the runs
+        self.run_dict = {}
+        for i, study in enumerate(self.spec["studies"]):
+            for seed in get_seed_list(study):
+                run_name = f"{i+1}_{get_slug(study.get('title', 'study'))}_seed{seed}"
+                self.run_dict[run_name] = {"study": i, "seed": seed}
+
+    def get_run_names(self) -> list:
+        """
+        Returns the names of the runs, in order
+        """
+        return list(self.run_dict.keys())
+
+    def get_run_dir(self, run_name:str) -> str:
+        """
+        Gets the directory for the results of a run
+
+        Parameters:
+        * `run_name`: The name of the run
+
+        Returns the path to the directory
+        """
+        return f"{self.output_path}/{run_name}"
+
+    def load_status(self) -> dict:
+        """
+        Loads the status of the runs; the runs that were running when the campaign
+        was stopped are marked as interrupted, unless they are still running (e.g.,
+        because the campaign was killed before it could stop them)
+
+        Returns the dictionary of the status of each run
+        """
+        status_dict = {run_name: {"status": "pending", "attempts": 0, "wall_time": 0} for run_name in self.run_dict.keys()}
+        if os.path.exists(self.status_path):
+            with open(self.status_path, "r") as file:
+                status_dict.update(json.load(file))
+        for run_status in status_dict.values():
+            if run_status["status"] == "running" and not is_running(run_status.get("pid")):
+                run_status.update({"status": "interrupted", "pid": None, "wall_time": get_wall_time(run_status)})
+        return status_dict
+
+    def save_status(self, status_dict:dict) -> None:
+        """
+        Saves the status of the runs; the file is replaced in one step, so that
+        stopping the campaign while saving does not corrupt the status
+
+        Parameters:
+        * `status_dict`: The dictionary of the status of each run
+        """
+        os.makedirs(self.output_path, exist_ok=True)
+        temp_path = f"{self.status_path}.tmp"
+        with open(temp_path, "w") as file:
+            json.dump(status_dict, file, indent=4)
+        os.replace(temp_path, self.status_path)
+
+    def start_run(self, run_name:str) -> subprocess.Popen:
+        """
+        Starts a run in a new process group, so that the run and its workers can be
+        stopped together (for internal use only)
+
+        Parameters:
+        * `run_name`: The name of the run
+
+        Returns the process
+        """
+        run_dir = self.get_run_dir(run_name)
+        os.makedirs(run_dir, exist_ok=True)
+        env = dict(os.environ)
+        env["OMP_NUM_THREADS"] = str(self.spec.get("threads", 1))
+        package_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        python_path = [package_dir, env["PYTHONPATH"]] if "PYTHONPATH" in env else [package_dir]
+        env["PYTHONPATH"] = os.pathsep.join(python_path)
+        log_file = open(f"{run_dir}/{LOG_FILE}", "a")
+        command = [sys.executable, "-m", "moga_neml", "run", self.spec_path, run_name]
+        process = subprocess.Popen(command, stdout=log_file, stderr=subprocess.STDOUT, env=env, start_new_session=True)
+        log_file.close()
+        return process
+
+    def run(self, cores:int=None, retry:bool=False) -> dict:
+        """
+        Runs the runs that have not finished, keeping at most `cores` runs going at once;
+        interrupted runs continue from their latest checkpoint, and runs that are still
+        running from an earlier campaign are watched instead of being started again
+
+        Parameters:
+        * `cores`: The maximum number of runs at once; uses the specification's `cores`
+                   (or one) if undefined
+        * `retry`: Whether to run the failed runs again
+
+        Returns the dictionary of the status of each run
+        """
+
+        # Queue the runs that have not finished, and watch the runs that are still running
+        cores = self.spec.get("cores", 1) if cores == None else cores
+        status_dict = self.load_status()
+        skip_list = ["done", "running"] if retry else ["done", "failed", "running"]
+        queue = [run_name for run_name in self.run_dict.keys() if not status_dict[run_name]["status"] in skip_list]
+        running_dict = {run_name: None for run_name in self.run_dict.keys() if status_dict[run_name]["status"] == "running"}
+        self.save_status(status_dict)
+
+        # Stop the runs when the campaign is terminated, as when it is interrupted
+        previous_handler = signal.signal(signal.SIGTERM, stop_campaign)
+
+        # Start runs as cores become free, and record the runs as they finish
+        try:
+            while len(queue) > 0 or len(running_dict) > 0:
+                while len(queue) > 0 and len(running_dict) < cores:
+                    run_name = queue.pop(0)
+                    running_dict[run_name] = self.start_run(run_name)
+                    status_dict[run_name].update({"status": "running", "attempts": status_dict[run_name]["attempts"] + 1,
+                                                  "started": time.strftime("%Y-%m-%d %H:%M:%S"),
+                                                  "start_time": time.time(), "pid": running_dict[run_name].pid})
+                    self.save_status(status_dict)
+                time.sleep(POLL_TIME)
+                for run_name, process in list(running_dict.items()):
+                    if process != None:
+                        return_code = process.poll()
+                    elif not is_running(status_dict[run_name]["pid"]):
+                        return_code = 0 if os.path.exists(f"{self.get_run_dir(run_name)}/{DONE_FILE}") else None
+                    else:
+                        continue
+                    if process != None and return_code == None:
+                        continue
+                    running_dict.pop(run_name)
+                    status = "interrupted" if return_code == None else "done" if return_code == 0 else "failed"
+                    status_dict[run_name].update({"status": status, "return_code": return_code, "pid": None,
+                                                  "wall_time": get_wall_time(status_dict[run_name])})
+                    self.save_status(status_dict)
+
+        # Stop the runs if the campaign is stopped
+        finally:
+            signal.signal(signal.SIGTERM, previous_handler)
+            for run_name, process in running_dict.items():
+                try:
+                    os.killpg(status_dict[run_name]["pid"], signal.SIGTERM)
+                except ProcessLookupError:
+                    pass
+                if process != None:
+                    process.wait()
+                status_dict[run_name].update({"status": "interrupted", "pid": None,
+                                              "wall_time": get_wall_time(status_dict[run_name])})
+            self.save_status(status_dict)
+        return status_dict
+
+    def get_summary(self) -> list:
+        """
+        Returns a summary of the status and wall time of each run
+        """
+        status_dict = self.load_status()
+        summary = []
+        for run_name in self.run_dict.keys():
+            run_status = status_dict[run_name]
+            summary.append("{}: {} ({} attempts, {:0.1f}h)".format(run_name, run_status["status"],
+                           run_status["attempts"], float(run_status["wall_time"]) / 3600))
+        return summary
+
+    def run_single(self, run_name:str) -> None:
+        """
+        Conducts the optimisation of a run, continuing from the latest checkpoint of
+        an earlier attempt if there is one
+
+        Parameters:
+        * `run_name`: The name of the run
+        """
+
+        # Define the optimisation from the study
+        study = self.spec["studies"][self.run_dict[run_name]["study"]]
+        itf = Interface(study.get("title", ""), self.input_path, self.get_run_dir(run_name))
+        model_kwargs = dict(study["model"])
+        itf.define_model(model_kwargs.pop("name"), **model_kwargs)
+        for data in study["data"]:
+            itf.read_data(data["file"], **data.get("read_data", {}))
+            for key, value in data.items():
+                if not key in ["file", "read_data"]:
+                    call_method(itf, key, value)
+        for key, value in study.items():
+            if not key in STUDY_KEYS:
+                call_method(itf, key, value)
+        if "recorder" in study:
+            itf.set_recorder(**study["recorder"])
+
+        # Find the latest checkpoint and optimise
+        checkpoint_list = glob.glob(f"{self.get_run_dir(run_name)}/*/checkpoint.pkl")
+        resume_from = max(checkpoint_list, key=os.path.getmtime) if checkpoint_list != [] else None
+        itf.optimise(**study.get("optimise", {}), resume_from=resume_from, seed=self.run_dict[run_name]["seed"])
+
+        # Mark the run as done, for campaigns that did not start the run
+        open(f"{self.get_run_dir(run_name)}/{DONE_FILE}", "w").close()
+
+def check_spec(spec:dict) -> None:
+    """
+    Checks the study specification before any runs are started
+
+    Parameters:
+    * `spec`: The study specification
+    """
+    if not "studies" in spec or len(spec["studies"]) == 0:
+        raise ValueError("The specification must define at least one study!")
+    for study in spec["studies"]:
+        for key in ["model", "data"]:
+            if not key in study:
+                raise ValueError(f"The study '{study.get('title', '')}' must define the '{key}'!")
+        method_list = [(key, value) for data in study["data"] for key, value in data.items() if not key in ["file", "read_data"]]
+        method_list += [(key, value) for key, value in study.items() if not key in STUDY_KEYS]
+        for method, value in method_list:
+            if method.startswith("_") or method in EXCLUDED_LIST or not callable(getattr(Interface, method, None)):
+                raise ValueError(f"The study '{study.get('title', '')}' calls '{method}', which is not a supported function!")
+            get_call_list(method, value)
+
+def get_seed_list(study:dict) -> list:
+    """
+    Gets the seeds to run a study with
+
+    Parameters:
+    * `study`: The study
+
+    Returns the list of seeds
+    """
+    if "seeds" in study:
+        return study["seeds"]
+    return list(range(study.get("repeats", 1)))
+
+def get_slug(name:str) -> str:
+    """
+    Converts a name into a name that can be used for files
+
+    Parameters:
+    * `name`: The name
+
+    Returns the converted name
+    """
+    return re.sub(r"[^a-zA-Z0-9_]", "", name.replace(" ", "_"))
+
+def get_call_list(method:str, value) -> list:
+    """
+    Gets the calls of a function from its arguments in a study; a dictionary of `args`
+    and `kwargs` is passed as positional and keyword arguments, any other dictionary is
+    passed as keyword arguments, a list calls the function once for each item, and any
+    other value is passed as the only argument
+
+    Parameters:
+    * `method`: The name of the function
+    * `value`:  The arguments
+
+    Returns the list of the positional and keyword arguments of each call
+    """
+    if isinstance(value, list):
+        call_list = []
+        for item in value:
+            if isinstance(item, list):
+                raise ValueError(f"The arguments of '{method}' cannot be a list of lists; use {{\"args\": [...]}} for each call!")
+            call_list += get_call_list(method, item)
+        return call_list
+    if isinstance(value, dict) and len(value) > 0 and set(value.keys()) <= {"args", "kwargs"}:
+        if not isinstance(value.get("args", []), list) or not isinstance(value.get("kwargs", {}), dict):
+            raise ValueError(f"The 'args' and 'kwargs' of '{method}' must be a list and a dictionary!")
+        return [(value.get("args", []), value.get("kwargs", {}))]
+    if isinstance(value, dict):
+        return [([], value)]
+    return [([value], {})]
+
+def call_method(itf:Interface, method:str, value) -> None:
+    """
+    Calls a function of the interface (see `get_call_list`)
+
+    Parameters:
+    * `itf`:    The interface
+    * `method`: The name of the function
+    * `value`:  The arguments
+    """
+    function = getattr(itf, method)
+    for args, kwargs in get_call_list(method, value):
+        function(*args, **kwargs)
+
+def is_running(pid:int) -> bool:
+    """
+    Checks whether the process group of a run is still running
+
+    Parameters:
+    * `pid`: The process ID of the run (i.e., the ID of its process group)
+
+    Returns whether the run is still running
+    """
+    if pid == None:
+        return False
+    try:
+        os.killpg(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+def get_wall_time(run_status:dict) -> float:
+    """
+    Gets the total wall time of a run, including its current attempt
+
+    Parameters:
+    * `run_status`: The status of the run
+
+    Returns the wall time in seconds
+    """
+    return run_status["wall_time"] + time.time() - run_status.get("start_time", time.time())
+
+def stop_campaign(*_) -> None:
+    """
+    Stops the campaign when it is terminated, so that its runs are stopped too
+    """
+    raise KeyboardInterrupt
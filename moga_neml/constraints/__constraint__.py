@@ -66,6 +66,15 @@ class __Constraint__:
         """
         return self.curve_list
 
+    def get_field_dict(self) -> dict:
+        """
+        Gets the fields of the predicted data that the constraint reads, mapped to "all" if
+        all their values are read or "last" if only their last value (i.e., row) is read; the
+        other fields are not kept, so constraints reading other fields must override this
+        """
+        label_list = [label for label in [self.x_label, self.y_label] if label != ""]
+        return {label: "all" for label in label_list}
+
     def get_model(self) -> __Model__:
         """
         Gets the model
@@ -16,7 +16,7 @@ class Constraint(__Constraint__):
         Checks whether a constraint has been passed or not (must be overridden)
         
         Parameters:
-        * `prd_data_list`: List of predicted data dictionaries
+        * `prd_data_list`: List of predicted data
         
         Returns the results of the check
         """
@@ -29,7 +29,7 @@ class Constraint(__Constraint__):
         # Get map of first field to end point of second field
         for i in range(len(prd_data_list)):
             stress = curve_list[i].get_exp_data()["stress"]
-            prd_dict[stress] = prd_data_list[i][x_label][-1]
+            prd_dict[stress] = prd_data_list[i].get_end(x_label)
 
         # Sort the map in ascending order
         sorted_items = sorted(prd_dict.items(), key=lambda x: x[0])
@@ -8,26 +8,33 @@
 
 # Libraries
 from moga_neml.errors.__error__ import __Error__
-from moga_neml.helper.interpolator import Interpolator
-import math, numpy as np
+from moga_neml.helper.interpolator import Interpolator, LookupTable, check_mode
+import numpy as np
 
 # The Area class
 class Error(__Error__):
     
-    def initialise(self, num_points:int=50, max_value:float=None):
+    def initialise(self, num_points:int=50, max_value:float=None, interpolation:str="spline", lookup:bool=False):
         """
         Runs at the start, once
 
         Parameters:
-        * `num_points`: Number of points to evaluate
-        * `max_value`:  Maximum value to evaluate to
+        * `num_points`:    Number of points to evaluate
+        * `max_value`:     Maximum value to evaluate to
+        * `interpolation`: The interpolation of the predicted data ("spline", "linear", or "pchip")
+        * `lookup`:        Whether to look up the experimental data in a precomputed table rather
+                           than evaluating its interpolation; this is faster for large values
+                           of `num_points`, but changes the error by up to about 1e-4 (relative)
         """
-        self.num_points   = num_points
-        x_list            = self.get_x_data()
-        y_list            = self.get_y_data()
-        self.interpolator = Interpolator(x_list, y_list, self.num_points)
-        self.exp_x_end    = min(x_list[-1], max_value) if max_value != None else x_list[-1]
-        self.avg_abs_y    = np.average([abs(y) for y in y_list])
+        check_mode(interpolation)
+        self.num_points       = num_points
+        self.interpolation    = interpolation
+        x_list                = np.asarray(self.get_x_data())
+        y_list                = np.asarray(self.get_y_data())
+        self.exp_x_end        = min(x_list[-1], max_value) if max_value != None else x_list[-1]
+        interpolator          = Interpolator(x_list, y_list, self.num_points)
+        self.exp_interpolator = LookupTable(interpolator, x_list[0], self.exp_x_end) if lookup else interpolator
+        self.avg_abs_y        = np.average(np.abs(y_list))
 
     def get_value(self, prd_data:dict) -> float:
         """
@@ -42,11 +49,12 @@ class Error(__Error__):
         # Get predicted data
         x_label          = self.get_x_label()
         y_label          = self.get_y_label()
-        prd_x_list       = np.linspace(prd_data[x_label][0], min(self.exp_x_end, prd_data[x_label][-1]), self.num_points)
-        prd_interpolator = Interpolator(prd_data[x_label], prd_data[y_label], self.num_points)
+        prd_x_list       = np.linspace(prd_data[x_label][0], min(self.exp_x_end, prd_data.get_end(x_label)), self.num_points)
+        prd_interpolator = prd_data.get_interpolator(x_label, y_label, self.num_points, self.interpolation)
         prd_y_list       = prd_interpolator.evaluate(prd_x_list)
 
         # Get experimental data and calculate error
-        exp_y_list = self.interpolator.evaluate(prd_x_list)
-        area = [math.pow(prd_y_list[i] - exp_y_list[i], 2) for i in range(self.num_points) if prd_x_list[i] <= self.exp_x_end]
-        return math.sqrt(np.average(area)) / self.avg_abs_y
+        exp_y_list = self.exp_interpolator.evaluate(prd_x_list)
+        in_range   = prd_x_list <= self.exp_x_end
+        area       = np.square(prd_y_list[in_range] - exp_y_list[in_range])
+        return np.sqrt(np.average(area)) / self.avg_abs_y
@@ -7,24 +7,27 @@
 """
 
 # Libraries
-import math, numpy as np
+import numpy as np
 from moga_neml.errors.__error__ import __Error__
-from moga_neml.helper.interpolator import Interpolator
+from moga_neml.helper.interpolator import Interpolator, check_mode
 
 # The Custom Area class
 class Error(__Error__):
     
-    def initialise(self, values:list):
+    def initialise(self, values:list, interpolation:str="spline"):
         """
         Runs at the start, once
 
         Parameters:
-        * `values`: The x values to query to calculate the area error
+        * `values`:        The x values to query to calculate the area error
+        * `interpolation`: The interpolation of the predicted data ("spline", "linear", or "pchip")
         """
-        interpolator    = Interpolator(self.get_x_data(), self.get_y_data())
-        self.exp_x_list = values
-        self.exp_y_list = interpolator.evaluate(values)
-        self.avg_abs_y  = np.average([abs(y) for y in self.exp_y_list])
+        check_mode(interpolation)
+        self.interpolation = interpolation
+        interpolator       = Interpolator(self.get_x_data(), self.get_y_data())
+        self.exp_x_list    = np.asarray(values)
+        self.exp_y_list    = interpolator.evaluate(self.exp_x_list)
+        self.avg_abs_y     = np.average(np.abs(self.exp_y_list))
 
     def get_value(self, prd_data:dict) -> float:
         """
@@ -37,7 +40,7 @@ class Error(__Error__):
         """
         x_label = self.get_x_label()
         y_label = self.get_y_label()
-        interpolator = Interpolator(prd_data[x_label], prd_data[y_label])
+        interpolator = prd_data.get_interpolator(x_label, y_label, mode=self.interpolation)
         prd_y_list = interpolator.evaluate(self.exp_x_list)
-        area = [math.pow(prd_y_list[i] - self.exp_y_list[i], 2) for i in range(len(prd_y_list))]
-        return math.sqrt(np.average(area)) / self.avg_abs_y
+        area = np.square(prd_y_list - self.exp_y_list)
+        return np.sqrt(np.average(area)) / self.avg_abs_y
@@ -7,10 +7,8 @@
 """
 
 # Libraries
-import math, numpy as np
+import numpy as np
 from moga_neml.errors.__error__ import __Error__
-from moga_neml.helper.data import get_thinned_list
-from moga_neml.helper.derivative import differentiate_curve
 from moga_neml.helper.interpolator import Interpolator
 
 # Constants
@@ -23,12 +21,12 @@ class Error(__Error__):
         """
         Runs at the start, once
         """
-        x_list = self.get_x_data()
-        y_list = self.get_y_data()
+        x_list = np.asarray(self.get_x_data())
+        y_list = np.asarray(self.get_y_data())
         self.interpolator = Interpolator(x_list, y_list, NUM_POINTS)
         self.interpolator.differentiate()
         self.exp_x_end = x_list[-1]
-        self.avg_abs_dy = np.average([abs(y) for y in self.interpolator.evaluate(x_list)])
+        self.avg_abs_dy = np.average(np.abs(self.interpolator.evaluate(x_list)))
 
     def get_value(self, prd_data:dict) -> float:
         """
@@ -41,9 +39,9 @@ class Error(__Error__):
         """
         x_label = self.get_x_label()
         y_label = self.get_y_label()
-        prd_data[x_label] = get_thinned_list(prd_data[x_label], NUM_POINTS)
-        prd_data[y_label] = get_thinned_list(prd_data[y_label], NUM_POINTS)
-        prd_data = differentiate_curve(prd_data, x_label, y_label)
-        exp_dy_list = self.interpolator.evaluate(prd_data[x_label])
-        area = [math.pow(prd_data[y_label][i] - exp_dy_list[i], 2) for i in range(len(prd_data[y_label])) if prd_data[x_label][i] <= self.exp_x_end]
-        return math.sqrt(np.average(area)) / self.avg_abs_dy
+        prd_x_list = prd_data.get_thinned(x_label, NUM_POINTS)
+        prd_dy_list = prd_data.get_derivative(x_label, y_label).evaluate(prd_x_list)
+        exp_dy_list = self.interpolator.evaluate(prd_x_list)
+        in_range = prd_x_list <= self.exp_x_end
+        area = np.square(prd_dy_list[in_range] - exp_dy_list[in_range])
+        return np.sqrt(np.average(area)) / self.avg_abs_dy
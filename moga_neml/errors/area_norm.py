@@ -7,28 +7,34 @@
 """
 
 # Libraries
-import math, numpy as np
+import numpy as np
 from moga_neml.errors.__error__ import __Error__
-from moga_neml.helper.interpolator import Interpolator
+from moga_neml.helper.interpolator import Interpolator, check_mode
 
 # The Normalised Area class
 class Error(__Error__):
     
-    def initialise(self, num_points:int=50):
+    def initialise(self, num_points:int=50, interpolation:str="spline"):
         """
         Runs at the start, once
+
+        Parameters:
+        * `num_points`:    Number of points to evaluate
+        * `interpolation`: The interpolation of the predicted data ("spline", "linear", or "pchip")
         """
 
         # Get normalised data
-        self.num_points = num_points
-        x_list          = self.get_x_data()
-        y_list          = self.get_y_data()
-        exp_interp      = Interpolator(normalise(x_list), y_list, self.num_points)
+        check_mode(interpolation)
+        self.num_points    = num_points
+        self.interpolation = interpolation
+        x_list             = self.get_x_data()
+        y_list             = self.get_y_data()
+        exp_interp         = Interpolator(normalise(x_list), y_list, self.num_points)
 
         # Precalculate values
         self.x_list     = np.linspace(0.0, 1.0, self.num_points)
         self.exp_y_list = exp_interp.evaluate(self.x_list)
-        self.avg_abs_y  = np.average([abs(y) for y in self.exp_y_list])
+        self.avg_abs_y  = np.average(np.abs(self.exp_y_list))
 
     def get_value(self, prd_data:dict) -> float:
         """
@@ -43,23 +49,23 @@ class Error(__Error__):
         # Get normalised predicted data
         x_label = self.get_x_label()
         y_label = self.get_y_label()
-        prd_interp = Interpolator(normalise(prd_data[x_label]), prd_data[y_label], self.num_points)
+        prd_interp = Interpolator(normalise(prd_data.get_array(x_label)), prd_data.get_array(y_label), self.num_points, mode=self.interpolation)
 
         # Calculate error
         prd_y_list = prd_interp.evaluate(self.x_list)
-        area = [math.pow(prd_y_list[i] - self.exp_y_list[i], 2) for i in range(self.num_points)]
-        return math.sqrt(np.average(area)) / self.avg_abs_y
+        area = np.square(prd_y_list - self.exp_y_list)
+        return np.sqrt(np.average(area)) / self.avg_abs_y
 
-def normalise(value_list:list) -> list:
+def normalise(value_list:list) -> np.ndarray:
     """
     Normalises a list of values to [0, 1]
 
     Parameters:
     * `value_list`: The list of values
 
-    Returns the normalised list of values
+    Returns the normalised array of values
     """
-    min_value = min(value_list)
-    max_value = max(value_list)
-    value_list = [(value - min_value) / (max_value - min_value) for value in value_list]
-    return value_list
+    value_list = np.asarray(value_list)
+    min_value = np.min(value_list)
+    max_value = np.max(value_list)
+    return (value_list - min_value) / (max_value - min_value)
@@ -7,6 +7,7 @@
 """
 
 # Libraries
+import numpy as np
 from moga_neml.errors.__error__ import __Error__
 
 # The maximum value class
@@ -31,9 +32,7 @@ class Error(__Error__):
         """
         x_label = self.get_x_label()
         y_label = self.get_y_label()
-        x_list = list(prd_data[x_label])
-        y_list = list(prd_data[y_label])
-        prd_arg_max = find_arg_max(x_list, y_list)
+        prd_arg_max = prd_data.get_arg_max(x_label, y_label)
         return abs(self.exp_arg_max - prd_arg_max) / self.exp_arg_max
 
 def find_arg_max(x_list:list, y_list:list):
@@ -46,6 +45,6 @@ def find_arg_max(x_list:list, y_list:list):
     
     Returns the x value
     """
-    max_y_index = y_list.index(max(y_list))
+    max_y_index = np.argmax(y_list)
     arg_max = x_list[max_y_index]
     return arg_max
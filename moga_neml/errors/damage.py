@@ -17,6 +17,12 @@ class Error(__Error__):
         """
         self.model = self.get_model()
 
+    def get_field_dict(self) -> dict:
+        """
+        Only reads the last row of the history
+        """
+        return {"history": "last"}
+
     def get_value(self, prd_data:dict) -> float:
         """
         Computing the NRMSE
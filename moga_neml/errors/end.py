@@ -28,5 +28,5 @@ class Error(__Error__):
         Returns the error
         """
         x_label = self.get_x_label()
-        prd_end_value = prd_data[x_label][-1]
+        prd_end_value = prd_data.get_end(x_label)
         return abs((prd_end_value - self.exp_x_end) / self.exp_x_end)
\ No newline at end of file
@@ -28,5 +28,5 @@ class Error(__Error__):
         Returns the error
         """
         x_label = self.get_x_label()
-        prd_x_end = prd_data[x_label][-1]
+        prd_x_end = prd_data.get_end(x_label)
         return abs(prd_x_end / self.max_x)
\ No newline at end of file
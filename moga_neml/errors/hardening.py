@@ -27,6 +27,12 @@ class Error(__Error__):
         self.strain_1 = strain_1 if strain_1 != None else max(exp_data["strain"])
         self.exp_hardening = self.get_hardening(exp_data["strain"], exp_data["stress"])
 
+    def get_field_dict(self) -> dict:
+        """
+        Reads the strain and stress, regardless of the labels
+        """
+        return {"strain": "all", "stress": "all"}
+
     def get_value(self, prd_data:dict) -> float:
         """
         Computing the NRMSE
@@ -36,7 +42,7 @@ class Error(__Error__):
 
         Returns the error
         """
-        prd_hardening = self.get_hardening(prd_data["strain"], prd_data["stress"])
+        prd_hardening = self.get_hardening(prd_data.get_array("strain"), prd_data.get_array("stress"))
         return abs((self.exp_hardening - prd_hardening) / self.exp_hardening)
 
     def get_hardening(self, strain_list:list, stress_list:list):
@@ -49,10 +55,7 @@ class Error(__Error__):
 
         Returns the calculated elastic modulus
         """
-        new_strain_list, new_stress_list = [], []
-        for i in range(len(strain_list)):
-            if strain_list[i] >= self.strain_0 and strain_list[i] <= self.strain_1:
-                new_strain_list.append(strain_list[i])
-                new_stress_list.append(stress_list[i])
-        hardening = np.polyfit(new_strain_list, new_stress_list, 1)[0]
+        strain_list = np.asarray(strain_list)
+        in_range = (strain_list >= self.strain_0) & (strain_list <= self.strain_1)
+        hardening = np.polyfit(strain_list[in_range], np.asarray(stress_list)[in_range], 1)[0]
         return hardening
\ No newline at end of file
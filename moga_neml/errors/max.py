@@ -6,6 +6,7 @@
 """
 
 # Libraries
+import numpy as np
 from moga_neml.errors.__error__ import __Error__
 
 # The maximum value class
@@ -16,7 +17,7 @@ class Error(__Error__):
         Runs at the start, once
         """
         x_list = self.get_x_data()
-        self.x_max = abs(max(x_list))
+        self.x_max = abs(np.max(x_list))
         
     def get_value(self, prd_data:dict) -> float:
         """
@@ -28,4 +29,4 @@ class Error(__Error__):
         Returns the error
         """
         x_label = self.get_x_label()
-        return abs(self.x_max - max(prd_data[x_label])) / self.x_max
+        return abs(self.x_max - prd_data.get_max(x_label)) / self.x_max
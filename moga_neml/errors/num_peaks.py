@@ -9,6 +9,10 @@
 from moga_neml.errors.__error__ import __Error__
 from moga_neml.helper.derivative import get_stationary_points
 
+# Constants
+WINDOW     = 0.2
+ACCEPTANCE = 0.9
+
 # The Error class
 class Error(__Error__):
     
@@ -20,7 +24,8 @@ class Error(__Error__):
         exp_data = self.get_exp_data()
         self.x_label = self.get_x_label()
         self.y_label = self.get_y_label()
-        self.exp_num_cycles = get_cycle(exp_data, self.x_label, self.y_label)
+        sp_list = get_stationary_points(exp_data, self.x_label, self.y_label, WINDOW, ACCEPTANCE)
+        self.exp_num_cycles = len(sp_list)
 
     def get_value(self, prd_data:dict) -> float:
         """
@@ -31,18 +36,5 @@ class Error(__Error__):
 
         Returns the error
         """
-        prd_num_cycles = get_cycle(prd_data, self.x_label, self.y_label)
+        prd_num_cycles = len(prd_data.get_stationary_points(self.x_label, self.y_label, WINDOW, ACCEPTANCE))
         return abs(self.exp_num_cycles - prd_num_cycles) / self.exp_num_cycles
-
-def get_cycle(data_dict:dict, x_label:str, y_label:str) -> int:
-    """
-    Gets the number of cycles
-
-    Parameters:
-    * `data_dict`: The data dictionary
-    * `x_label`:   The label for the x axis
-    * `y_label`:   The label for the y axis
-    
-    Returns the number of cycles
-    """
-    return len(get_stationary_points(data_dict, x_label, y_label, 0.2, 0.9))
@@ -7,10 +7,14 @@
  """
 
 # Libraries
-import math, numpy as np
+import numpy as np
 from moga_neml.errors.__error__ import __Error__
 from moga_neml.helper.derivative import get_stationary_points
 
+# Constants
+WINDOW     = 0.2
+ACCEPTANCE = 0.9
+
 # The Error class
 class Error(__Error__):
     
@@ -22,7 +26,8 @@ class Error(__Error__):
         exp_data = self.get_exp_data()
         self.x_label = self.get_x_label()
         self.y_label = self.get_y_label()
-        self.exp_x_peaks = get_x_peaks(exp_data, self.x_label, self.y_label)
+        sp_list = get_stationary_points(exp_data, self.x_label, self.y_label, WINDOW, ACCEPTANCE)
+        self.exp_x_peaks = get_x_peaks(sp_list, self.x_label)
         self.avg_exp_x = np.average(self.exp_x_peaks)
 
     def get_value(self, prd_data:dict) -> float:
@@ -34,22 +39,21 @@ class Error(__Error__):
 
         Returns the error
         """
-        prd_x_peaks = get_x_peaks(prd_data, self.x_label, self.y_label)
+        sp_list = prd_data.get_stationary_points(self.x_label, self.y_label, WINDOW, ACCEPTANCE)
+        prd_x_peaks = get_x_peaks(sp_list, self.x_label)
         min_peaks = min(len(self.exp_x_peaks), len(prd_x_peaks))
-        dist_list = [math.pow(self.exp_x_peaks[i] - prd_x_peaks[i], 2) for i in range(min_peaks)]
-        return math.sqrt(np.average(dist_list)) / self.avg_exp_x
+        dist_list = np.square(self.exp_x_peaks[:min_peaks] - prd_x_peaks[:min_peaks])
+        return np.sqrt(np.average(dist_list)) / self.avg_exp_x
 
-def get_x_peaks(data_dict:dict, x_label:str, y_label:str) -> int:
+def get_x_peaks(sp_list:list, x_label:str) -> np.ndarray:
     """
-    Gets the number of peaks
+    Gets the x values of the peaks
 
     Parameters:
-    * `data_dict`: The data dictionary
-    * `x_label`:   The label for the x axis
-    * `y_label`:   The label for the y axis
+    * `sp_list`: The list of stationary points
+    * `x_label`: The label for the x axis
     
-    Returns the number of peaks
+    Returns the x values of the peaks
     """
-    sp_list = get_stationary_points(data_dict, x_label, y_label, 0.2, 0.9)
-    x_peaks = [sp[x_label] for sp in sp_list]
+    x_peaks = np.array([sp[x_label] for sp in sp_list])
     return x_peaks
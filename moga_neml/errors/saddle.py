@@ -9,7 +9,7 @@
 
 # Libraries
 from moga_neml.errors.__error__ import __Error__
-import math, numpy as np
+import numpy as np
 
 # The Saddle class
 class Error(__Error__):
@@ -23,13 +23,13 @@ class Error(__Error__):
         """
         self.enforce_data_type("cyclic")
         self.tolerance   = tolerance
-        x_list           = self.get_x_data()
-        y_list           = self.get_y_data()
+        x_list           = np.asarray(self.get_x_data())
+        y_list           = np.asarray(self.get_y_data())
         exp_dy_dx        = np.gradient(y_list, x_list)
         sp_indexes       = np.where(np.diff(np.sign(exp_dy_dx)))[0]
-        self.exp_sp_list = group_sp(np.array(y_list)[sp_indexes], tolerance)
+        self.exp_sp_list = group_sp(y_list[sp_indexes], tolerance)
         self.exp_sp_list = remove_zero_sp(self.exp_sp_list, tolerance)
-        self.avg_abs_sp  = np.average([abs(sp) for sp in self.exp_sp_list])
+        self.avg_abs_sp  = np.average(np.abs(self.exp_sp_list))
         
     def get_value(self, prd_data:dict) -> float:
         """
@@ -44,39 +44,38 @@ class Error(__Error__):
         # Get the predicted stationary points
         x_label     = self.get_x_label()
         y_label     = self.get_y_label()
-        prd_dy_dx   = np.gradient(prd_data[y_label], prd_data[x_label])
+        prd_y_list  = prd_data.get_array(y_label)
+        prd_dy_dx   = np.gradient(prd_y_list, prd_data.get_array(x_label))
         sp_indexes  = np.where(np.diff(np.sign(prd_dy_dx)))[0]
-        prd_sp_list = group_sp(np.array(prd_data[y_label])[sp_indexes], self.tolerance)
+        prd_sp_list = group_sp(prd_y_list[sp_indexes], self.tolerance)
+
+        # Check if there are any stationary points to compare
+        min_sp = min(len(self.exp_sp_list), len(prd_sp_list))
+        if min_sp == 0:
+            return
 
         # Calculate the discrepancies between the stationary points
-        discrepancy_list = []
-        for i in range(min(len(self.exp_sp_list), len(prd_sp_list))):
-            discrepancy = math.pow(self.exp_sp_list[i] - prd_sp_list[i], 2)
-            discrepancy_list.append(discrepancy)
-        return math.sqrt(np.average(discrepancy_list)) / self.avg_abs_sp
+        discrepancy_list = np.square(self.exp_sp_list[:min_sp] - prd_sp_list[:min_sp])
+        return np.sqrt(np.average(discrepancy_list)) / self.avg_abs_sp
 
-def group_sp(y_list:list, tolerance:float):
+def group_sp(y_list:list, tolerance:float) -> np.ndarray:
     """
-    Groups the stationary points together
+    Groups the stationary points together; consecutive values closer
+    than the tolerance are in the same group
 
     Parameters:
     * `y_list`:    The list of values being grouped
     * `tolerance`: The tolerance used for the grouping
     
-    Returns the grouped stationary points
+    Returns the grouped stationary points; empty if there are no stationary points
     """
-    sp_list = []
-    curr_group = [y_list[0]]
-    for y in y_list[1:]:
-        if abs(y - curr_group[-1]) < tolerance:
-            curr_group.append(y)
-        else:
-            sp_list.append(np.average(curr_group))
-            curr_group = [y]
-    sp_list.append(np.average(curr_group))
-    return sp_list
+    y_list = np.asarray(y_list)
+    if len(y_list) == 0:
+        return y_list
+    split_indexes = np.where(np.abs(np.diff(y_list)) >= tolerance)[0] + 1
+    return np.array([np.average(group) for group in np.split(y_list, split_indexes)])
 
-def remove_zero_sp(y_list:list, tolerance:float):
+def remove_zero_sp(y_list:list, tolerance:float) -> np.ndarray:
     """
     Removes stationary points close to 0
 
@@ -86,5 +85,5 @@ def remove_zero_sp(y_list:list, tolerance:float):
     
     Returns the non-close-to-zero stationary points
     """
-    y_list = [y for y in y_list if abs(y) > tolerance]
-    return y_list
+    y_list = np.asarray(y_list)
+    return y_list[np.abs(y_list) > tolerance]
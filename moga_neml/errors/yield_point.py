@@ -8,9 +8,8 @@
 
 # Libraries
 import math, numpy as np
-import scipy.interpolate as inter
-import scipy.optimize as opt
 from moga_neml.errors.__error__ import __Error__
+from moga_neml.helper.data import get_yield
 from moga_neml.optimise.controller import BIG_VALUE
 
 # The Error class
@@ -42,6 +41,12 @@ class Error(__Error__):
             self.exp_yield = get_yield(exp_data["strain"], exp_data["stress"], self.offset)
         self.mag_yield = math.sqrt(math.pow(self.exp_yield[0], 2) + math.pow(self.exp_yield[1], 2))
 
+    def get_field_dict(self) -> dict:
+        """
+        Reads the strain and stress, regardless of the labels
+        """
+        return {"strain": "all", "stress": "all"}
+
     # Computes the error value
     def get_value(self, prd_data:dict) -> float:
         """
@@ -53,27 +58,9 @@ class Error(__Error__):
         Returns the error
         """
         try:
-            prd_yield = get_yield(prd_data["strain"], prd_data["stress"], self.offset)
+            prd_yield = prd_data.get_yield(self.offset)
         except ValueError:
             return BIG_VALUE
         distance = math.sqrt(math.pow(self.exp_yield[0] - prd_yield[0], 2) + math.pow(self.exp_yield[1] - prd_yield[1], 2))
         return distance / self.mag_yield
         # return abs((prd_yield[1] - self.exp_yield[1]) / self.exp_yield[1])
-
-def get_yield(strain_list:list, stress_list:list, offset:float=0.002) -> tuple:
-    """
-    Calculates the yield strain and stress
-
-    Parameters:
-    * `strain_list`: The list of strain values
-    * `stress_list`: The list of stress values
-    * `offset`:      The offset used to determine the yield point
-
-    Returns the yield strain and stress
-    """
-    youngs = stress_list[1] / strain_list[1] # NEML produces noiseless curves
-    sfn = inter.interp1d(strain_list, stress_list, bounds_error=False, fill_value=0)
-    tfn = lambda e: youngs * (e - offset)
-    yield_strain = opt.brentq(lambda e: sfn(e) - tfn(e), 0.0, np.max(strain_list))
-    yield_stress = float(tfn(yield_strain))
-    return yield_strain, yield_stress
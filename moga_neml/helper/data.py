@@ -6,7 +6,9 @@
 """
 
 # Libraries
-import math, numpy as np
+import math, sys, numpy as np
+import scipy.interpolate as inter
+import scipy.optimize as opt
 from copy import deepcopy
 
 def exclude_outliers(x_list:list, y_list:list):
@@ -39,13 +41,24 @@ def get_thinned_list(unthinned_list:list, density:int) -> list:
 
     Returns the thinned list
     """
-    src_data_size = len(unthinned_list)
-    step_size = src_data_size / density
-    thin_indexes = [math.floor(step_size*i) for i in range(1, density - 1)]
-    thin_indexes = [0] + thin_indexes + [src_data_size - 1]
+    thin_indexes = get_thin_indexes(len(unthinned_list), density)
     thinned_list = [unthinned_list[i] for i in thin_indexes]
     return thinned_list
 
+def get_thin_indexes(src_data_size:int, density:int) -> np.ndarray:
+    """
+    Gets the indexes of the values kept when thinning a list
+
+    Parameters:
+    * `src_data_size`: The size of the list before thinning
+    * `density`:       The goal density of the thinned list
+
+    Returns the array of indexes
+    """
+    step_size = src_data_size / density
+    thin_indexes = np.floor(step_size * np.arange(1, density - 1)).astype(int)
+    return np.concatenate(([0], thin_indexes, [src_data_size - 1])).astype(int)
+
 def get_custom_thin_indexes(src_data_size:int, dst_data_size:int, distribution) -> list:
     """
     Returns a list of indexes corresponding to thinned data based on
@@ -72,12 +85,31 @@ def find_tensile_strain_to_failure(stress_list:list) -> int:
 
     Returns the closest index if found; otherwise, return None
     """
-    stress_to_failure = max(stress_list) * 0.80
-    max_index = stress_list.index(max(stress_list))
-    for i in range(max_index, len(stress_list)):
-        if stress_list[i] < stress_to_failure:
-            return i
-    return None
+    stress_list = np.asarray(stress_list)
+    max_index = np.argmax(stress_list)
+    failure_indexes = np.flatnonzero(stress_list[max_index:] < stress_list[max_index] * 0.80)
+    if len(failure_indexes) == 0:
+        return None
+    return int(max_index + failure_indexes[0])
+
+def get_data_size(data_dict:dict) -> int:
+    """
+    Estimates the memory used by a curve
+
+    Parameters:
+    * `data_dict`: The curve
+
+    Returns the estimated number of bytes
+    """
+    data_size = sys.getsizeof(data_dict)
+    for value in data_dict.values():
+        if isinstance(value, np.ndarray):
+            data_size += value.nbytes
+            continue
+        data_size += sys.getsizeof(value)
+        if isinstance(value, list):
+            data_size += sum([sys.getsizeof(item) for item in value])
+    return data_size
 
 def remove_data_after(exp_data:dict, x_value:float, x_label:str) -> dict:
     """
@@ -91,19 +123,34 @@ def remove_data_after(exp_data:dict, x_value:float, x_label:str) -> dict:
     Returns the curve after data removal
     """
 
-    # Initialise new curve
-    new_exp_data = deepcopy(exp_data)
-    for header in new_exp_data.keys():
-        if isinstance(new_exp_data[header], list) and len(exp_data[header]) == len(exp_data[x_label]):
-            new_exp_data[header] = []
-            
-    # Remove data after specific value
-    for i in range(len(exp_data[x_label])):
-        if exp_data[x_label][i] > x_value:
-            break
-        for header in new_exp_data.keys():
-            if isinstance(new_exp_data[header], list) and len(exp_data[header]) == len(exp_data[x_label]):
-                new_exp_data[header].append(exp_data[header][i])
-    
-    # Return new data
+    # Find the first value after the specific value
+    x_list = np.asarray(exp_data[x_label])
+    after_indexes = np.flatnonzero(x_list > x_value)
+    end_index = after_indexes[0] if len(after_indexes) > 0 else len(x_list)
+
+    # Slice the lists (or arrays) of data with the same size
+    new_exp_data = {}
+    for header, value in exp_data.items():
+        if isinstance(value, (list, np.ndarray)) and len(value) == len(x_list):
+            new_exp_data[header] = value[:end_index]
+        else:
+            new_exp_data[header] = deepcopy(value)
     return new_exp_data
+
+def get_yield(strain_list:list, stress_list:list, offset:float=0.002) -> tuple:
+    """
+    Calculates the yield strain and stress
+
+    Parameters:
+    * `strain_list`: The list of strain values
+    * `stress_list`: The list of stress values
+    * `offset`:      The offset used to determine the yield point
+
+    Returns the yield strain and stress
+    """
+    youngs = stress_list[1] / strain_list[1] # NEML produces noiseless curves
+    sfn = inter.interp1d(strain_list, stress_list, bounds_error=False, fill_value=0)
+    tfn = lambda e: youngs * (e - offset)
+    yield_strain = opt.brentq(lambda e: sfn(e) - tfn(e), 0.0, np.max(strain_list))
+    yield_stress = float(tfn(yield_strain))
+    return yield_strain, yield_stress
@@ -6,6 +6,7 @@
 """
 
 # Libraries
+import numpy as np
 from copy import deepcopy
 from moga_neml.helper.interpolator import Interpolator
 
@@ -73,24 +74,42 @@ def get_stationary_points(exp_data:dict, x_label:str, y_label:str,
     * `window`:     The window size to determine the stationary point
     * `acceptance`: The acceptance rate (0..1)
 
+    Returns a list of dictionaries of stationary points
+    """
+    d_exp_data = differentiate_curve(exp_data, x_label, y_label)
+    return find_stationary_points(exp_data, d_exp_data[y_label], x_label, y_label, window, acceptance)
+
+def find_stationary_points(exp_data:dict, dy_list:list, x_label:str, y_label:str,
+                           window:int, acceptance:int) -> list:
+    """
+    Finds the stationary points of a curve from its derivative
+
+    Parameters:
+    * `exp_data`:   The dictionary of experimental data
+    * `dy_list`:    The derivative at each data point
+    * `x_label`:    The label of the x axis
+    * `y_label`:    The label of the y axis
+    * `window`:     The window size to determine the stationary point
+    * `acceptance`: The acceptance rate (0..1)
+
     Returns a list of dictionaries of stationary points
     """
 
     # Initialise
-    d_exp_data = differentiate_curve(exp_data, x_label, y_label)
     dy_label = f"d_{y_label}"
     sp_list = []
 
     # Gets the locations where the derivative passes through the x axis
-    for i in range(len(d_exp_data[x_label])-1):
-        if ((d_exp_data[y_label][i] <= 0 and d_exp_data[y_label][i+1] >= 0) or (d_exp_data[y_label][i] >= 0 and d_exp_data[y_label][i+1] <= 0)):
-            sp_list.append({
-                x_label:  exp_data[x_label][i],
-                y_label:  exp_data[y_label][i],
-                dy_label: d_exp_data[y_label][i],
-                "index":  i,
-                "nature": get_sp_nature(d_exp_data[y_label], i, window, acceptance)
-            })
+    dy_list = np.asarray(dy_list)
+    crosses = ((dy_list[:-1] <= 0) & (dy_list[1:] >= 0)) | ((dy_list[:-1] >= 0) & (dy_list[1:] <= 0))
+    for i in np.where(crosses)[0]:
+        sp_list.append({
+            x_label:  exp_data[x_label][i],
+            y_label:  exp_data[y_label][i],
+            dy_label: dy_list[i],
+            "index":  int(i),
+            "nature": get_sp_nature(dy_list, i, window, acceptance)
+        })
     
     # Return list of dictionaries
     return sp_list
@@ -112,14 +131,14 @@ def get_sp_nature(dy_list:list, index:int, window=0.1, acceptance=0.9) -> str:
     window_abs = round(len(dy_list) * window)
     
     # Determine gradient on the left
-    dy_left = dy_list[index-window_abs:index]
-    left_pos_size = len([dy for dy in dy_left if dy > 0])
+    dy_left = np.asarray(dy_list[index-window_abs:index])
+    left_pos_size = np.count_nonzero(dy_left > 0)
     left_pos = left_pos_size > window_abs*acceptance
     left_neg = left_pos_size < window_abs*(1-acceptance)
     
     # Determine gradient on the right
-    dy_right = dy_list[index:index+window_abs+1]
-    right_pos_size = len([dy for dy in dy_right if dy > 0])
+    dy_right = np.asarray(dy_list[index:index+window_abs+1])
+    right_pos_size = np.count_nonzero(dy_right > 0)
     right_pos = right_pos_size > window_abs*acceptance
     right_neg = right_pos_size < window_abs*(1-acceptance)
 
@@ -142,7 +161,7 @@ def differentiate_curve(exp_data:dict, x_label:str, y_label:str) -> dict:
 
     Returns the differentiated data
     """
-    exp_data = deepcopy(exp_data)
+    exp_data = dict(exp_data) # only the y values are replaced
     interpolator = Interpolator(exp_data[x_label], exp_data[y_label])
     interpolator.differentiate()
     exp_data[y_label] = interpolator.evaluate(exp_data[x_label])
@@ -116,12 +116,15 @@ def group_sp(x_list:list, y_list:list, tolerance:float) -> tuple:
     * `y_list`:    The list of values being grouped
     * `tolerance`: The tolerance used for the grouping
     
-    Returns two lists representing the grouped stationary points
+    Returns two lists representing the grouped stationary points; empty if there
+    are no stationary points
     """
 
     # Initialise
     sp_x_list = []
     sp_y_list = []
+    if len(x_list) == 0:
+        return sp_x_list, sp_y_list
     curr_x_group = [x_list[0]]
     curr_y_group = [y_list[0]]
 
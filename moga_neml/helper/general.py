@@ -6,8 +6,12 @@
 """
 
 # Libraries
-import csv, os, subprocess, sys
+import csv, os, pickle, select, signal, subprocess, sys, time
 import math, numpy as np
+from multiprocessing.connection import Connection
+
+# The helper process held by each process for running isolated functions
+ISOLATOR = None
 
 def get_file_path_writable(file_path:str, extension:str) -> None:
     """
@@ -114,6 +118,24 @@ def write_to_csv(path:str, data:list) -> None:
         for row in data:
             writer.writerow(row)
 
+def get_attribute_info(obj) -> list:
+    """
+    Gets the attributes of an object that are numbers or strings; used to identify
+    how an object (e.g., an error or a constraint) has been defined; attributes that
+    are none are skipped, since they may hold state that has not been set yet (e.g.,
+    the calibrated model of a model that has not been calibrated)
+
+    Parameters:
+    * `obj`: The object
+
+    Returns a sorted list of the names and values of the attributes
+    """
+    attribute_info = [(type(obj).__name__, "")]
+    for name, value in vars(obj).items():
+        if isinstance(value, (bool, int, float, str)):
+            attribute_info.append((name, repr(value)))
+    return sorted(attribute_info)
+
 def run(command:str, shell:bool=True, check:bool=True) -> None:
     """
     Runs a command using a single thread
@@ -125,6 +147,136 @@ def run(command:str, shell:bool=True, check:bool=True) -> None:
     """
     subprocess.run(["OMP_NUM_THREADS=1 " + command], shell=shell, check=check)
 
+def run_isolated(function, timeout:float=None) -> tuple:
+    """
+    Runs a function in a child process, so that the function can be killed once it runs
+    out of time and so that crashes (e.g., segmentation faults) do not affect the calling
+    process; the child processes are forked by a single-threaded helper process, since
+    forking the calling process could deadlock on the locks held by its other threads
+    (e.g., of worker pools); the function and its returned value must be picklable
+
+    Parameters:
+    * `function`: The function to be run, without arguments
+    * `timeout`:  The number of seconds to wait for the function; waits forever if undefined
+
+    Returns the returned value of the function (none if unsuccessful) and the cause of the
+    failure (i.e., none, "timeout", "crash", or "error")
+    """
+    global ISOLATOR
+    if ISOLATOR == None or ISOLATOR[0] != os.getpid() or ISOLATOR[1].poll() != None:
+        ISOLATOR = start_isolator()
+    _, process, sender, receiver = ISOLATOR
+    try:
+        sender.send((function, timeout))
+        data, failure = receiver.recv()
+    except (OSError, EOFError):
+        process.kill()
+        process.wait()
+        ISOLATOR = None
+        return None, "crash"
+    if failure != None:
+        return None, failure
+    return pickle.loads(data), None
+
+def start_isolator() -> tuple:
+    """
+    Starts the helper process that runs the isolated functions (for internal use only)
+
+    Returns the ID of the calling process, the helper process, and the connections
+    for sending functions to, and receiving results from, the helper process
+    """
+    request_read, request_write = os.pipe()
+    result_read, result_write = os.pipe()
+    command = f"from moga_neml.helper.general import serve_isolated; serve_isolated({request_read}, {result_write})"
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join([os.path.abspath(path) for path in sys.path])}
+    process = subprocess.Popen([sys.executable, "-c", command], pass_fds=(request_read, result_write), env=env)
+    os.close(request_read)
+    os.close(result_write)
+    sender   = Connection(request_write, readable=False)
+    receiver = Connection(result_read, writable=False)
+    return os.getpid(), process, sender, receiver
+
+def serve_isolated(read_fd:int, write_fd:int) -> None:
+    """
+    Runs the functions received from the calling process in forked child processes,
+    until the calling process closes the connection (for internal use only)
+
+    Parameters:
+    * `read_fd`:  The file descriptor to receive the functions and time limits from
+    * `write_fd`: The file descriptor to send the pickled results and causes of failure to
+    """
+    receiver = Connection(read_fd, writable=False)
+    sender   = Connection(write_fd, readable=False)
+    while True:
+        try:
+            message = receiver.recv_bytes()
+        except (OSError, EOFError):
+            return
+        try:
+            function, timeout = pickle.loads(message)
+        except Exception:
+            sender.send((b"", "error"))
+            continue
+        sender.send(fork_isolated(function, timeout))
+
+def fork_isolated(function, timeout:float=None) -> tuple:
+    """
+    Runs a function in a forked child process; only called by the single-threaded
+    helper process (for internal use only)
+
+    Parameters:
+    * `function`: The function to be run, without arguments
+    * `timeout`:  The number of seconds to wait for the function; waits forever if undefined
+
+    Returns the pickled returned value of the function (empty if unsuccessful) and the
+    cause of the failure (i.e., none, "timeout", "crash", or "error")
+    """
+
+    # Run the function in the child process and send back the pickled value
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        os.close(read_fd)
+        try:
+            data, status = pickle.dumps(function(), protocol=pickle.HIGHEST_PROTOCOL), 0
+        except BaseException:
+            data, status = b"", 1
+        try:
+            with os.fdopen(write_fd, "wb") as file:
+                file.write(data)
+        finally:
+            os._exit(status)
+    os.close(write_fd)
+
+    # Read the value until the child process finishes or runs out of time; the child
+    # process is killed and reaped if it runs out of time or if reading fails
+    end_time = None if timeout == None else time.time() + timeout
+    chunk_list = []
+    status = None
+    try:
+        while True:
+            remaining = None if end_time == None else max(end_time - time.time(), 0)
+            ready_list, _, _ = select.select([read_fd], [], [], remaining)
+            if ready_list == []:
+                return b"", "timeout"
+            chunk = os.read(read_fd, 1 << 20)
+            if chunk == b"":
+                break
+            chunk_list.append(chunk)
+        _, status = os.waitpid(pid, 0)
+    finally:
+        os.close(read_fd)
+        if status == None:
+            os.kill(pid, signal.SIGKILL)
+            os.waitpid(pid, 0)
+
+    # Check how the child process ended
+    if os.WIFSIGNALED(status):
+        return b"", "crash"
+    if os.WEXITSTATUS(status) != 0:
+        return b"", "error"
+    return b"".join(chunk_list), None
+
 def get_matrix_product(matrix_1:list, matrix_2:list) -> list:
     """
     Performs a 3x3 matrix multiplication
@@ -7,13 +7,17 @@
 
 # Libraries
 import numpy as np
-from scipy.interpolate import splev, splrep, splder
-from moga_neml.helper.data import get_thinned_list
+from scipy.interpolate import splev, splrep, splder, PchipInterpolator
+from moga_neml.helper.data import get_thin_indexes
+
+# Constants
+MODE_LIST  = ["spline", "linear", "pchip"]
+TABLE_SIZE = 10000 # number of points in the lookup tables
 
 # The Interpolator Class
 class Interpolator:
 
-    def __init__(self, x_list:list, y_list:list, resolution:int=50, smooth:bool=False):
+    def __init__(self, x_list:list, y_list:list, resolution:int=50, smooth:bool=False, mode:str="spline"):
         """
         Class for interpolating two lists of values
 
@@ -21,29 +25,113 @@ class Interpolator:
         * `x_list`:     List of x values
         * `y_list`:     List of y values
         * `resolution`: The resolution used for the interpolation
-        * `smooth`:     Whether to smooth the interpolation
+        * `smooth`:     Whether to smooth the interpolation (only applies to splines)
+        * `mode`:       The interpolation; "spline" fits a cubic B-spline, "linear" joins the
+                        points with lines, and "pchip" fits a monotonic piecewise cubic polynomial
         """
-        x_list, indices = np.unique(np.array(x_list), return_index=True)
-        y_list = np.array(y_list)[indices]
+
+        # Check the mode
+        check_mode(mode)
+        self.mode = mode
+
+        # Sort and thin the data; predicted data is usually sorted already
+        x_list = np.asarray(x_list)
+        y_list = np.asarray(y_list)
+        if len(x_list) < 2 or not np.all(x_list[1:] > x_list[:-1]):
+            x_list, indices = np.unique(x_list, return_index=True)
+            y_list = y_list[indices]
         if len(x_list) > resolution:
-            x_list = get_thinned_list(list(x_list), resolution)
-            y_list = get_thinned_list(list(y_list), resolution)
-        smooth_amount = resolution if smooth else 0
-        self.spl = splrep(x_list, y_list, s=smooth_amount)
-    
+            thin_indexes = get_thin_indexes(len(x_list), resolution)
+            x_list = x_list[thin_indexes]
+            y_list = y_list[thin_indexes]
+
+        # Fit the data; fails like the spline if there are insufficient data points
+        if mode == "spline":
+            smooth_amount = resolution if smooth else 0
+            self.spl = splrep(x_list, y_list, s=smooth_amount)
+            return
+        if len(x_list) < 2:
+            raise TypeError("The interpolation requires at least two data points!")
+        if mode == "linear":
+            self.x_list = x_list
+            self.y_list = y_list
+            self.slopes = np.diff(y_list) / np.diff(x_list)
+        elif mode == "pchip":
+            self.pchip = PchipInterpolator(x_list, y_list)
+
     def differentiate(self) -> None:
         """
         Differentiate the interpolator
         """
-        self.spl = splder(self.spl)
+        if self.mode == "spline":
+            self.spl = splder(self.spl)
+        elif self.mode == "pchip":
+            self.pchip = self.pchip.derivative()
+        else:
+            raise ValueError("The linear interpolation cannot be differentiated; use a spline or pchip instead")
+
+    def evaluate(self, x_list:list) -> np.ndarray:
+        """
+        Run the interpolator for specific values; values beyond the data are extrapolated
+
+        Parameters
+        * `x_list`: The list of x values
+
+        Returns the array of evaluated values
+        """
+        x_list = np.asarray(x_list)
+        if self.mode == "spline":
+            return splev(x_list, self.spl)
+        if self.mode == "pchip":
+            return self.pchip(x_list)
+        y_list = np.interp(x_list, self.x_list, self.y_list)
+        below = x_list < self.x_list[0]
+        above = x_list > self.x_list[-1]
+        y_list[below] = self.y_list[0] + (x_list[below] - self.x_list[0]) * self.slopes[0]
+        y_list[above] = self.y_list[-1] + (x_list[above] - self.x_list[-1]) * self.slopes[-1]
+        return y_list
+
+# The Lookup Table Class
+class LookupTable:
+
+    def __init__(self, interpolator:Interpolator, x_start:float, x_end:float, size:int=TABLE_SIZE):
+        """
+        Class for evaluating an interpolator once on a dense grid, so that later evaluations
+        only interpolate linearly between the tabulated values
 
-    def evaluate(self, x_list:list) -> list:
+        Parameters:
+        * `interpolator`: The interpolator to tabulate
+        * `x_start`:      The first x value of the table
+        * `x_end`:        The last x value of the table
+        * `size`:         The number of points in the table
+        """
+        self.interpolator = interpolator
+        self.x_list = np.linspace(x_start, x_end, size)
+        self.y_list = interpolator.evaluate(self.x_list)
+
+    def evaluate(self, x_list:list) -> np.ndarray:
         """
-        Run the interpolator for specific values
+        Looks up the values for specific x values; values beyond the table are
+        evaluated with the interpolator
 
         Parameters
         * `x_list`: The list of x values
 
-        Returns the evaluated values
+        Returns the array of values
         """
-        return list(splev(x_list, self.spl))
+        x_list = np.asarray(x_list)
+        y_list = np.interp(x_list, self.x_list, self.y_list)
+        if x_list.min() < self.x_list[0] or x_list.max() > self.x_list[-1]:
+            outside = (x_list < self.x_list[0]) | (x_list > self.x_list[-1])
+            y_list[outside] = self.interpolator.evaluate(x_list[outside])
+        return y_list
+
+def check_mode(mode:str) -> None:
+    """
+    Checks that an interpolation mode is supported
+
+    Parameters:
+    * `mode`: The interpolation mode
+    """
+    if not mode in MODE_LIST:
+        raise ValueError(f"The interpolation mode '{mode}' is not supported; use one of {MODE_LIST}")
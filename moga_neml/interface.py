@@ -6,16 +6,21 @@
 """
 
 # Libraries
-import re, time
-from moga_neml.io.reader import read_exp_data, check_exp_data
+import multiprocessing, re, secrets, time
+from moga_neml.io.database import Database
+from moga_neml.io.reader import read_exp_data, read_exp_data_list, check_exp_data
 from moga_neml.optimise.recorder import Recorder
 from moga_neml.optimise.controller import Controller
 from moga_neml.optimise.problem import Problem
-from moga_neml.optimise.moga import MOGA
+from moga_neml.optimise.pool import Pool
+from moga_neml.optimise.broker import Broker, get_address, serve
+from moga_neml.optimise.moga import MOGA, load_checkpoint
+from moga_neml.optimise.islands import IslandMOGA
+from moga_neml.optimise.surrogate import Surrogate
 from moga_neml.helper.data import remove_data_after
 from moga_neml.helper.derivative import remove_after_sp
 from moga_neml.helper.experiment import get_units
-from moga_neml.helper.general import safe_mkdir
+from moga_neml.helper.general import dict_list_to_csv, safe_mkdir, write_to_csv
 
 # Interface Class
 class Interface:
@@ -36,6 +41,9 @@ class Interface:
         # Initialise internal variables
         self.__controller__  = Controller()
         self.__recorder__    = None
+        self.__screening__   = None
+        self.__islands__     = None
+        self.__preloaded__   = {}
         self.__print_index__ = 0
         self.__print_subindex__ = 0
         self.__verbose__     = verbose
@@ -73,7 +81,7 @@ class Interface:
         self.__print__(f"Defining model '{model_name}'")
         self.__controller__.define_model(model_name, **kwargs)
     
-    def read_data(self, file_path:str, thin_data:bool=True, num_points:int=1000) -> None:
+    def read_data(self, file_path:str, thin_data:bool=True, num_points:int=1000, cache:bool=False) -> None:
         """
         Reads in the experimental data from a file
         
@@ -81,11 +89,35 @@ class Interface:
         * `file_path`:  The name of the file relative to the defined `input_path`
         * `thin_data`:  Whether to thin the data or not
         * `num_points`: How many points to thin the data to
+        * `cache`:      Whether to cache the parsed data in the user's cache folder, so
+                        that the file is only parsed again once it changes
         """
         self.__print__(f"Reading data from '{file_path}'")
-        exp_data = read_exp_data(self.__input_path__, file_path, thin_data, num_points)
+        preload_key = (file_path, thin_data, num_points)
+        if preload_key in self.__preloaded__:
+            exp_data = self.__preloaded__.pop(preload_key)
+        else:
+            exp_data = read_exp_data(self.__input_path__, file_path, thin_data, num_points, cache)
         self.__controller__.add_curve(exp_data)
 
+    def preload_data(self, file_path_list:list, thin_data:bool=True, num_points:int=1000,
+                     cache:bool=False, workers:int=1) -> None:
+        """
+        Reads in the experimental data from several files concurrently, so that the
+        data is ready when `read_data` is called for each of the files
+        
+        Parameters:
+        * `file_path_list`: The list of names of the files relative to the defined `input_path`
+        * `thin_data`:      Whether to thin the data or not
+        * `num_points`:     How many points to thin the data to
+        * `cache`:          Whether to cache the parsed data
+        * `workers`:        The number of processes to read the files with
+        """
+        self.__print__(f"Preloading data from {len(file_path_list)} files with {workers} processes")
+        exp_data_list = read_exp_data_list(self.__input_path__, file_path_list, thin_data, num_points, cache, workers)
+        for file_path, exp_data in zip(file_path_list, exp_data_list):
+            self.__preloaded__[(file_path, thin_data, num_points)] = exp_data
+
     def change_data(self, field:str, value) -> None:
         """
         Changes a field in the most recently added experimental data
@@ -281,6 +313,142 @@ class Interface:
         for i in range(len(param_values)):
             self.__controller__.init_param(unfix_param_names[i], param_values[i])
 
+    def parallelise_curves(self, workers:int) -> None:
+        """
+        Simulates the curves of each set of parameters concurrently; this reduces the
+        time to evaluate each set of parameters, and is most useful for small populations,
+        `get_results`, and `plot_simulation`
+        
+        Parameters:
+        * `workers`: The number of processes to simulate the curves with
+        """
+        self.__print__(f"Simulating the curves with {workers} processes")
+        if workers < 1:
+            raise ValueError("The curves cannot be simulated without any processes!")
+        self.__controller__.set_curve_workers(workers)
+
+    def isolate_simulations(self, timeout:float=None) -> None:
+        """
+        Runs each simulation in a separate process, so that simulations that crash (e.g.,
+        segmentation faults) or run for longer than the time limit are killed and treated
+        as failed predictions, rather than stopping or stalling the optimisation; the
+        number of failed simulations and their causes are recorded in the summary, and
+        each failed simulation is recorded with its parameters in the results
+        
+        Parameters:
+        * `timeout`: The number of seconds each simulation is allowed to run for;
+                     no time limit if undefined
+        """
+        time_limit = "no time limit" if timeout == None else f"a time limit of {timeout}s"
+        self.__print__(f"Isolating the simulations with {time_limit}")
+        if timeout != None and timeout <= 0:
+            raise ValueError("The time limit for the simulations must be positive!")
+        self.__controller__.set_isolation(True, timeout)
+
+    def abort_early(self, order:str="time") -> None:
+        """
+        Evaluates the curves of each set of parameters one at a time, and stops the
+        evaluation once the set of parameters is dominated by, or worse than, all the
+        solutions stored by the recorder; the aborted evaluations and the skipped
+        simulations are recorded in the summary
+        
+        Parameters:
+        * `order`: The order to evaluate the curves in; "time" evaluates the fastest
+                   curves first, and "defined" evaluates the curves in the order they were read
+        """
+        self.__print__(f"Aborting evaluations early with the curves in '{order}' order")
+        self.__controller__.set_early_abort(order)
+
+    def screen_fidelity(self, num_steps:int=None, rel_tol:float=None, abs_tol:float=None,
+                        num_grains:int=None, promote:float=1.0) -> None:
+        """
+        Simulates each set of parameters at a lower fidelity first, and only simulates the
+        set of parameters at full fidelity if it beats enough of the solutions stored by the
+        recorder; the screened out sets of parameters are treated as failed, so the recorder
+        only stores full fidelity solutions
+        
+        Parameters:
+        * `num_steps`:  The number of steps of the drivers at the lower fidelity
+        * `rel_tol`:    The relative tolerance of the drivers at the lower fidelity
+        * `abs_tol`:    The absolute tolerance of the drivers at the lower fidelity
+        * `num_grains`: The number of grains (with the largest weights) to simulate at the
+                        lower fidelity, for crystal plasticity models
+        * `promote`:    The fraction of the stored solutions that a set of parameters must
+                        beat at the lower fidelity to be simulated at full fidelity
+        """
+        fidelity_dict = {"num_steps": num_steps, "rel_tol": rel_tol, "abs_tol": abs_tol, "num_grains": num_grains}
+        fidelity_dict = {key: value for key, value in fidelity_dict.items() if value != None}
+        if fidelity_dict == {}:
+            raise ValueError("At least one setting of the lower fidelity must be defined!")
+        self.__print__(f"Screening the evaluations at a lower fidelity ({fidelity_dict})")
+        self.__controller__.set_low_fidelity(fidelity_dict, promote)
+
+    def set_cache_size(self, cache_size:float) -> None:
+        """
+        Changes the memory limit of the cache of predictions; the cache stores the
+        simulated curves of recently evaluated sets of parameters, so that recording
+        and analysing the results does not repeat the simulations; the cache is not
+        shared between processes, but the predictions of the best solution are kept
+        outside the cache, including those simulated by the workers of `optimise`
+        
+        Parameters:
+        * `cache_size`: The memory limit in MB; disables the cache if zero
+        """
+        self.__print__(f"Limiting the cache of predictions to {cache_size}MB")
+        if cache_size < 0:
+            raise ValueError("The memory limit of the cache cannot be negative!")
+        self.__controller__.set_cache_size(cache_size)
+
+    def screen_offspring(self, factor:int=5, explore:float=0.2) -> None:
+        """
+        Breeds more offspring than needed during the optimisation, and only evaluates the
+        offspring that are predicted to be the most promising (or that are the least explored);
+        the objectives are predicted with radial basis functions trained on the evaluated solutions
+        
+        Parameters:
+        * `factor`:  The number of candidate offspring to breed for each evaluated offspring
+        * `explore`: The fraction of the evaluated offspring chosen by how far they are from
+                     the evaluated solutions, rather than by their predicted objectives
+        """
+        self.__print__(f"Screening {factor} candidates for each offspring")
+        if factor < 1:
+            raise ValueError("At least one candidate must be bred for each offspring!")
+        if explore < 0 or explore > 1:
+            raise ValueError("The fraction of explored offspring must be between 0 and 1!")
+        self.__screening__ = (factor, explore)
+
+    def set_islands(self, num_islands:int=4, interval:int=10, migrants:int=5, topology:str="ring") -> None:
+        """
+        Optimises several populations (i.e., islands) at once, which periodically send their
+        best non-dominated solutions to other islands; the offspring of all the islands are
+        evaluated together, so they are spread over the workers, and the results of all the
+        islands are recorded together
+        
+        Parameters:
+        * `num_islands`: The number of islands
+        * `interval`:    The number of generations between migrations
+        * `migrants`:    The maximum number of solutions each island sends per migration
+        * `topology`:    The islands that each island sends its solutions to; "ring" sends them to
+                         the next island, "all" to all the other islands, and "random" to a random island
+        """
+        self.__print__(f"Optimising {num_islands} islands with migration every {interval} generations")
+        if interval < 1:
+            raise ValueError("The interval between migrations must be at least one generation!")
+        self.__islands__ = (num_islands, interval, migrants, topology)
+
+    def set_database(self, path:str) -> None:
+        """
+        Stores the objectives of the evaluated sets of parameters in a database on disk,
+        and reuses them when the same sets of parameters are evaluated again for the same
+        model, data, errors, constraints, and drivers (e.g., in repeated or resumed runs);
+        evaluations that fail, violate the constraints, or are aborted early are not stored
+        
+        Parameters:
+        * `path`: The path to the database file, which can be shared by several runs
+        """
+        self.__print__(f"Storing the evaluations in '{path}'")
+        self.__controller__.set_database(Database(path))
+
     def set_custom_driver(self, driver_type:str, **kwargs) -> None:
         """
         Forces the optimiser to use a specific driver instead of one of the defined ones
@@ -292,6 +460,49 @@ class Interface:
         curve = self.__controller__.get_last_curve()
         curve.set_custom_driver(driver_type, kwargs)
 
+    def set_driver_settings(self, **kwargs) -> None:
+        """
+        Changes the settings of the driver for the most recently read curve
+        (e.g., `num_steps`, `num_steps_up`, `time_hold`, `max_strain`, and `logspace`)
+        """
+        self.__print__(f"Changing the driver settings ({kwargs})")
+        curve = self.__controller__.get_last_curve()
+        self.__controller__.set_driver_settings(curve, kwargs)
+
+    def study_convergence(self, params:list, num_steps_list:list=[100, 200, 500, 1000, 2000, 5000],
+                          logspace_list:list=[False, True], tolerance:float=0.01, apply:bool=False) -> None:
+        """
+        Simulates the curves with errors over a range of step counts and stepping schemes, and
+        finds the cheapest settings whose errors stay within a tolerance of the errors with the
+        finest settings; the summary is written to 'convergence.csv'
+        
+        Parameters:
+        * `params`:         The parameter values of the model
+        * `num_steps_list`: The list of step counts to study
+        * `logspace_list`:  The list of stepping schemes to study for creep curves (i.e., whether
+                            the steps are spaced logarithmically)
+        * `tolerance`:      The maximum relative difference from the errors with the finest settings
+        * `apply`:          Whether to change the driver settings of the curves to the cheapest settings
+        """
+
+        # Display and check
+        self.__print__(f"Studying the convergence of {len(num_steps_list)} step counts")
+        self.__check_model__()
+        self.__check_errors__("The convergence cannot be studied without errors!")
+        self.__check_params__(params)
+        if len(num_steps_list) == 0 or len(logspace_list) == 0:
+            raise ValueError("The step counts and stepping schemes to study must be defined!")
+
+        # Study the convergence and write the summary
+        row_list, best_list = self.__controller__.study_convergence(params, num_steps_list, logspace_list, tolerance)
+        headers, data = dict_list_to_csv(row_list)
+        write_to_csv(self.__get_output__("convergence.csv"), [headers] + data)
+
+        # Apply the cheapest settings
+        if apply:
+            for curve, driver_settings in best_list:
+                self.__controller__.set_driver_settings(curve, driver_settings)
+
     def plot_experimental(self, x_log:bool=False, y_log:bool=False) -> None:
         """
         Visualises the experimental data
@@ -347,14 +558,18 @@ class Interface:
             alpha_list = [1.0] * len(params_list)
 
         # Iterate through types and plot predictions
-        for i in range(len(type_list)):
-            file_path = self.__get_output__(f"prds_{type_list[i]}")
-            x_limits, y_limits = None, None
-            if limits_dict != None:
-                x_limits = limits_dict[type_list[i]][0]
-                y_limits = limits_dict[type_list[i]][1]
-            self.__controller__.plot_prd_curves(params_list, alpha_list=alpha_list, clip=clip, type=type_list[i],
-                                                file_path=file_path, x_limits=x_limits, y_limits=y_limits)
+        self.__controller__.open_curve_pool()
+        try:
+            for i in range(len(type_list)):
+                file_path = self.__get_output__(f"prds_{type_list[i]}")
+                x_limits, y_limits = None, None
+                if limits_dict != None:
+                    x_limits = limits_dict[type_list[i]][0]
+                    y_limits = limits_dict[type_list[i]][1]
+                self.__controller__.plot_prd_curves(params_list, alpha_list=alpha_list, clip=clip, type=type_list[i],
+                                                    file_path=file_path, x_limits=x_limits, y_limits=y_limits)
+        finally:
+            self.__controller__.close_curve_pool()
 
     def plot_distribution(self, params_list:list, limits_dict:dict=None, log:bool=False, horizontal:bool=True) -> None:
         """
@@ -411,12 +626,17 @@ class Interface:
         recorder.define_hyperparameters(0, len(params_list), 0, 0, 0)
         
         # Add parameters and create record
-        for params in params_list:
-            param_name_list = self.__controller__.get_unfix_param_names()
-            param_value_dict = {key: value for key, value in zip(param_name_list, params)}
-            error_value_dict = self.__controller__.calculate_objectives(*params, include_validation=True)
-            recorder.update_optimal_solution(param_value_dict, error_value_dict)
-        recorder.create_record(self.__get_output__("results"), replace=False)
+        self.__controller__.open_curve_pool()
+        try:
+            for params in params_list:
+                param_name_list = self.__controller__.get_unfix_param_names()
+                param_value_dict = {key: value for key, value in zip(param_name_list, params)}
+                error_value_dict = self.__controller__.calculate_objectives(*params, include_validation=True)
+                self.__controller__.hold_prd_data(self.__controller__.get_prd_data_dict(*params))
+                recorder.update_optimal_solution(param_value_dict, error_value_dict)
+            recorder.create_record(self.__get_output__("results"), replace=False)
+        finally:
+            self.__controller__.close_curve_pool()
     
     def save_model(self, params:list) -> None:
         """
@@ -457,7 +677,9 @@ class Interface:
                                      plot_opt, plot_loss, save_model)
     
     def optimise(self, num_gens:int=10000, population:int=100, offspring:int=50,
-                 crossover:float=0.80, mutation:float=0.01) -> dict:
+                 crossover:float=0.80, mutation:float=0.01, workers:int=1, address:tuple=None,
+                 authkey:str=None, timeout:float=None, asynchronous:bool=False,
+                 resume_from:str=None, seed:int=None) -> dict:
         """
         Prepares and conducts the optimisation
         
@@ -467,6 +689,24 @@ class Interface:
         * `offspring`:  The number of solutions introduced after each generation
         * `crossover`:  The crossover probability; should be between 0.0 and 1.0
         * `mutation`:   The mutation probability; should be between 0.0 and 1.0
+        * `workers`:    The number of processes to evaluate the solutions with; each
+                        process holds its own copy of the model and curves
+        * `address`:    The host and port to hand out the solutions from, or just the port to
+                        only accept workers on localhost; if defined, the solutions are evaluated
+                        by the workers that connect to this address via the `serve` function
+                        (possibly on other hosts), instead of `workers`
+        * `authkey`:    The secret key that the connecting workers must present; a random
+                        key is generated and printed if undefined
+        * `timeout`:    The number of seconds without hearing from a connected worker before
+                        treating its connection as lost and handing its solution to another
+                        worker; the workers send heartbeats while evaluating, so slow solutions
+                        are not handed out again
+        * `asynchronous`: Whether to breed and evaluate the offspring one at a time, as the
+                          workers become free, instead of waiting for each generation to finish;
+                          the generations are then counted by the number of evaluations
+        * `resume_from`: The path to a checkpoint saved by an earlier optimisation (i.e.,
+                         `checkpoint.pkl` in its results directory) to continue from
+        * `seed`:       The seed of the random number generators, for a reproducible optimisation
         """
         
         # Display and conduct checks
@@ -474,24 +714,93 @@ class Interface:
         self.__check_model__()
         self.__check_curves__("Optimisation cannot run without experimental curves!")
         self.__check_errors__("Optimisation cannot run without any objective functions!")
+        if workers < 1:
+            raise ValueError("The optimisation requires at least one worker!")
+        if self.__islands__ != None and (asynchronous or resume_from != None):
+            raise ValueError("The island model cannot be run asynchronously or resumed from a checkpoint!")
         
         # Adds the recorder if it has not been defined; otherwise, check defined recorder
         if self.__recorder__ == None:
             self.__recorder__ = Recorder(self.__controller__, 10, self.__output_path__)
         self.__check_variable__(self.__recorder__, "Optimisation cannot run without initialising a recorder!")
         
+        # Load the checkpoint to resume from
+        checkpoint = None
+        if resume_from != None:
+            checkpoint = load_checkpoint(resume_from)
+            self.__print__(f"Resuming from generation {checkpoint['num_gens']} of '{resume_from}'", sub_index=True)
+        
+        # Initialise the processes; the curves are only simulated concurrently without the pool
+        if address != None:
+            if authkey == None:
+                authkey = secrets.token_hex(16)
+                print(f"\n\tKey for the workers:\t{authkey}\n")
+            pool = Broker(self.__controller__, address, authkey, timeout)
+            host, port = pool.address
+            self.__print__(f"Handing out the solutions from {host}:{port}", sub_index=True)
+        elif workers > 1:
+            pool = Pool(self.__controller__, workers)
+            self.__print__("Started {} workers in {:0.4}s".format(workers, float(pool.get_startup_time())), sub_index=True)
+        else:
+            pool = None
+            self.__controller__.open_curve_pool()
+        self.__recorder__.set_pool(pool)
+
         # Initialise and run the optimisation
-        problem = Problem(self.__controller__, self.__recorder__)
-        self.__recorder__.define_hyperparameters(num_gens, population, offspring, crossover, mutation)
-        moga = MOGA(problem, num_gens, population, offspring, crossover, mutation)
-        moga.optimise()
+        problem = Problem(self.__controller__, self.__recorder__, pool)
+        num_islands = 1 if self.__islands__ == None else self.__islands__[0]
+        self.__recorder__.define_hyperparameters(num_gens, population * num_islands, offspring * num_islands, crossover, mutation)
+        try:
+            surrogate = None if self.__screening__ == None else Surrogate(problem, *self.__screening__)
+            if self.__islands__ == None:
+                moga = MOGA(problem, num_gens, population, offspring, crossover, mutation, asynchronous, checkpoint,
+                            surrogate, seed)
+            else:
+                moga = IslandMOGA(problem, num_gens, population, offspring, crossover, mutation, *self.__islands__,
+                                  surrogate, seed)
+            moga.optimise()
+        finally:
+            if pool != None:
+                pool.close()
+            self.__controller__.close_curve_pool()
 
         # Get the results, print, and return the parameters
         opt_params = self.__recorder__.get_opt_params()
         opt_error = self.__recorder__.get_opt_error()
         print(f"\n\tParams:\t{opt_params}\n\tError:\t{opt_error}")
+        if pool != None:
+            print("\tEvaluation:\t{}".format(", ".join(pool.get_summary())))
         return opt_params
 
+    def serve(self, address, authkey:str, workers:int=1) -> None:
+        """
+        Evaluates the solutions handed out by an optimisation running on another process
+        or host (i.e., the `optimise` function with a defined `address`); the model, data,
+        errors, and constraints must be defined in the same way as the optimisation
+        
+        Parameters:
+        * `address`: The host and port that the optimisation hands out the solutions from,
+                     or just the port of an optimisation on localhost
+        * `authkey`: The key to present to the optimisation
+        * `workers`: The number of processes to evaluate the solutions with
+        """
+        
+        # Display and conduct checks
+        host, port = get_address(address)
+        self.__print__(f"Evaluating the solutions from {host}:{port} with {workers} processes")
+        self.__check_model__()
+        self.__check_curves__("Solutions cannot be evaluated without experimental curves!")
+        self.__check_errors__("Solutions cannot be evaluated without any objective functions!")
+        
+        # Connect the processes to the optimisation and wait for them to finish
+        context = multiprocessing.get_context("fork")
+        process_list = [context.Process(target=serve, args=(self.__controller__, address, authkey))
+                        for _ in range(workers)]
+        for process in process_list:
+            process.start()
+        for process in process_list:
+            process.join()
+
     def __print__(self, message:str, add_index:bool=True, sub_index:bool=False) -> None:
         """
         Displays a message before running the command (for internal use only)
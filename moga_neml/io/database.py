@@ -0,0 +1,83 @@
+"""
+ Title:         Database
+ Description:   For storing evaluated sets of parameters on disk, so they can be reused between runs
+ Author:        Janzen Choi
+
+"""
+
+# Libraries
+import json, os, sqlite3
+
+# Constants
+WAIT_TIME = 60 # seconds to wait for other processes writing to the database
+
+# The Database class
+class Database:
+
+    def __init__(self, path:str):
+        """
+        Class for storing the objectives of evaluated sets of parameters in an SQLite
+        database; the database can be written to by several processes at the same time,
+        and each process opens its own connection when first using the database
+
+        Parameters:
+        * `path`: The path to the database file
+        """
+
+        # Initialise inputs
+        self.path = path
+
+        # Initialise internal variables
+        self.connection = None
+        self.pid        = None
+
+    def get_path(self) -> str:
+        """
+        Returns the path to the database file
+        """
+        return self.path
+
+    def get_connection(self) -> sqlite3.Connection:
+        """
+        Gets the connection to the database, opening a new connection if the database
+        has not been used by this process yet
+        """
+        if self.connection != None and self.pid == os.getpid():
+            return self.connection
+        self.connection = sqlite3.connect(self.path, timeout=WAIT_TIME, isolation_level=None)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.execute("CREATE TABLE IF NOT EXISTS objectives (key TEXT PRIMARY KEY, model TEXT, params TEXT, objectives TEXT)")
+        self.pid = os.getpid()
+        return self.connection
+
+    def get_objectives(self, key:str) -> dict:
+        """
+        Gets the stored objectives of a set of parameters
+
+        Parameters:
+        * `key`: The key identifying the set of parameters and the study
+
+        Returns the dictionary of objectives; none if they have not been stored
+        """
+        row = self.get_connection().execute("SELECT objectives FROM objectives WHERE key = ?", (key,)).fetchone()
+        if row == None:
+            return None
+        return json.loads(row[0])
+
+    def set_objectives(self, key:str, model_name:str, params:list, objective_dict:dict) -> None:
+        """
+        Stores the objectives of a set of parameters, replacing any stored objectives; only
+        the objectives of completed evaluations should be stored, so that failed evaluations
+        are retried (e.g., with a longer time limit)
+
+        Parameters:
+        * `key`:            The key identifying the set of parameters and the study
+        * `model_name`:     The name of the model
+        * `params`:         The parameter values, including the fixed parameters
+        * `objective_dict`: The dictionary of objectives
+        """
+        params_str = json.dumps([float(param) for param in params])
+        objectives_str = json.dumps({name: float(value) for name, value in objective_dict.items()})
+        self.get_connection().execute("INSERT OR REPLACE INTO objectives VALUES (?, ?, ?, ?)",
+                                      (key, model_name, params_str, objectives_str))
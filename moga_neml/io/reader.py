@@ -6,9 +6,16 @@
 """
 
 # Libraries
+import glob, hashlib, multiprocessing, os, zipfile, numpy as np
 from numbers import Number
-from moga_neml.helper.data import get_thinned_list, find_tensile_strain_to_failure, remove_data_after
+from moga_neml.helper.data import get_thin_indexes, find_tensile_strain_to_failure, remove_data_after
 from moga_neml.helper.experiment import DATA_FIELD_DICT, get_min_max_stress
+from moga_neml.io.store import is_exp_store, read_exp_store
+
+# Constants
+CACHE_DIR     = os.path.join(os.environ.get("XDG_CACHE_HOME", os.path.expanduser("~/.cache")), "moga_neml") # user folder for the parsed curves
+CACHE_VERSION = 2 # changes the cache keys when the format of the parsed curves changes
+PRUNED_DIRS   = set() # cache folders that have already been pruned in this process
 
 def try_float_cast(value:str) -> float:
     """
@@ -22,35 +29,117 @@ def try_float_cast(value:str) -> float:
     except:
         return value
 
-def get_curve_dict(headers:list, data:list, thin_data:bool, num_points:int) -> dict:
+def get_curve_dict(line_list:list, thin_data:bool, num_points:int) -> dict:
     """
-    Converts CSV data into a curve dict
+    Converts the lines of a CSV file into a curve dict; the columns of
+    data are parsed into arrays at once
 
     Parameters:
-    * `headers`:    A list of strings representing the keys
-    * `data`:       A list of lists containing the data
+    * `line_list`:  The list of lines, starting with the headers
     * `thin_data`:  Whether to thin the data or not
     * `num_points`: How many points to thin the data to
+
+    Returns the curve, with arrays of data
     """
 
     # Get indexes of data
-    list_indexes = [i for i in range(len(data[2])) if data[2][i] != ""]
-    info_indexes = [i for i in range(len(data[2])) if data[2][i] == ""]
-    
+    headers = line_list[0].split(",")
+    first_row = line_list[1].split(",")
+    third_row = line_list[3].split(",")
+    list_indexes = [i for i in range(len(third_row)) if third_row[i] != ""]
+    info_indexes = [i for i in range(len(third_row)) if third_row[i] == ""]
+
+    # Parse and thin the data
+    value_grid = np.loadtxt(line_list[1:], delimiter=",", usecols=list_indexes, ndmin=2, comments=None)
+    if thin_data:
+        value_grid = value_grid[get_thin_indexes(len(value_grid), num_points)]
+
     # Create curve
     curve = {}
-    for index in list_indexes:
-        value_list = [float(d[index]) for d in data]
-        if thin_data:
-            value_list = get_thinned_list(value_list, num_points)
-        curve[headers[index]] = value_list
+    for i, index in enumerate(list_indexes):
+        curve[headers[index]] = value_grid[:,i]
     for index in info_indexes:
-        curve[headers[index]] = try_float_cast(data[0][index])
-
-    # Return curve
+        curve[headers[index]] = try_float_cast(first_row[index])
     return curve
 
-def read_exp_data(file_dir:str, file_name:str, thin_data:bool, num_points:int) -> dict:
+def get_cache_path(file_path:str, thin_data:bool, num_points:int) -> str:
+    """
+    Gets the path to the cached curve of a CSV file; each file has one cached curve
+    (for each thinning), which is replaced when the file changes
+
+    Parameters:
+    * `file_path`:  The path to the CSV file
+    * `thin_data`:  Whether to thin the data or not
+    * `num_points`: How many points to thin the data to
+
+    Returns the path
+    """
+    key = hashlib.md5(f"{os.path.abspath(file_path)},{CACHE_VERSION},{thin_data},{num_points}".encode()).hexdigest()
+    return f"{CACHE_DIR}/{key}.npz"
+
+def load_cached_curve(cache_path:str, content:bytes) -> dict:
+    """
+    Loads a cached curve; the curve is stored as plain arrays (i.e., the names of the
+    fields, the path and hash of the CSV file, and the value of each field), so loading
+    it does not unpickle anything
+
+    Parameters:
+    * `cache_path`: The path to the cached curve
+    * `content`:    The contents of the CSV file
+
+    Returns the curve, and none if the curve has not been cached or the file has changed
+    """
+    if not os.path.exists(cache_path):
+        return None
+    try:
+        with np.load(cache_path, allow_pickle=False) as cached:
+            if str(cached["arr_2"]) != hashlib.md5(content).hexdigest():
+                return None
+            value_list = [cached[f"arr_{i+3}"] for i in range(len(cached["arr_0"]))]
+            return {str(field): value if value.ndim > 0 else value.item() for field, value in zip(cached["arr_0"], value_list)}
+    except (OSError, ValueError, KeyError, zipfile.BadZipFile):
+        return None
+
+def save_cached_curve(cache_path:str, curve:dict, file_path:str, content:bytes) -> None:
+    """
+    Caches a curve; the cache is skipped if it cannot be written
+
+    Parameters:
+    * `cache_path`: The path to the cached curve
+    * `curve`:      The curve, with arrays of data
+    * `file_path`:  The path to the CSV file
+    * `content`:    The contents of the CSV file
+    """
+    temp_path = f"{cache_path}.{os.getpid()}.tmp"
+    field_list = list(curve.keys())
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        with open(temp_path, "wb") as file:
+            np.savez(file, np.array(field_list), np.array(os.path.abspath(file_path)), np.array(hashlib.md5(content).hexdigest()),
+                     *[np.asarray(curve[field]) for field in field_list])
+        os.replace(temp_path, cache_path)
+    except OSError:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+def prune_cache() -> None:
+    """
+    Removes the cached curves of CSV files that no longer exist; the cache folder
+    is only scanned once in each process, rather than each time a curve is cached
+    """
+    if CACHE_DIR in PRUNED_DIRS:
+        return
+    PRUNED_DIRS.add(CACHE_DIR)
+    for cache_path in glob.glob(f"{CACHE_DIR}/*.npz"):
+        try:
+            with np.load(cache_path, allow_pickle=False) as cached:
+                file_path = str(cached["arr_1"])
+            if not os.path.exists(file_path):
+                os.remove(cache_path)
+        except (OSError, ValueError, KeyError, zipfile.BadZipFile):
+            continue
+
+def read_exp_data(file_dir:str, file_name:str, thin_data:bool, num_points:int, cache:bool=False) -> dict:
     """
     Reads the experimental data
 
@@ -59,15 +148,34 @@ def read_exp_data(file_dir:str, file_name:str, thin_data:bool, num_points:int) -
     * `file_name`:  The name of the file containing the experimental data
     * `thin_data`:  Whether to thin the data or not
     * `num_points`: How many points to thin the data to
+    * `cache`:      Whether to cache the parsed curve, so that unchanged files are not
+                    parsed again; the curves are cached in the user's cache folder
+                    (i.e., `~/.cache/moga_neml`)
+    
+    Note that a store (see `moga_neml/io/store.py`) can be read instead of a CSV file; the
+    data of the store is memory mapped rather than copied, unless it is thinned
     """
 
-    # Read data
-    with open(f"{file_dir}/{file_name}", "r") as file:
-        headers = file.readline().replace("\n","").split(",")
-        data = [line.replace("\n","").split(",") for line in file.readlines()]
-    
-    # Create, check, and convert curve
-    exp_data = get_curve_dict(headers, data, thin_data, num_points)
+    # Open the store, or read the data, using the cached curve if the file has not changed
+    if is_exp_store(f"{file_dir}/{file_name}"):
+        exp_data = read_exp_store(f"{file_dir}/{file_name}")
+        if thin_data:
+            exp_data = {field: value[get_thin_indexes(len(value), num_points)] if isinstance(value, np.ndarray)
+                        else value for field, value in exp_data.items()}
+    else:
+        with open(f"{file_dir}/{file_name}", "rb") as file:
+            content = file.read()
+        cache_path = get_cache_path(f"{file_dir}/{file_name}", thin_data, num_points)
+        curve = load_cached_curve(cache_path, content) if cache else None
+        if curve == None:
+            curve = get_curve_dict(content.decode().splitlines(), thin_data, num_points)
+            if cache:
+                save_cached_curve(cache_path, curve, f"{file_dir}/{file_name}", content)
+        if cache:
+            prune_cache()
+        exp_data = {field: value.tolist() if isinstance(value, np.ndarray) else value for field, value in curve.items()}
+
+    # Check and convert curve
     exp_data["file_name"] = file_name
     check_exp_data(exp_data)
 
@@ -78,12 +186,46 @@ def read_exp_data(file_dir:str, file_name:str, thin_data:bool, num_points:int) -
     # Remove data of tensile curves after 80% of the UTS
     if exp_data["type"] == "tensile":
         end_index = find_tensile_strain_to_failure(exp_data["stress"])
+        if end_index == None:
+            raise ValueError(f"The tensile data at '{file_name}' does not drop below 80% of its UTS after the UTS!")
         end_strain = exp_data["strain"][end_index]
         exp_data = remove_data_after(exp_data, end_strain, "strain")
 
     # Return curves
     return exp_data
 
+def read_exp_data_list(file_dir:str, file_name_list:list, thin_data:bool, num_points:int,
+                       cache:bool=False, num_processes:int=1) -> list:
+    """
+    Reads the experimental data of several files concurrently
+
+    Parameters:
+    * `file_dir`:       The path to the folder containing the experimental data files
+    * `file_name_list`: The list of names of the files containing the experimental data
+    * `thin_data`:      Whether to thin the data or not
+    * `num_points`:     How many points to thin the data to
+    * `cache`:          Whether to cache the parsed curves
+    * `num_processes`:  The number of processes to read the files with
+
+    Returns the list of experimental data
+    """
+    
+    # Read the CSV files concurrently, after pruning the cache once for all the processes
+    if cache:
+        prune_cache()
+    arg_list = [(file_dir, file_name, thin_data, num_points, cache) for file_name in file_name_list]
+    csv_arg_list = [args for args in arg_list if not is_exp_store(f"{file_dir}/{args[1]}")]
+    if num_processes <= 1 or len(csv_arg_list) <= 1:
+        csv_data_list = [read_exp_data(*args) for args in csv_arg_list]
+    else:
+        context = multiprocessing.get_context("fork")
+        with context.Pool(min(num_processes, len(csv_arg_list))) as pool:
+            csv_data_list = pool.starmap(read_exp_data, csv_arg_list)
+
+    # Open the stores in this process, so that their data stays memory mapped
+    csv_data_iter = iter(csv_data_list)
+    return [next(csv_data_iter) if args in csv_arg_list else read_exp_data(*args) for args in arg_list]
+
 def check_header(exp_data:dict, header:str, type:type) -> None:
     """
     Checks that a header exists and is of a correct type
@@ -91,7 +233,7 @@ def check_header(exp_data:dict, header:str, type:type) -> None:
     Parameters:
     * `exp_data`: The dictionary of experimental data
     * `header`:   A header in the experimental data dictionary
-    * `type`:     The type of experimental data
+    * `type`:     The type (or tuple of types) of experimental data
     """
     if not header in exp_data.keys():
         raise ValueError(f"The data at '{exp_data['file_name']}' is missing a '{header}' header!")
@@ -127,7 +269,7 @@ def check_exp_data(exp_data:dict) -> None:
     for data_type in ["common", exp_data["type"]]:
         data_field = DATA_FIELD_DICT[data_type]
         for list_field in data_field["lists"]:
-            check_header(exp_data, list_field, list)
+            check_header(exp_data, list_field, (list, np.ndarray))
         check_lists(exp_data, data_field["lists"])
         for value_field in data_field["values"]:
             check_header(exp_data, value_field, Number)
@@ -0,0 +1,68 @@
+"""
+ Title:         Store
+ Description:   For storing experimental data as memory-mapped columns
+ Author:        Janzen Choi
+
+"""
+
+# Libraries
+import json, os, numpy as np
+
+# Constants
+HEADER_FILE   = "header.json" # the file of the store containing the scalar fields
+STORE_VERSION = 1             # changes when the format of the stores changes
+
+def is_exp_store(store_path:str) -> bool:
+    """
+    Checks whether a path is a store of experimental data
+
+    Parameters:
+    * `store_path`: The path to check
+
+    Returns whether the path is a store
+    """
+    return os.path.isdir(store_path) and os.path.exists(f"{store_path}/{HEADER_FILE}")
+
+def write_exp_store(exp_data:dict, store_path:str) -> None:
+    """
+    Writes experimental data as a store, with one array file for each list field
+    and a header for the scalar fields (e.g., type, temperature, youngs)
+
+    Parameters:
+    * `exp_data`:   The experimental data
+    * `store_path`: The path to the folder of the store
+    """
+
+    # Separate the list fields from the scalar fields
+    column_list = [field for field, value in exp_data.items() if isinstance(value, (list, np.ndarray))]
+    value_dict = {field: value for field, value in exp_data.items() if not field in column_list}
+
+    # Write the columns and then the header, which marks the store as complete
+    os.makedirs(store_path, exist_ok=True)
+    if os.path.exists(f"{store_path}/{HEADER_FILE}"):
+        os.remove(f"{store_path}/{HEADER_FILE}")
+    for field in column_list:
+        np.save(f"{store_path}/{field}.npy", np.asarray(exp_data[field], dtype=float))
+    header = {"version": STORE_VERSION, "columns": column_list, "values": value_dict}
+    with open(f"{store_path}/{HEADER_FILE}", "w") as file:
+        json.dump(header, file, indent=4)
+
+def read_exp_store(store_path:str) -> dict:
+    """
+    Reads a store of experimental data; the list fields are memory mapped (read-only),
+    so they are not copied into memory, and processes reading the same store share
+    one physical copy of the data
+
+    Parameters:
+    * `store_path`: The path to the folder of the store
+
+    Returns the experimental data, with memory-mapped arrays for the list fields
+    """
+    with open(f"{store_path}/{HEADER_FILE}", "r") as file:
+        header = json.load(file)
+    if header["version"] != STORE_VERSION:
+        raise ValueError(f"The store at '{store_path}' has an unsupported version ({header['version']})!")
+    exp_data = dict(header["values"])
+    for field in header["columns"]:
+        exp_data[field] = np.load(f"{store_path}/{field}.npy", mmap_mode="r")
+    return exp_data
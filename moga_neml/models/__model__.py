@@ -7,6 +7,7 @@
 
 # Libraries
 import importlib, os, pathlib, sys
+import numpy as np
 
 # The Model Template Class
 class __Model__:
@@ -18,6 +19,11 @@ class __Model__:
         self.name = name
         self.param_dict = {}
         self.exp_data = {}
+        self.fidelity_dict = {}
+        self.read_field_dict = {} # the fields read by the latest calibration
+        self.calibrated_dict = {} # the calibrated models of the latest parameters
+        self.calibrated_model = None
+        self.deferred_params  = None # the parameters of a calibration that has not been needed yet
 
     def add_param(self, name:str, l_bound:float=0.0e0, u_bound:float=1.0e0) -> None:
         """
@@ -64,8 +70,31 @@ class __Model__:
         """
         if not field in self.exp_data.keys():
             raise ValueError(f"The experimental data does not contain the {field} field")
+        self.read_field_dict[field] = self.exp_data[field]
         return self.exp_data[field]
 
+    def set_fidelity(self, fidelity_dict:dict) -> None:
+        """
+        Sets the fidelity of the model; models that can be simplified (e.g., by
+        simulating fewer grains) read their settings from the dictionary
+
+        Parameters:
+        * `fidelity_dict`: The fidelity settings; empty for full fidelity
+        """
+        self.fidelity_dict = fidelity_dict
+
+    def get_fidelity(self, name:str, default=None):
+        """
+        Gets a fidelity setting of the model
+
+        Parameters:
+        * `name`:    The name of the setting
+        * `default`: The value to return if the setting is undefined
+
+        Returns the value of the setting
+        """
+        return self.fidelity_dict.get(name, default)
+
     def get_param_dict(self) -> dict:
         """
         Returns the parameter info
@@ -74,20 +103,56 @@ class __Model__:
 
     def get_calibrated_model(self, *params): # -> NEML Model
         """
-        Calibrates a model and returns it
+        Calibrates a model and returns it; the calibrated models of the latest parameters
+        are reused for experimental data with the same values in the fields read during the
+        calibration (e.g., curves at the same temperature with the same elastic constants)
 
         Parameters:
         * `params`: The parameter values to calibrate the model
 
         Returns the calibrated model
         """
+
+        # Reuse a calibrated model if the fields that were read have not changed
+        self.deferred_params = None
+        calibrated_key = (tuple(params), tuple(sorted(self.fidelity_dict.items())))
+        if not calibrated_key in self.calibrated_dict:
+            self.calibrated_dict = {calibrated_key: []}
+        for field_dict, calibrated_model in self.calibrated_dict[calibrated_key]:
+            if all(field in self.exp_data and np.array_equal(self.exp_data[field], value) for field, value in field_dict.items()):
+                self.read_field_dict  = field_dict
+                self.calibrated_model = calibrated_model
+                return self.calibrated_model
+
+        # Otherwise, calibrate the model and record the fields that were read
+        self.read_field_dict = {}
         self.calibrated_model = self.calibrate_model(*params)
+        self.calibrated_dict[calibrated_key].append((dict(self.read_field_dict), self.calibrated_model))
         return self.calibrated_model
 
+    def get_read_fields(self) -> list:
+        """
+        Returns the fields of the experimental data that the latest calibrated model depends on
+        """
+        return list(self.read_field_dict.keys())
+
+    def defer_calibration(self, *params) -> None:
+        """
+        Defers calibrating the model for the current experimental data until the calibrated
+        model is requested (e.g., by an error that reads the calibrated model); used when the
+        prediction is cached, so that the calibration is usually not needed
+
+        Parameters:
+        * `params`: The parameter values to calibrate the model
+        """
+        self.deferred_params = params
+
     def get_last_calibrated_model(self):
         """
-        Gets the last calibrated model
+        Gets the last calibrated model, calibrating it first if the calibration was deferred
         """
+        if self.deferred_params != None:
+            self.get_calibrated_model(*self.deferred_params)
         if self.calibrated_model == None:
             raise ValueError("Could not get the calibrated model because it has not been calibrated yet!")
         return self.calibrated_model
@@ -48,6 +48,20 @@ class Model(__Model__):
         # Define lattice structure
         self.lattice = crystallography.CubicLattice(lattice)
         self.lattice.add_slip_system(slip_dir, slip_plane)
+
+    def get_grains(self) -> tuple:
+        """
+        Gets the grains to simulate; at a lower fidelity, only the grains
+        with the largest weights are simulated
+
+        Returns the list of grain orientations and the list of weights
+        """
+        num_grains = self.get_fidelity("num_grains")
+        if num_grains == None or num_grains >= len(self.grain_orientations):
+            return self.grain_orientations, self.weights
+        index_list = sorted(range(len(self.weights)), key=lambda i: -self.weights[i])[:num_grains]
+        index_list = sorted(index_list)
+        return [self.grain_orientations[i] for i in index_list], [self.weights[i] for i in index_list]
         
     def calibrate_model(self, vsh_ts, vsh_b, vsh_t0, ai_g0, ai_n):
         """
@@ -65,5 +79,6 @@ class Model(__Model__):
         ai_model       = inelasticity.AsaroInelasticity(slip_model)
         ep_model       = kinematics.StandardKinematicModel(elastic_model, ai_model)
         sc_model       = singlecrystal.SingleCrystalModel(ep_model, self.lattice, verbose=False, miter=16, max_divide=2)
-        vshai_model    = polycrystal.TaylorModel(sc_model, self.grain_orientations, nthreads=self.num_threads, weights=self.weights)
+        grain_orientations, weights = self.get_grains()
+        vshai_model    = polycrystal.TaylorModel(sc_model, grain_orientations, nthreads=self.num_threads, weights=weights)
         return vshai_model
@@ -0,0 +1,350 @@
+"""
+ Title:         Broker
+ Description:   For evaluating sets of parameters over worker processes on other hosts
+ Author:        Janzen Choi
+
+"""
+
+# Libraries
+import multiprocessing, queue, threading, time, warnings
+from multiprocessing.connection import Listener, Client
+from moga_neml.optimise.controller import Controller, BIG_VALUE
+
+# Constants
+MAX_ATTEMPTS   = 3           # the number of workers a task can be handed to before it is treated as failed
+HEARTBEAT      = "heartbeat" # the message the workers send while calculating
+HEARTBEAT_TIME = 10          # the number of seconds between the heartbeats
+
+# The Broker class
+class Broker:
+
+    def __init__(self, controller:Controller, address, authkey:str, timeout:float=None):
+        """
+        Class for handing out sets of parameters to worker processes over TCP; each worker
+        process runs the same controller setup and connects to the broker via `serve`; the
+        tasks of workers that disconnect are requeued and handed to the remaining workers,
+        up to `MAX_ATTEMPTS` times before the task is treated as failed; workers send a
+        heartbeat every `HEARTBEAT_TIME` seconds while calculating, so slow workers are
+        not treated as lost
+
+        Parameters:
+        * `controller`: The controller to add the statistics of the simulations to
+        * `address`:    The host and port to listen on for workers, or just the port to
+                        only listen on localhost
+        * `authkey`:    The key that the workers must present to connect; the connections
+                        are unpickled, so the key must be kept secret
+        * `timeout`:    The number of seconds without hearing from a worker (i.e., neither
+                        results nor heartbeats) before treating its connection as lost; must
+                        be longer than `HEARTBEAT_TIME`; waits until the worker disconnects
+                        if undefined
+        """
+
+        # Initialise inputs
+        if authkey in [None, ""]:
+            raise ValueError("The broker cannot be started without a key!")
+        if timeout != None and timeout <= HEARTBEAT_TIME:
+            raise ValueError(f"The timeout must be longer than the {HEARTBEAT_TIME}s between the heartbeats of the workers!")
+        self.controller = controller
+        self.address    = get_address(address)
+        self.timeout    = timeout
+
+        # Initialise internal variables
+        self.task_queue   = queue.Queue()
+        self.result_dict  = {}
+        self.condition    = threading.Condition()
+        self.num_workers  = 0
+        self.num_joined   = 0
+        self.num_tasks    = 0
+        self.num_requeued = 0
+        self.num_lost     = 0
+        self.attempt_dict = {}
+        self.closed       = False
+
+        # Start accepting workers
+        self.listener = Listener(self.address, authkey=authkey.encode())
+        self.accept_thread = threading.Thread(target=self.accept_workers, daemon=True)
+        self.accept_thread.start()
+
+    def get_num_workers(self) -> int:
+        """
+        Returns the number of connected worker processes
+        """
+        return self.num_workers
+
+    def accept_workers(self) -> None:
+        """
+        Accepts connections from workers until the broker is closed (for internal use only)
+        """
+        while not self.closed:
+            try:
+                connection = self.listener.accept()
+            except (OSError, EOFError, multiprocessing.AuthenticationError):
+                continue
+            thread = threading.Thread(target=self.serve_worker, args=(connection,), daemon=True)
+            thread.start()
+
+    def serve_worker(self, connection) -> None:
+        """
+        Hands out tasks to a connected worker until it disconnects (for internal use only)
+
+        Parameters:
+        * `connection`: The connection to the worker
+        """
+        with self.condition:
+            self.num_workers += 1
+            self.num_joined  += 1
+        while True:
+
+            # Get the next task, or tell the worker to stop once the broker is closed
+            task = None
+            while task == None and not self.closed:
+                try:
+                    task = self.task_queue.get(timeout=1)
+                except queue.Empty:
+                    pass
+            if task == None:
+                try:
+                    connection.send(None)
+                except (OSError, EOFError):
+                    pass
+                break
+
+            # Send the task and wait for the results, skipping the heartbeats of the worker;
+            # requeue the task if the connection to the worker is lost
+            try:
+                connection.send(task)
+                message = HEARTBEAT
+                while message == HEARTBEAT:
+                    if self.timeout != None and not connection.poll(self.timeout):
+                        raise TimeoutError
+                    message = connection.recv()
+                task_id, objective_dict, stat_dict, prd_data_dict = message
+            except (OSError, EOFError, TimeoutError):
+                self.requeue_task(task)
+                break
+
+            # Store the results
+            with self.condition:
+                self.result_dict[task_id] = objective_dict
+                self.controller.merge_stat_dict(stat_dict)
+                self.controller.hold_prd_data(prd_data_dict)
+                self.condition.notify_all()
+
+        # Disconnect from the worker
+        connection.close()
+        with self.condition:
+            self.num_workers -= 1
+
+    def requeue_task(self, task:tuple) -> None:
+        """
+        Hands the task of a lost worker to the remaining workers, or treats the task as
+        failed once it has been handed to `MAX_ATTEMPTS` workers, so that a set of parameters
+        that kills its workers cannot kill all of them (for internal use only)
+
+        Parameters:
+        * `task`: The task of the lost worker
+        """
+        task_id = task[0]
+        with self.condition:
+            self.num_lost += 1
+            self.attempt_dict[task_id] = self.attempt_dict.get(task_id, 1) + 1
+            if self.attempt_dict[task_id] <= MAX_ATTEMPTS:
+                self.num_requeued += 1
+                self.task_queue.put(task)
+                return
+            self.attempt_dict.pop(task_id)
+            self.result_dict[task_id] = {key: BIG_VALUE for key in self.controller.get_objective_info_list()}
+            self.controller.add_stat("Failed (lost workers)")
+            self.condition.notify_all()
+
+    def evaluate(self, params_list:list, abort_bound:tuple=None) -> list:
+        """
+        Calculates the objectives for a list of parameter sets
+
+        Parameters:
+        * `params_list`: The list of parameter sets
+        * `abort_bound`: The archived solutions and threshold for aborting evaluations early
+
+        Returns the list of objective dictionaries, in the same order as the parameter sets
+        """
+
+        # Queue the tasks
+        task_id_list = list(range(self.num_tasks, self.num_tasks + len(params_list)))
+        self.num_tasks += len(params_list)
+        for task_id, params in zip(task_id_list, params_list):
+            self.task_queue.put((task_id, tuple(params), abort_bound))
+
+        # Wait for all the results and return them in order
+        with self.condition:
+            self.condition.wait_for(lambda: all(task_id in self.result_dict for task_id in task_id_list))
+            for task_id in task_id_list:
+                self.attempt_dict.pop(task_id, None)
+            return [self.result_dict.pop(task_id) for task_id in task_id_list]
+
+    def submit(self, params:tuple, abort_bound:tuple=None) -> int:
+        """
+        Submits a set of parameters to be evaluated asynchronously
+
+        Parameters:
+        * `params`:      The parameter values
+        * `abort_bound`: The archived solutions and threshold for aborting evaluations early
+
+        Returns the ID of the task
+        """
+        task_id = self.num_tasks
+        self.num_tasks += 1
+        self.task_queue.put((task_id, tuple(params), abort_bound))
+        return task_id
+
+    def collect(self) -> tuple:
+        """
+        Waits for the next asynchronously submitted set of parameters to be evaluated
+
+        Returns the ID of the task and the dictionary of objectives
+        """
+        with self.condition:
+            self.condition.wait_for(lambda: len(self.result_dict) > 0)
+            task_id = list(self.result_dict.keys())[0]
+            self.attempt_dict.pop(task_id, None)
+            return task_id, self.result_dict.pop(task_id)
+
+    def get_summary(self) -> list:
+        """
+        Returns a summary of the worker processes and the tasks
+        """
+        return [
+            f"Address ({self.address[0]}:{self.address[1]})",
+            f"Workers ({self.num_joined})",
+            f"Tasks ({self.num_tasks})",
+            f"Requeued ({self.num_requeued})",
+            f"Lost ({self.num_lost})",
+        ]
+
+    def close(self) -> None:
+        """
+        Tells the connected workers, including those that are reconnecting, to stop
+        and stops accepting new workers
+        """
+        self.closed = True
+        self.listener.close()
+
+def get_address(address) -> tuple:
+    """
+    Gets the host and port of a broker
+
+    Parameters:
+    * `address`: The host and port, or just the port of a broker on localhost
+
+    Returns the host and port
+    """
+    if isinstance(address, int):
+        return ("localhost", address)
+    return tuple(address)
+
+def connect(address:tuple, authkey:str, wait:float):
+    """
+    Connects to a broker, retrying while it starts up
+
+    Parameters:
+    * `address`: The host and port of the broker
+    * `authkey`: The key to present to the broker
+    * `wait`:    The number of seconds to keep retrying the connection to the broker
+
+    Returns the connection to the broker
+    """
+    start_time = time.time()
+    while True:
+        try:
+            return Client(address, authkey=authkey.encode())
+        except ConnectionRefusedError:
+            if time.time() - start_time > wait:
+                raise
+            time.sleep(1)
+
+def serve(controller:Controller, address, authkey:str, wait:float=60) -> None:
+    """
+    Connects to a broker and calculates the objectives of the sets of parameters that
+    it hands out, until the broker tells the worker to stop; if the broker drops the
+    connection (e.g., after a timeout), the worker reconnects, and stops if the broker
+    cannot be reached
+
+    Parameters:
+    * `controller`: The controller to calculate the objectives with
+    * `address`:    The host and port of the broker, or just the port of a broker on localhost
+    * `authkey`:    The key to present to the broker
+    * `wait`:       The number of seconds to keep retrying the connection to the broker
+    """
+
+    # Connect to the broker
+    address = get_address(address)
+    connection = connect(address, authkey, wait)
+
+    # Calculate objectives until told to stop
+    while True:
+
+        # Get the next task, reconnecting if the connection was dropped
+        try:
+            task = connection.recv()
+        except (OSError, EOFError):
+            connection = reconnect(connection, address, authkey, wait)
+            if connection == None:
+                return
+            continue
+        if task == None:
+            break
+
+        # Calculate the objectives while sending heartbeats, and send them back; the broker
+        # has requeued the task if the connection was dropped
+        task_id, params, abort_bound = task
+        if abort_bound != None:
+            controller.set_abort_bound(*abort_bound)
+        stop_event = threading.Event()
+        heartbeat_thread = threading.Thread(target=send_heartbeats, args=(connection, stop_event), daemon=True)
+        heartbeat_thread.start()
+        try:
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore")
+                objective_dict = controller.calculate_objectives(*params)
+        finally:
+            stop_event.set()
+            heartbeat_thread.join()
+        try:
+            connection.send((task_id, objective_dict, controller.pop_stat_dict(), controller.get_prd_data_dict(*params)))
+        except (OSError, EOFError):
+            connection = reconnect(connection, address, authkey, wait)
+            if connection == None:
+                return
+    connection.close()
+
+def send_heartbeats(connection, stop_event:threading.Event) -> None:
+    """
+    Tells the broker that the worker is still calculating, every `HEARTBEAT_TIME`
+    seconds until stopped (for internal use only)
+
+    Parameters:
+    * `connection`: The connection to the broker
+    * `stop_event`: The event that is set once the calculation finishes
+    """
+    while not stop_event.wait(HEARTBEAT_TIME):
+        try:
+            connection.send(HEARTBEAT)
+        except (OSError, EOFError):
+            return
+
+def reconnect(connection, address:tuple, authkey:str, wait:float):
+    """
+    Closes a dropped connection to a broker and connects to it again
+
+    Parameters:
+    * `connection`: The dropped connection
+    * `address`:    The host and port of the broker
+    * `authkey`:    The key to present to the broker
+    * `wait`:       The number of seconds to keep retrying the connection to the broker
+
+    Returns the new connection, or none if the broker cannot be reached
+    """
+    connection.close()
+    try:
+        return connect(address, authkey, wait)
+    except OSError:
+        return None
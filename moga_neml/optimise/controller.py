@@ -6,20 +6,33 @@
 """
 
 # Libraries
+import hashlib, multiprocessing, pickle, time
+import numpy as np
+from collections import OrderedDict
 from moga_neml.constraints.__constraint__ import __Constraint__, create_constraint
 from moga_neml.models.__model__ import __Model__, create_model
 from moga_neml.errors.__error__ import __Error__
 from moga_neml.io.plotter import Plotter, EXP_COLOUR, CAL_COLOUR, VAL_COLOUR
 from moga_neml.io.boxplotter import plot_boxplots
-from moga_neml.optimise.driver import Driver
-from moga_neml.optimise.curve import Curve
+from moga_neml.io.database import Database
+from moga_neml.optimise.driver import Driver, COARSEN_DICT, INPUT_FIELD_DICT, get_driver_settings, merge_field_dicts, select_fields
+from moga_neml.optimise.curve import Curve, get_canonical_value
+from moga_neml.optimise.prediction import Prediction
 from moga_neml.helper.experiment import get_labels_list
-from moga_neml.helper.general import reduce_list, transpose
+from moga_neml.helper.data import get_data_size
+from moga_neml.helper.general import get_attribute_info, reduce_list, transpose
 
 # Constants
-MIN_DATA    = 5
-BIG_VALUE   = 10000
-ALL_COLOURS = ["red", "purple", "green", "orange", "blue", "magenta", "cyan", "olive", "pink", "brown"] * 10
+MIN_DATA     = 5
+BIG_VALUE    = 10000
+MIN_ERROR    = 1e-4 # errors below this are compared absolutely in convergence studies
+FAILURE_STAT = "Failed simulations" # the key the workers send their failed simulations and parameters with
+MAX_FAILURES = 100 # the number of the latest failed simulations to keep with their parameters
+CACHE_SIZE   = 128 # MB
+ALL_COLOURS  = ["red", "purple", "green", "orange", "blue", "magenta", "cyan", "olive", "pink", "brown"] * 10
+
+# The controller held by each process for simulating curves
+CURVE_CONTROLLER = None
 
 # The Controller class
 class Controller():
@@ -45,6 +58,41 @@ class Controller():
         self.error_reduction_method     = "average"
         self.objective_reduction_method = "average"
         
+        # Initialise variables for simulating the curves concurrently
+        self.curve_workers = 1
+        self.curve_pool    = None
+        
+        # Initialise variables for isolating the simulations
+        self.isolate = False
+        self.timeout = None
+        
+        # Initialise the statistics of the simulations (e.g., the causes of failures)
+        self.stat_dict    = {}
+        self.failure_list = []
+        
+        # Initialise variables for aborting evaluations early
+        self.abort_order     = None
+        self.abort_archive   = []
+        self.abort_threshold = None
+        self.sim_time_dict   = {}
+        
+        # Initialise variables for screening evaluations at a lower fidelity
+        self.fidelity_dict     = {}
+        self.low_fidelity_dict = None
+        self.promote           = 1.0
+        
+        # Initialise the cache of predictions, from the least to the most recently used
+        self.cache_dict   = OrderedDict()
+        self.cache_limit  = CACHE_SIZE * 1024**2
+        self.cache_memory = 0
+        self.shared_dict  = {} # the predictions of the latest parameters, shared by curves with the same inputs
+        self.held_dict    = {} # the predictions of evaluated parameters that have not been recorded yet
+        self.best_dict    = {} # the predictions of the best recorded parameters, kept outside the cache
+        self.read_fields_dict = {} # the fields read by the calibration of the model for each curve
+        
+        # Initialise the database of evaluated sets of parameters
+        self.database = None
+        
     def define_model(self, model_name:str, **kwargs) -> None:
         """
         Defines the model
@@ -53,6 +101,12 @@ class Controller():
         * `model_name`: The name of the model
         """
         self.model = create_model(model_name, **kwargs)
+        self.cache_dict.clear()
+        self.cache_memory = 0
+        self.shared_dict  = {}
+        self.held_dict    = {}
+        self.best_dict    = {}
+        self.read_fields_dict = {}
         
     def add_curve(self, exp_data:dict) -> None:
         """
@@ -277,9 +331,585 @@ class Controller():
             for error in error_list:
                 error_group_key = error.get_group_key(self.group_name, self.group_type, self.group_labels)
                 objective_info_list.append(error_group_key)
-        objective_info_list = list(set(objective_info_list))
+        objective_info_list = sorted(set(objective_info_list)) # same order in every process
         return objective_info_list
 
+    def set_curve_workers(self, curve_workers:int) -> None:
+        """
+        Changes the number of processes used to simulate the curves of a set of parameters
+
+        Parameters:
+        * `curve_workers`: The number of processes
+        """
+        self.curve_workers = curve_workers
+
+    def open_curve_pool(self) -> None:
+        """
+        Starts the processes for simulating the curves concurrently, if more than
+        one process has been defined; the processes hold a copy of the controller,
+        so they should be started after the model and curves have been defined
+        """
+        if self.curve_workers <= 1 or self.curve_pool != None:
+            return
+        context = multiprocessing.get_context("fork")
+        self.curve_pool = context.Pool(self.curve_workers, initializer=initialise_curve_worker, initargs=(self,))
+
+    def close_curve_pool(self) -> None:
+        """
+        Shuts down the processes for simulating the curves concurrently
+        """
+        if self.curve_pool == None:
+            return
+        self.curve_pool.close()
+        self.curve_pool.join()
+        self.curve_pool = None
+
+    def set_isolation(self, isolate:bool=True, timeout:float=None) -> None:
+        """
+        Changes whether each simulation is run in a separate process that can be killed
+
+        Parameters:
+        * `isolate`: Whether to isolate the simulations
+        * `timeout`: The number of seconds each isolated simulation is allowed to run for
+        """
+        self.isolate = isolate
+        self.timeout = timeout
+
+    def add_stat(self, stat_name:str, value:float=1) -> None:
+        """
+        Adds to a statistic of the simulations
+
+        Parameters:
+        * `stat_name`: The name of the statistic
+        * `value`:     The value to add to the statistic
+        """
+        self.stat_dict[stat_name] = self.stat_dict.get(stat_name, 0) + value
+
+    def add_failure(self, curve:Curve, failure:str, *params) -> None:
+        """
+        Counts a failed simulation and records it with the set of parameters that caused
+        it, keeping only the latest `MAX_FAILURES` records
+
+        Parameters:
+        * `curve`:   The curve that failed to be simulated
+        * `failure`: The cause of the failure
+        * `params`:  The parameters for the simulation
+        """
+        self.add_stat(f"Failed ({failure})")
+        params = self.incorporate_fix_param_dict(*params)
+        failure_dict = {"curve": curve.get_exp_data()["file_name"], "failure": failure}
+        failure_dict.update({name: float(param) for name, param in zip(self.get_param_names(), params)})
+        self.merge_failure_list([failure_dict])
+
+    def merge_failure_list(self, failure_list:list) -> None:
+        """
+        Adds records of failed simulations, keeping only the latest `MAX_FAILURES` records
+
+        Parameters:
+        * `failure_list`: The list of records of the failed simulations
+        """
+        self.failure_list = (self.failure_list + failure_list)[-MAX_FAILURES:]
+
+    def get_failure_list(self) -> list:
+        """
+        Returns the list of the latest failed simulations and the sets of parameters that caused them
+        """
+        return self.failure_list
+
+    def get_stat_dict(self) -> dict:
+        """
+        Returns the dictionary of statistics
+        """
+        return self.stat_dict
+
+    def pop_stat_dict(self) -> dict:
+        """
+        Returns the dictionary of statistics, including the records of the failed
+        simulations, and resets them; used by worker processes to send their statistics
+        back with their results
+        """
+        stat_dict = self.stat_dict
+        if self.failure_list != []:
+            stat_dict[FAILURE_STAT] = self.failure_list
+        self.stat_dict    = {}
+        self.failure_list = []
+        return stat_dict
+
+    def merge_stat_dict(self, stat_dict:dict) -> None:
+        """
+        Adds the statistics from another process
+
+        Parameters:
+        * `stat_dict`: The dictionary of statistics
+        """
+        for stat_name, value in stat_dict.items():
+            if stat_name == FAILURE_STAT:
+                self.merge_failure_list(value)
+            else:
+                self.add_stat(stat_name, value)
+
+    def set_early_abort(self, order:str="time") -> None:
+        """
+        Evaluates the curves one at a time and stops the evaluation once the set of
+        parameters cannot beat the archived sets of parameters
+
+        Parameters:
+        * `order`: The order to evaluate the curves in ("time" for the fastest curves
+                   first, "defined" for the order the curves were read, or none to disable)
+        """
+        if not order in [None, "time", "defined"]:
+            raise ValueError(f"The order '{order}' for evaluating the curves is not supported!")
+        self.abort_order = order
+
+    def get_early_abort(self) -> str:
+        """
+        Returns the order to evaluate the curves in when aborting evaluations early;
+        none if evaluations are not aborted early
+        """
+        return self.abort_order
+
+    def set_abort_bound(self, archive:list, threshold:float=None) -> None:
+        """
+        Defines the solutions that the evaluated sets of parameters must beat
+
+        Parameters:
+        * `archive`:   The list of dictionaries of objectives of the archived solutions
+        * `threshold`: The reduced objective value that must be beaten; no threshold if undefined
+        """
+        self.abort_archive   = archive
+        self.abort_threshold = threshold
+
+    def get_abort_curve_list(self, curve_list:list) -> list:
+        """
+        Sorts a list of curves into the order to evaluate them in when aborting early
+
+        Parameters:
+        * `curve_list`: The list of curves
+
+        Returns the sorted list of curves; curves that have not been timed come first
+        """
+        if self.abort_order != "time":
+            return curve_list
+        def get_sim_time(curve:Curve) -> float:
+            total_time, num_sims = self.sim_time_dict.get(self.curve_list.index(curve), (0, 0))
+            return total_time / num_sims if num_sims > 0 else 0
+        return sorted(curve_list, key=get_sim_time)
+
+    def is_beaten(self, error_list_dict:dict, num_error_dict:dict) -> bool:
+        """
+        Checks whether a partially evaluated set of parameters cannot beat the archived
+        solutions; since the errors are non-negative, treating the remaining errors as
+        zeros gives a lower bound on each objective
+
+        Parameters:
+        * `error_list_dict`: The dictionary of the errors calculated so far
+        * `num_error_dict`:  The dictionary of the total number of errors for each objective
+
+        Returns whether the lower bound is dominated by, or worse than, the archive
+        """
+
+        # Get the lower bound of the objectives
+        bound_list_dict = {}
+        for key in error_list_dict.keys():
+            num_remaining = num_error_dict[key] - len(error_list_dict[key])
+            bound_list_dict[key] = error_list_dict[key] + [0] * num_remaining
+        bound_dict = self.reduce_errors(bound_list_dict)
+
+        # Check against the threshold
+        if self.abort_threshold != None and self.reduce_objectives(list(bound_dict.values())) > self.abort_threshold:
+            return True
+
+        # Check whether any archived solution dominates the lower bound
+        for objective_dict in self.abort_archive:
+            difference_list = [bound_dict[key] - objective_dict[key] for key in bound_dict.keys()]
+            if min(difference_list) >= 0 and max(difference_list) > 0:
+                return True
+        return False
+
+    def set_driver_settings(self, curve:Curve, driver_settings:dict) -> None:
+        """
+        Changes the settings of the driver for a curve
+
+        Parameters:
+        * `curve`:           The curve
+        * `driver_settings`: The dictionary of driver settings (e.g., `num_steps`)
+        """
+        valid_list = list(get_driver_settings().keys())
+        for key in driver_settings.keys():
+            if not key in valid_list:
+                raise ValueError(f"The driver setting '{key}' is not supported; use one of {valid_list}")
+        curve.set_driver_settings({**curve.get_driver_settings(), **driver_settings})
+
+    def study_convergence(self, params:list, num_steps_list:list, logspace_list:list, tolerance:float) -> tuple:
+        """
+        Simulates each curve with errors over a range of step counts and stepping schemes,
+        and finds the cheapest settings whose errors stay within a tolerance of the errors
+        with the finest settings (i.e., the most steps and the current stepping scheme);
+        the stepping schemes only apply to creep curves, and curves with custom drivers
+        are not studied
+
+        Parameters:
+        * `params`:         The parameters for the simulations
+        * `num_steps_list`: The list of step counts
+        * `logspace_list`:  The list of stepping schemes (i.e., whether the steps are
+                            spaced logarithmically)
+        * `tolerance`:      The maximum relative difference from the errors with the finest settings
+
+        Returns a list of dictionaries summarising the simulations, and a list of the
+        curves and their cheapest settings
+        """
+        row_list, best_list = [], []
+        for curve in self.curve_list:
+            
+            # Skip curves without errors or with custom drivers
+            if curve.is_validation() or curve.get_custom_driver()[0] != None:
+                continue
+            calibrated_model = self.calibrate_model(curve, *params)
+            if calibrated_model == None:
+                raise ValueError("The convergence cannot be studied because the parameters are invalid!")
+
+            # Define the settings, starting with the finest settings
+            original_settings = curve.get_driver_settings()
+            logspace = original_settings.get("logspace", get_driver_settings()["logspace"])
+            scheme_list = logspace_list if curve.get_type() == "creep" else [logspace]
+            settings_list = [(max(num_steps_list), logspace)]
+            settings_list += [(num_steps, scheme) for scheme in scheme_list for num_steps in sorted(num_steps_list)
+                              if (num_steps, scheme) != settings_list[0]]
+
+            # Simulate the curve with each of the settings
+            curve_row_list = []
+            for num_steps, scheme in settings_list:
+                curve.set_driver_settings({**original_settings, "num_steps": num_steps, "logspace": scheme})
+                start_time = time.time()
+                prd_data = self.run_driver(curve, calibrated_model, *params)
+                sim_time = time.time() - start_time
+                prd_data = Prediction(select_fields(prd_data, self.get_field_dict(curve))) if prd_data != None else None
+                error_list = [error.get_value(prd_data) if prd_data != None else None for error in curve.get_error_list()]
+                if curve_row_list == []:
+                    ref_error_list = error_list
+                if None in error_list + ref_error_list:
+                    deviation = float("inf")
+                else:
+                    deviation = max([abs(error - ref_error) / max(abs(ref_error), MIN_ERROR)
+                                     for error, ref_error in zip(error_list, ref_error_list)])
+                curve_row_list.append({
+                    "curve": curve.get_exp_data()["file_name"], "type": curve.get_type(), "num_steps": num_steps,
+                    "logspace": scheme, "time": sim_time, "deviation": deviation, "converged": deviation <= tolerance,
+                })
+            curve.set_driver_settings(original_settings)
+
+            # Choose the cheapest settings that have converged (i.e., the fastest measured simulation)
+            converged_list = [row for row in curve_row_list if row["converged"]]
+            if converged_list != []:
+                best_row = min(converged_list, key=lambda row: row["time"])
+                best_list.append((curve, {"num_steps": best_row["num_steps"], "logspace": best_row["logspace"]}))
+            for row in curve_row_list:
+                row["chosen"] = converged_list != [] and row is best_row
+            row_list += curve_row_list
+        return row_list, best_list
+
+    def set_low_fidelity(self, fidelity_dict:dict, promote:float=1.0) -> None:
+        """
+        Screens the sets of parameters at a lower fidelity, and only evaluates the
+        promising sets of parameters at full fidelity
+
+        Parameters:
+        * `fidelity_dict`: The settings of the lower fidelity (i.e., the driver settings,
+                           such as `num_steps`, `rel_tol`, and `abs_tol`, and the model
+                           settings, such as `num_grains`); none to stop screening
+        * `promote`:       The fraction of the archived solutions that a set of parameters
+                           must beat at the lower fidelity to be evaluated at full fidelity
+        """
+        if fidelity_dict != None:
+            valid_list = list(COARSEN_DICT.keys()) + ["num_grains"]
+            for key in fidelity_dict.keys():
+                if not key in valid_list:
+                    raise ValueError(f"The fidelity setting '{key}' is not supported; use one of {valid_list}")
+        if promote <= 0 or promote > 1:
+            raise ValueError("The fraction of archived solutions to beat must be above 0 and at most 1")
+        self.low_fidelity_dict = fidelity_dict
+        self.promote           = promote
+
+    def get_low_fidelity(self) -> dict:
+        """
+        Returns the settings of the lower fidelity; none if not screening
+        """
+        return self.low_fidelity_dict
+
+    def set_fidelity(self, fidelity_dict:dict) -> None:
+        """
+        Sets the fidelity of the simulations
+
+        Parameters:
+        * `fidelity_dict`: The settings of the fidelity; empty for full fidelity
+        """
+        self.fidelity_dict = fidelity_dict
+        self.model.set_fidelity(fidelity_dict)
+
+    def is_promoted(self, objective_dict:dict) -> bool:
+        """
+        Checks whether a set of parameters evaluated at the lower fidelity is
+        promising enough to evaluate at full fidelity
+
+        Parameters:
+        * `objective_dict`: The objectives at the lower fidelity
+
+        Returns whether to evaluate the set of parameters at full fidelity
+        """
+        reduced_list = sorted([self.reduce_objectives(list(archive_dict.values())) for archive_dict in self.abort_archive])
+        index = min(int(self.promote * len(reduced_list)), len(reduced_list) - 1)
+        return self.reduce_objectives(list(objective_dict.values())) <= reduced_list[index]
+
+    def set_cache_size(self, cache_size:float) -> None:
+        """
+        Changes the memory limit of the cache of predictions
+
+        Parameters:
+        * `cache_size`: The memory limit in MB; disables the cache if zero
+        """
+        self.cache_limit = cache_size * 1024**2
+        while self.cache_memory > self.cache_limit:
+            self.cache_memory -= self.cache_dict.popitem(last=False)[1][1]
+
+    def get_signature(self, curve:Curve) -> str:
+        """
+        Gets a hash of the inputs of the simulation of a curve (i.e., the fields of the
+        experimental data read by the driver and by the calibration of the model, and the
+        driver); curves with the same inputs (e.g., repeated specimens) have the same
+        prediction; the model must have been calibrated for the curve once, since the fields
+        read by the calibration are assumed to be the same for all parameters
+
+        Parameters:
+        * `curve`: The curve to predict
+
+        Returns the hash
+        """
+        exp_data = curve.get_exp_data()
+        custom_driver, custom_driver_kwargs = curve.get_custom_driver()
+        field_list = ["type"] + self.read_fields_dict[curve]
+        if custom_driver == None:
+            field_list += INPUT_FIELD_DICT.get(curve.get_type(), [])
+        input_info = [(field, get_canonical_value(exp_data.get(field))) for field in sorted(set(field_list))]
+        input_info += [custom_driver, custom_driver_kwargs, sorted(curve.get_driver_settings().items())]
+        return hashlib.md5(pickle.dumps(input_info)).hexdigest()
+
+    def get_field_dict(self, curve:Curve) -> dict:
+        """
+        Gets the fields of the predicted data that are needed for a curve (i.e., the fields
+        read by its errors and constraints, and the fields that are plotted)
+
+        Parameters:
+        * `curve`: The curve to predict
+
+        Returns the dictionary mapping the fields to "all" or "last"
+        """
+        plot_field_dict = {label: "all" for labels in get_labels_list(curve.get_type()) for label in labels}
+        field_dict_list = [plot_field_dict] + [error.get_field_dict() for error in curve.get_error_list()]
+        field_dict_list += [constraint.get_field_dict() for constraint in self.constraint_list
+                            if curve in constraint.get_curve_list()]
+        return merge_field_dicts(field_dict_list)
+
+    def get_shared_field_dict(self, curve:Curve) -> dict:
+        """
+        Gets the fields of the predicted data to keep when simulating a curve, which are the
+        fields needed by all the curves that may share its prediction (i.e., the curves of
+        the same type); each curve then selects the fields it needs from the prediction
+
+        Parameters:
+        * `curve`: The curve to predict
+
+        Returns the dictionary mapping the fields to "all" or "last"
+        """
+        sharing_list = [other for other in self.curve_list if other.get_type() == curve.get_type()]
+        return merge_field_dicts([self.get_field_dict(other) for other in sharing_list])
+
+    def get_cache_key(self, curve:Curve, *params) -> tuple:
+        """
+        Gets the key identifying a simulation in the cache of predictions (i.e., the
+        parameters, the inputs of the simulation, the fidelity, and the fields that are
+        kept); the model must have been calibrated for the curve once
+
+        Parameters:
+        * `curve`:  The curve to predict
+        * `params`: The parameters for the prediction
+
+        Returns the key
+        """
+        params = self.incorporate_fix_param_dict(*params)
+        params = tuple([float(param) for param in params])
+        field_info = tuple(sorted(self.get_shared_field_dict(curve).items()))
+        return params, self.get_signature(curve), tuple(sorted(self.fidelity_dict.items())), field_info
+
+    def get_cached_prd_data(self, cache_key:tuple) -> tuple:
+        """
+        Looks up a prediction in the cache of predictions
+
+        Parameters:
+        * `cache_key`: The key identifying the simulation
+
+        Returns whether the prediction was found and a shallow copy of the prediction,
+        whose arrays are read-only (none if the simulation failed)
+        """
+        if cache_key in self.shared_dict:
+            self.add_stat("Shared simulations")
+            return True, copy_prd_data(self.shared_dict[cache_key])
+        if cache_key in self.best_dict:
+            self.add_stat("Cache (hits)")
+            return True, copy_prd_data(self.best_dict[cache_key])
+        if self.cache_limit <= 0:
+            return False, None
+        if not cache_key in self.cache_dict:
+            self.add_stat("Cache (misses)")
+            return False, None
+        self.add_stat("Cache (hits)")
+        self.cache_dict.move_to_end(cache_key)
+        return True, copy_prd_data(self.cache_dict[cache_key][0])
+
+    def cache_prd_data(self, cache_key:tuple, prd_data:dict) -> dict:
+        """
+        Adds a prediction to the cache of predictions, removing the least recently
+        used predictions once the memory limit is exceeded; the arrays of the prediction
+        are made read-only, so the prediction is stored without being copied
+
+        Parameters:
+        * `cache_key`: The key identifying the simulation
+        * `prd_data`:  The predicted data; none if the simulation failed
+
+        Returns a shallow copy of the stored prediction
+        """
+        prd_data = freeze_prd_data(prd_data)
+        if len(self.shared_dict) > 0 and list(self.shared_dict.keys())[0][0] != cache_key[0]:
+            self.shared_dict = {}
+        self.shared_dict[cache_key] = prd_data
+        if self.cache_limit > 0 and not cache_key in self.cache_dict:
+            data_size = 0 if prd_data == None else get_data_size(prd_data)
+            self.cache_dict[cache_key] = (prd_data, data_size)
+            self.cache_memory += data_size
+            while self.cache_memory > self.cache_limit:
+                self.cache_memory -= self.cache_dict.popitem(last=False)[1][1]
+        return copy_prd_data(prd_data)
+
+    def get_prd_data_dict(self, *params) -> dict:
+        """
+        Gets the predictions of the curves for a set of parameters that were just evaluated,
+        without counting them as cache hits; used to send the predictions from the worker
+        processes, and to hold them until the parameters are recorded
+
+        Parameters:
+        * `params`: The parameters for the predictions
+
+        Returns the dictionary mapping the keys of the simulations to the predictions
+        """
+        prd_data_dict = {}
+        for curve in self.curve_list:
+            if not curve in self.read_fields_dict:
+                continue
+            cache_key = self.get_cache_key(curve, *params)
+            if cache_key in self.shared_dict:
+                prd_data_dict[cache_key] = self.shared_dict[cache_key]
+            elif cache_key in self.best_dict:
+                prd_data_dict[cache_key] = self.best_dict[cache_key]
+            elif cache_key in self.cache_dict:
+                prd_data_dict[cache_key] = self.cache_dict[cache_key][0]
+        return prd_data_dict
+
+    def hold_prd_data(self, prd_data_dict:dict) -> None:
+        """
+        Holds the predictions of evaluated sets of parameters until the parameters are
+        recorded, since the cache may drop them before then
+
+        Parameters:
+        * `prd_data_dict`: The dictionary mapping the keys of the simulations to the predictions
+        """
+        for cache_key, prd_data in prd_data_dict.items():
+            self.held_dict.setdefault(cache_key[0], {})[cache_key] = freeze_prd_data(prd_data)
+
+    def keep_prd_data(self, is_best:bool, *params) -> None:
+        """
+        Releases the held predictions of a recorded set of parameters, and keeps them
+        outside the cache if the parameters are the best so far, so that recording the
+        results of the best parameters does not simulate them again; the predictions of
+        parameters whose objectives were read from the database are not held
+
+        Parameters:
+        * `is_best`: Whether the parameters are the best so far
+        * `params`:  The parameters for the predictions
+        """
+        params = tuple([float(param) for param in self.incorporate_fix_param_dict(*params)])
+        prd_data_dict = self.held_dict.pop(params, {})
+        if is_best:
+            self.best_dict = prd_data_dict
+
+    def set_database(self, database:Database) -> None:
+        """
+        Defines the database of evaluated sets of parameters
+
+        Parameters:
+        * `database`: The database; none to stop using the database
+        """
+        self.database = database
+
+    def get_database_key(self, include_validation:bool, *params) -> str:
+        """
+        Gets the key identifying a set of parameters in the database; the key covers
+        everything that affects the objectives (i.e., the model, the parameters, the
+        curves, the errors, the constraints, the reduction methods, and the drivers)
+
+        Parameters:
+        * `include_validation`: Whether the validation data is included
+        * `params`:             The parameters for the prediction
+
+        Returns the key
+        """
+
+        # Summarise the definitions of the model and the optimisation
+        study_info = [
+            get_attribute_info(self.model), include_validation,
+            self.group_name, self.group_type, self.group_labels,
+            self.error_reduction_method, self.objective_reduction_method,
+            self.timeout if self.isolate else None, sorted(get_driver_settings().items()),
+        ]
+
+        # Summarise the curves, errors, and constraints
+        for curve in self.curve_list:
+            error_info_list = [get_attribute_info(error) for error in curve.get_error_list()]
+            study_info.append((curve.get_hash(), error_info_list))
+        for constraint in self.constraint_list:
+            curve_index_list = [self.curve_list.index(curve) for curve in constraint.get_curve_list()]
+            study_info.append((get_attribute_info(constraint), curve_index_list))
+
+        # Combine with the parameters
+        params = [float(param) for param in self.incorporate_fix_param_dict(*params)]
+        return hashlib.md5(pickle.dumps((study_info, params))).hexdigest()
+
+    def calibrate_model(self, curve:Curve, *params):
+        """
+        Calibrates the model for a curve; returns none if the parameters are invalid
+
+        Parameters:
+        * `curve`:  The curve to calibrate the model for
+        * `params`: The parameters for the calibration
+
+        Returns the calibrated model
+        """
+        params = self.incorporate_fix_param_dict(*params)
+        self.model.set_exp_data(curve.get_exp_data())
+        calibrated_model = self.model.get_calibrated_model(*params)
+        self.read_fields_dict[curve] = self.model.get_read_fields()
+        return calibrated_model
+
+    def defer_calibration(self, curve:Curve, *params) -> None:
+        """
+        Defers calibrating the model for a curve until the calibrated model is needed
+
+        Parameters:
+        * `curve`:  The curve to calibrate the model for
+        * `params`: The parameters for the calibration
+        """
+        params = self.incorporate_fix_param_dict(*params)
+        self.model.set_exp_data(curve.get_exp_data())
+        self.model.defer_calibration(*params)
+
     def get_prd_data(self, curve:Curve, *params) -> dict:
         """
         Gets the predicted curve; returns none if the data is invalid
@@ -291,28 +921,117 @@ class Controller():
         Returns the predicted data
         """
         
-        # Fix parameters and calibrate the model
-        params = self.incorporate_fix_param_dict(*params)
-        self.model.set_exp_data(curve.get_exp_data())
-        calibrated_model = self.model.get_calibrated_model(*params)
-        if calibrated_model == None:
-            return None
+        # Get the prediction from the cache, only calibrating the model if it is needed
+        cache_key, is_cached = None, False
+        if curve in self.read_fields_dict:
+            cache_key = self.get_cache_key(curve, *params)
+            is_cached, prd_data = self.get_cached_prd_data(cache_key)
+        if is_cached:
+            self.defer_calibration(curve, *params)
         
-        # Get the driver and prediction
-        model_driver = Driver(curve, calibrated_model)
+        # Or calibrate the model, and simulate and cache the prediction
+        else:
+            calibrated_model = self.calibrate_model(curve, *params)
+            if calibrated_model == None:
+                return None
+            if cache_key == None:
+                cache_key = self.get_cache_key(curve, *params)
+                is_cached, prd_data = self.get_cached_prd_data(cache_key)
+            if not is_cached:
+                prd_data = self.cache_prd_data(cache_key, self.run_driver(curve, calibrated_model, *params))
+        
+        # Add the latest prediction, with only the fields the curve needs, to the curve and return the data
+        if prd_data != None:
+            prd_data = Prediction(select_fields(prd_data, self.get_field_dict(curve)))
+            curve.set_prd_data(prd_data)
+        return prd_data
+
+    def run_driver(self, curve:Curve, calibrated_model, *params) -> dict:
+        """
+        Simulates a curve; returns none if the data is invalid
+
+        Parameters:
+        * `curve`:            The curve to predict
+        * `calibrated_model`: The model calibrated for the curve
+        * `params`:           The parameters the model was calibrated with
+
+        Returns the predicted data
+        """
+        
+        # Get the driver and prediction, only keeping the fields needed by the curves sharing the prediction
+        field_dict = self.get_shared_field_dict(curve)
+        model_driver = Driver(curve, calibrated_model, self.isolate, self.timeout, self.fidelity_dict, field_dict)
         prd_data = model_driver.run()
 
         # Check data has some data points
         if prd_data == None:
+            self.add_failure(curve, model_driver.get_failure(), *params)
             return
         for field in prd_data.keys():
-            if len(prd_data[field]) < MIN_DATA:
+            if field_dict[field] == "all" and len(prd_data[field]) < MIN_DATA:
+                self.add_stat("Failed (insufficient data)")
                 return
-        
-        # Add the latest prediction to the curve and return the data
-        curve.set_prd_data(prd_data)
         return prd_data
     
+    def get_prd_data_list(self, curve_list:list, *params) -> list:
+        """
+        Gets the predicted curves for a list of curves, concurrently if the processes
+        have been started; returns none if any of the data is invalid
+
+        Parameters:
+        * `curve_list`: The list of curves to predict
+        * `params`:     The parameters for the prediction
+
+        Returns the list of predicted data
+        """
+
+        # Simulate the curves one by one
+        if self.curve_pool == None:
+            prd_data_list = []
+            for curve in curve_list:
+                prd_data = self.get_prd_data(curve, *params)
+                if prd_data == None:
+                    return
+                prd_data_list.append(prd_data)
+            return prd_data_list
+
+        # Otherwise, identify the simulations, calibrating the model for the curves that have not been calibrated
+        cache_key_list = []
+        for curve in curve_list:
+            if not curve in self.read_fields_dict and self.calibrate_model(curve, *params) == None:
+                return
+            cache_key_list.append(self.get_cache_key(curve, *params))
+
+        # Get the cached predictions, and simulate the other distinct simulations concurrently
+        prd_data_list = []
+        missing_list = []
+        for i in range(len(curve_list)):
+            is_cached, prd_data = self.get_cached_prd_data(cache_key_list[i])
+            prd_data_list.append(prd_data)
+            if not is_cached:
+                missing_list.append(i)
+        index_dict = {}
+        for i in missing_list:
+            index_dict[cache_key_list[i]] = index_dict.get(cache_key_list[i], i)
+        index_list = list(index_dict.values())
+        task_list = [(self.curve_list.index(curve_list[i]), params, self.fidelity_dict) for i in index_list]
+        result_list = self.curve_pool.starmap(simulate_curve, task_list)
+        for i, (prd_data, stat_dict) in zip(index_list, result_list):
+            self.merge_stat_dict(stat_dict)
+            prd_data_list[i] = self.cache_prd_data(cache_key_list[i], prd_data)
+        for i in missing_list:
+            if not i in index_list:
+                prd_data_list[i] = self.get_cached_prd_data(cache_key_list[i])[1]
+        if None in prd_data_list:
+            return
+
+        # Add the predictions, with only the fields each curve needs, to the curves and return the data
+        prd_data_list = [Prediction(select_fields(prd_data, self.get_field_dict(curve)))
+                         for curve, prd_data in zip(curve_list, prd_data_list)]
+        for curve, prd_data in zip(curve_list, prd_data_list):
+            curve.set_prd_data(prd_data)
+        return prd_data_list
+    
     def reduce_errors(self, error_list_dict:dict) -> dict:
         """
         Defines how the errors are reduced
@@ -347,7 +1066,8 @@ class Controller():
     
     def calculate_objectives(self, *params, include_validation=False) -> dict:
         """
-        Calculates the error values for a set of parameters
+        Calculates the error values for a set of parameters, or gets them from the
+        database if the set of parameters has already been evaluated
 
         Parameters:
         * `params`:             The parameters for the prediction
@@ -355,6 +1075,44 @@ class Controller():
 
         Returns a dictionary of the objectives
         """
+
+        # Get the objectives from the database
+        if self.database != None:
+            database_key = self.get_database_key(include_validation, *params)
+            objective_dict = self.database.get_objectives(database_key)
+            if objective_dict != None and set(objective_dict.values()) != {BIG_VALUE}: # failures stored by older runs are retried
+                self.add_stat("Database (hits)")
+                return objective_dict
+            self.add_stat("Database (misses)")
+
+        # Screen the set of parameters at the lower fidelity, once there is an archive to compare with
+        if self.low_fidelity_dict != None and not include_validation and self.abort_threshold != None:
+            self.set_fidelity(self.low_fidelity_dict)
+            objective_dict, _ = self.evaluate_objectives(*params)
+            self.set_fidelity({})
+            if not self.is_promoted(objective_dict):
+                self.add_stat("Screened out (low fidelity)")
+                return {key: BIG_VALUE for key in self.get_objective_info_list()}
+            self.add_stat("Promoted (full fidelity)")
+
+        # Evaluate the set of parameters and store the objectives, unless the evaluation did not complete
+        objective_dict, is_complete = self.evaluate_objectives(*params, include_validation=include_validation)
+        if self.database != None and is_complete:
+            full_params = self.incorporate_fix_param_dict(*params)
+            self.database.set_objectives(database_key, self.model.get_name(), full_params, objective_dict)
+        return objective_dict
+
+    def evaluate_objectives(self, *params, include_validation=False) -> tuple:
+        """
+        Evaluates the error values for a set of parameters
+
+        Parameters:
+        * `params`:             The parameters for the prediction
+        * `include_validation`: Whether to include the validation data
+
+        Returns a dictionary of the objectives and whether the evaluation completed (i.e.,
+        whether all the curves were simulated and all the constraints were satisfied)
+        """
         
         # Create a dictionary of errors
         objective_info_list = self.get_objective_info_list()
@@ -362,39 +1120,71 @@ class Controller():
         error_list_dict = {key: value for key, value in zip(objective_info_list, empty_list_list)}
         
         # Initialise
-        prd_data_list = []
         failed_dict = {key: value for key, value in zip(objective_info_list, [BIG_VALUE] * len(objective_info_list))}
         
+        # Ignore validation data
+        curve_list = [curve for curve in self.curve_list if len(curve.get_error_list()) > 0 or include_validation]
+        
+        # Simulate all the curves concurrently, if the processes have been started
+        if self.curve_pool != None:
+            prd_data_list = self.get_prd_data_list(curve_list, *params)
+            if prd_data_list == None:
+                return failed_dict, False
+
+        # Or order the curves and count the errors, if aborting early
+        abort_early = self.abort_order != None and self.curve_pool == None
+        if abort_early:
+            curve_list = self.get_abort_curve_list(curve_list)
+            num_error_dict = {key: 0 for key in objective_info_list}
+            for curve in curve_list:
+                for error in curve.get_error_list():
+                    num_error_dict[error.get_group_key(self.group_name, self.group_type, self.group_labels)] += 1
+
         # Iterate through experimental data
-        for curve in self.curve_list:
+        prediction_dict = {}
+        for i in range(len(curve_list)):
             
-            # Ignore validation data
-            error_list = curve.get_error_list()
-            if len(error_list) == 0 and not include_validation:
-                continue
-
             # Get prediction for training data
-            prd_data = self.get_prd_data(curve, *params)
-            if prd_data == None:
-                return failed_dict
+            curve = curve_list[i]
+            error_list = curve.get_error_list()
+            if self.curve_pool == None:
+                start_time = time.time()
+                prd_data = self.get_prd_data(curve, *params)
+                if prd_data == None:
+                    return failed_dict, False
+                if abort_early:
+                    total_time, num_sims = self.sim_time_dict.get(self.curve_list.index(curve), (0, 0))
+                    self.sim_time_dict[self.curve_list.index(curve)] = (total_time + time.time() - start_time, num_sims + 1)
+            
+            # Or get the concurrent prediction, and calibrate the model for the errors if needed
+            else:
+                prd_data = prd_data_list[i]
+                self.defer_calibration(curve, *params)
 
             # Gets all the errors and add to dictionary
+            prediction_dict[curve] = prd_data
             for error in error_list:
                 error_value = error.get_value(prd_data)
                 error_value = error_value * error.get_weight() if error_value != None else BIG_VALUE
                 error_group_key = error.get_group_key(self.group_name, self.group_type, self.group_labels)
                 error_list_dict[error_group_key].append(error_value)
 
-        # Checks all the constraints
+            # Stop if the remaining curves cannot make the set of parameters beat the archive
+            if abort_early and i < len(curve_list) - 1 and self.is_beaten(error_list_dict, num_error_dict):
+                self.add_stat("Aborted evaluations")
+                self.add_stat("Skipped simulations", len(curve_list) - i - 1)
+                return failed_dict, False
+
+        # Checks all the constraints with the predictions of this evaluation
         for constraint in self.constraint_list:
             curve_list = constraint.get_curve_list()
-            prd_data_list = [curve.get_prd_data() for curve in curve_list if len(curve.get_error_list()) > 0]
+            prd_data_list = [prediction_dict[curve] for curve in curve_list if len(curve.get_error_list()) > 0]
             if not constraint.check(prd_data_list):
-                return failed_dict
+                return failed_dict, False
         
         # Reduce and return errors
         objective_dict = self.reduce_errors(error_list_dict)
-        return objective_dict
+        return objective_dict, True
 
     def plot_exp_curves(self, type:str, file_path:str="", x_log:bool=False, y_log:bool=False) -> None:
         """
@@ -449,12 +1239,9 @@ class Controller():
         typed_curve_list = [curve for curve in self.curve_list if curve.get_type() == type]
         prd_data_list_list = []
         for params in params_list:
-            prd_data_list = []
-            for curve in typed_curve_list:
-                prd_data = self.get_prd_data(curve, *params)
-                if prd_data == None:
-                    raise ValueError(f"The model is unable to run with the parameters - {params}!")
-                prd_data_list.append(prd_data)
+            prd_data_list = self.get_prd_data_list(typed_curve_list, *params)
+            if prd_data_list == None:
+                raise ValueError(f"The model is unable to run with the parameters - {params}!")
             prd_data_list_list.append(prd_data_list)
 
         # Iterate through data field combinations
@@ -514,3 +1301,63 @@ class Controller():
         """
         params_list = transpose(params_list)
         plot_boxplots(params_list, file_path, "Distribution of parameters", ALL_COLOURS, limits_dict, log, horizontal)
+
+def initialise_curve_worker(controller:Controller) -> None:
+    """
+    Stores the controller in the process for simulating curves
+
+    Parameters:
+    * `controller`: The controller
+    """
+    global CURVE_CONTROLLER
+    CURVE_CONTROLLER = controller
+    CURVE_CONTROLLER.set_cache_size(0)
+    CURVE_CONTROLLER.pop_stat_dict()
+
+def simulate_curve(curve_index:int, params:tuple, fidelity_dict:dict) -> dict:
+    """
+    Gets the predicted curve in the process for simulating curves
+
+    Parameters:
+    * `curve_index`:   The index of the curve to predict
+    * `params`:        The parameters for the prediction
+    * `fidelity_dict`: The settings of the fidelity of the simulation
+
+    Returns the predicted data, with the fields needed by all the curves sharing the
+    prediction, and the statistics of the simulation
+    """
+    CURVE_CONTROLLER.set_fidelity(fidelity_dict)
+    curve = CURVE_CONTROLLER.get_curve_list()[curve_index]
+    calibrated_model = CURVE_CONTROLLER.calibrate_model(curve, *params)
+    if calibrated_model == None:
+        return None, CURVE_CONTROLLER.pop_stat_dict()
+    prd_data = CURVE_CONTROLLER.run_driver(curve, calibrated_model, *params)
+    return prd_data, CURVE_CONTROLLER.pop_stat_dict()
+
+def freeze_prd_data(prd_data:dict) -> dict:
+    """
+    Makes the arrays of predicted data read-only, so that the data can be shared
+    without being copied
+
+    Parameters:
+    * `prd_data`: The predicted data; none if the simulation failed
+
+    Returns the predicted data
+    """
+    if prd_data == None:
+        return None
+    prd_data = {field: np.asarray(value) for field, value in prd_data.items()}
+    for value in prd_data.values():
+        value.flags.writeable = False
+    return prd_data
+
+def copy_prd_data(prd_data:dict) -> dict:
+    """
+    Copies the dictionary of predicted data, sharing the read-only arrays
+
+    Parameters:
+    * `prd_data`: The predicted data; none if the simulation failed
+
+    Returns the copied predicted data
+    """
+    return None if prd_data == None else dict(prd_data)
@@ -6,6 +6,7 @@
 """
 
 # Libraries
+import hashlib, pickle, numpy as np
 from moga_neml.errors.__error__ import create_error
 from moga_neml.models.__model__ import __Model__
 
@@ -29,8 +30,10 @@ class Curve:
         # Initialise internal variables
         self.custom_driver = None
         self.custom_driver_kwargs = None
+        self.driver_settings = {}
         self.error_list = []
-        self.prd_data = None # the latest predicted data, as a dictionary
+        self.prd_data = None # the latest predicted data, as a dictionary of arrays
+        self.hash = None
 
     def set_exp_data(self, exp_data:dict) -> None:
         """
@@ -40,6 +43,7 @@ class Curve:
         * `exp_data`: The experimental data
         """
         self.exp_data = exp_data
+        self.hash = None
     
     def get_exp_data(self) -> dict:
         """
@@ -77,6 +81,7 @@ class Curve:
         """
         self.custom_driver = custom_driver
         self.custom_driver_kwargs = custom_driver_kwargs
+        self.hash = None
 
     def get_custom_driver(self) -> tuple:
         """
@@ -84,6 +89,34 @@ class Curve:
         """
         return self.custom_driver, self.custom_driver_kwargs
     
+    def set_driver_settings(self, driver_settings:dict) -> None:
+        """
+        Sets the settings of the driver that differ from the defaults
+
+        Parameters:
+        * `driver_settings`: The dictionary of driver settings (e.g., `num_steps`)
+        """
+        self.driver_settings = driver_settings
+        self.hash = None
+
+    def get_driver_settings(self) -> dict:
+        """
+        Returns the settings of the driver that differ from the defaults
+        """
+        return self.driver_settings
+
+    def get_hash(self) -> str:
+        """
+        Returns a hash of the experimental data and the driver, which identifies the
+        simulation of the curve; the same data hashes the same whether it is stored as
+        lists, arrays, or memory mapped arrays
+        """
+        if self.hash == None:
+            exp_info = [(field, get_canonical_value(value)) for field, value in sorted(self.exp_data.items())]
+            curve_info = (exp_info, self.custom_driver, self.custom_driver_kwargs, sorted(self.driver_settings.items()))
+            self.hash = hashlib.md5(pickle.dumps(curve_info)).hexdigest()
+        return self.hash
+    
     def get_error_list(self) -> list:
         """
         Gets the list of errors
@@ -115,4 +148,21 @@ class Curve:
         # Add error
         error = create_error(error_name, x_label, y_label, weight, self.exp_data, self.model, **kwargs)
         self.error_list.append(error)
-    
\ No newline at end of file
+
+def get_canonical_value(value):
+    """
+    Converts a field of experimental data into a form that can be hashed consistently;
+    columns of numbers (e.g., lists or arrays) are converted into the bytes of their
+    float values
+
+    Parameters:
+    * `value`: The value of the field
+
+    Returns the converted value
+    """
+    if not isinstance(value, (list, tuple, np.ndarray)):
+        return value
+    try:
+        return np.asarray(value, dtype=float).tobytes()
+    except (TypeError, ValueError):
+        return value
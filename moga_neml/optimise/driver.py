@@ -6,9 +6,10 @@
 """
 
 # Libraries
+import numpy as np
 from neml import drivers
 from moga_neml.helper.experiment import NEML_FIELD_CONVERSION
-from moga_neml.helper.general import BlockPrint
+from moga_neml.helper.general import BlockPrint, run_isolated
 from moga_neml.helper.data import find_tensile_strain_to_failure, remove_data_after
 from moga_neml.optimise.curve import Curve
 
@@ -23,23 +24,113 @@ NUM_STEPS_UP = 50
 DAMAGE_TOL   = 0.95
 STRESS_RATE  = 0.0001
 CYCLIC_RATIO = -1
+LOGSPACE     = False
+
+# The parts of the fields of the predicted data that can be kept
+SCOPE_LIST = ["all", "last"]
+
+# How the fidelity settings are applied, so that they never make a driver finer than its curve's settings
+COARSEN_DICT = {
+    "num_steps": min,
+    "rel_tol":   max,
+    "abs_tol":   max,
+}
+
+# The fields of the experimental data that each driver reads
+INPUT_FIELD_DICT = {
+    "creep":   ["stress", "temperature"],
+    "tensile": ["strain_rate", "temperature"],
+    "cyclic":  ["max_strain", "num_cycles", "strain_rate", "temperature"],
+}
+
+def get_driver_settings() -> dict:
+    """
+    Returns the settings of the drivers, which affect the predictions
+    """
+    return {
+        "time_hold": TIME_HOLD, "num_steps": NUM_STEPS, "rel_tol": REL_TOL, "abs_tol": ABS_TOL,
+        "max_strain": MAX_STRAIN, "num_steps_up": NUM_STEPS_UP, "damage_tol": DAMAGE_TOL,
+        "stress_rate": STRESS_RATE, "cyclic_ratio": CYCLIC_RATIO, "logspace": LOGSPACE,
+    }
+
+def select_fields(prd_data:dict, field_dict:dict) -> dict:
+    """
+    Selects the needed fields of predicted data
+
+    Parameters:
+    * `prd_data`:   The predicted data
+    * `field_dict`: The fields to keep, mapped to "all" to keep all their values
+                    or "last" to keep only their last value (i.e., row)
+
+    Returns the predicted data with the selected fields
+    """
+    selected_data = {}
+    for field, scope in field_dict.items():
+        if field in prd_data.keys():
+            selected_data[field] = prd_data[field] if scope == "all" else np.array(prd_data[field][-1:])
+    return selected_data
+
+def merge_field_dicts(field_dict_list:list) -> dict:
+    """
+    Merges the fields needed by several errors or constraints; keeps all the values of a field
+    if any of them needs all the values
+
+    Parameters:
+    * `field_dict_list`: The list of dictionaries mapping fields to "all" or "last"
+
+    Returns the merged dictionary
+    """
+    merged_dict = {}
+    for field_dict in field_dict_list:
+        for field, scope in field_dict.items():
+            if not scope in SCOPE_LIST:
+                raise ValueError(f"The field scope '{scope}' is not supported; use one of {SCOPE_LIST}")
+            if merged_dict.get(field) != "all":
+                merged_dict[field] = scope
+    return merged_dict
 
 # Driver class
 class Driver:
     
-    def __init__(self, curve:Curve, calibrated_model) -> None:
+    def __init__(self, curve:Curve, calibrated_model, isolate:bool=False, timeout:float=None,
+                 fidelity_dict:dict={}, field_dict:dict=None) -> None:
         """
         Initialises the driver class
         
         Parameters:
         * `curve`:      The curve the driver is being used on
         * `model`:      The calibrated model to be run
+        * `isolate`:    Whether to run the driver in a separate process that can be killed
+        * `timeout`:    The number of seconds an isolated driver is allowed to run for
+        * `fidelity_dict`: The driver settings to coarsen from the defaults and the settings
+                           of the curve (e.g., fewer steps for a lower fidelity); settings
+                           that are already coarser for the curve are kept
+        * `field_dict`: The fields of the predicted data to keep, mapped to "all" to keep all
+                        their values or "last" to keep only their last value (i.e., row);
+                        keeps all the fields if undefined
         """
-        self.curve     = curve
-        self.exp_data  = curve.get_exp_data()
-        self.type      = self.exp_data["type"]
+        exp_data       = curve.get_exp_data()
+        self.type      = exp_data["type"]
+        self.exp_data  = {field: exp_data[field] for field in INPUT_FIELD_DICT.get(self.type, []) if field in exp_data}
+        self.custom_driver, self.custom_driver_kwargs = curve.get_custom_driver()
         self.conv_dict = NEML_FIELD_CONVERSION[self.type]
         self.calibrated_model = calibrated_model
+        self.isolate   = isolate
+        self.timeout   = timeout
+        self.failure   = None
+        self.field_dict = field_dict
+        self.settings  = get_driver_settings()
+        self.settings.update(curve.get_driver_settings())
+        for key, value in fidelity_dict.items():
+            if key in COARSEN_DICT:
+                self.settings[key] = COARSEN_DICT[key](self.settings[key], value)
+    
+    def get_failure(self) -> str:
+        """
+        Returns the cause of the failure of the last run (i.e., "timeout", "crash", or
+        "error"); none if the last run was successful
+        """
+        return self.failure
     
     def run(self) -> dict:
         """
@@ -47,25 +138,60 @@ class Driver:
         returns the results
         """
 
-        # Get the results
+        # Get the results; isolated drivers are pickled, so they only hold the inputs of the
+        # simulation, and they convert the results before sending them back
+        if self.isolate:
+            results, self.failure = run_isolated(self.run_converted, self.timeout)
+            return results
         try:
-            with BlockPrint():
-                results = self.run_selected()
+            results = self.run_blocked()
         except:
+            self.failure = "error"
             return
-        
-        # Convert results and return
+        return self.convert_results(results)
+
+    def run_converted(self) -> dict:
+        """
+        Runs the driver without printing to the console;
+        returns the converted results
+        """
+        return self.convert_results(self.run_blocked())
+
+    def convert_results(self, results:dict) -> dict:
+        """
+        Converts the results of the driver into the predicted data, only
+        keeping the fields that are needed
+
+        Parameters:
+        * `results`: The results of the driver
+
+        Returns the predicted data
+        """
+
+        # Convert results (as arrays)
         converted_results = {}
         for field in list(self.conv_dict.keys()):
             if field in results.keys():
-                converted_results[self.conv_dict[field]] = list(results[field])
+                converted_results[self.conv_dict[field]] = np.asarray(results[field])
         if self.type == "tensile":
             end_index = find_tensile_strain_to_failure(converted_results["stress"])
             if end_index != None:
                 end_strain = converted_results["strain"][end_index]
                 converted_results = remove_data_after(converted_results, end_strain, "strain")
+
+        # Keep only the needed fields and return
+        if self.field_dict != None:
+            converted_results = select_fields(converted_results, self.field_dict)
         return converted_results
     
+    def run_blocked(self) -> dict:
+        """
+        Runs the driver without printing to the console;
+        returns the results
+        """
+        with BlockPrint():
+            return self.run_selected()
+
     def run_selected(self) -> dict:
         """
         Runs the driver depending on the data type;
@@ -73,10 +199,9 @@ class Driver:
         """
 
         # Runs custom driver if it is defined
-        custom_driver, custom_driver_kwargs = self.curve.get_custom_driver()
-        if custom_driver != None:
-            custom_driver = getattr(drivers, custom_driver)
-            results = custom_driver(self.calibrated_model, **custom_driver_kwargs)
+        if self.custom_driver != None:
+            custom_driver = getattr(drivers, self.custom_driver)
+            results = custom_driver(self.calibrated_model, **self.custom_driver_kwargs)
             return results
 
         # Runs driver based on data type
@@ -93,9 +218,10 @@ class Driver:
         Runs the creep driver;
         returns the results
         """
-        results = drivers.creep(self.calibrated_model, self.exp_data["stress"], STRESS_RATE, TIME_HOLD,
-                                T=self.exp_data["temperature"], verbose=VERBOSE, check_dmg=True,
-                                dtol=DAMAGE_TOL, nsteps_up=NUM_STEPS_UP, nsteps=NUM_STEPS, logspace=False)
+        results = drivers.creep(self.calibrated_model, self.exp_data["stress"], self.settings["stress_rate"],
+                                self.settings["time_hold"], T=self.exp_data["temperature"], verbose=VERBOSE,
+                                check_dmg=True, dtol=self.settings["damage_tol"], nsteps_up=self.settings["num_steps_up"],
+                                nsteps=self.settings["num_steps"], logspace=self.settings["logspace"])
         return results
 
     def run_tensile(self) -> dict:
@@ -104,8 +230,9 @@ class Driver:
         returns the results
         """
         results = drivers.uniaxial_test(self.calibrated_model, erate=self.exp_data["strain_rate"], T=self.exp_data["temperature"],
-                                        emax=MAX_STRAIN, check_dmg=True, dtol=DAMAGE_TOL, nsteps=NUM_STEPS,
-                                        verbose=VERBOSE, rtol=REL_TOL, atol=ABS_TOL)
+                                        emax=self.settings["max_strain"], check_dmg=True, dtol=self.settings["damage_tol"],
+                                        nsteps=self.settings["num_steps"], verbose=VERBOSE, rtol=self.settings["rel_tol"],
+                                        atol=self.settings["abs_tol"])
         return results
     
     def run_cyclic(self) -> dict:
@@ -115,6 +242,6 @@ class Driver:
         """
         num_cycles = int(self.exp_data["num_cycles"])
         results = drivers.strain_cyclic(self.calibrated_model, T=self.exp_data["temperature"], emax=self.exp_data["max_strain"],
-                                        erate=self.exp_data["strain_rate"], verbose=VERBOSE, R=CYCLIC_RATIO,
-                                        ncycles=num_cycles, nsteps=NUM_STEPS)
+                                        erate=self.exp_data["strain_rate"], verbose=VERBOSE, R=self.settings["cyclic_ratio"],
+                                        ncycles=num_cycles, nsteps=self.settings["num_steps"])
         return results
@@ -0,0 +1,150 @@
+"""
+ Title:         Island Model
+ Description:   For running several populations that exchange their best solutions
+ Author:        Janzen Choi
+
+"""
+
+# Libraries
+import numpy as np
+import warnings
+from pymoo.core.duplicate import DefaultDuplicateElimination
+from pymoo.core.evaluator import Evaluator
+from pymoo.core.population import Population
+from moga_neml.optimise.problem import Problem
+from moga_neml.optimise.moga import MOGA
+from moga_neml.optimise.surrogate import Surrogate
+
+# Constants
+TOPOLOGY_LIST = ["ring", "all", "random"]
+
+# The Island MOGA class
+class IslandMOGA(MOGA):
+
+    def __init__(self, problem:Problem, num_gens:int, init_pop:int, offspring:int, crossover:float,
+                 mutation:float, num_islands:int, interval:int=10, num_migrants:int=5,
+                 topology:str="ring", surrogate:Surrogate=None, seed:int=None):
+        """
+        Class for the multi-objective genetic algorithm with several populations (i.e., islands);
+        the offspring of all the islands are evaluated together, so they are spread over the
+        worker processes, and the islands periodically send their best non-dominated solutions
+        to other islands
+
+        Parameters:
+        * `problem`:      The problem to optimise
+        * `num_gens`:     The number of generations to run the optimiser
+        * `init_pop`:     The size of the initial population of each island
+        * `offspring`:    The size of the offspring of each island
+        * `crossover`:    The crossover probability
+        * `mutation`:     The mutation probability
+        * `num_islands`:  The number of islands
+        * `interval`:     The number of generations between migrations
+        * `num_migrants`: The maximum number of solutions each island sends per migration
+        * `topology`:     The islands that each island sends its solutions to; "ring" sends them to
+                          the next island, "all" to all the other islands, and "random" to a random island
+        * `surrogate`:    The surrogate to pre-screen the offspring with; evaluates all the
+                          offspring if undefined
+        * `seed`:         The seed of the random number generators, with each island using its
+                          own generator (i.e., seeded with `seed` plus its index); the optimisation
+                          is not reproducible if undefined
+        """
+
+        # Check inputs
+        if num_islands < 2:
+            raise ValueError("The island model requires at least two islands!")
+        if not topology in TOPOLOGY_LIST:
+            raise ValueError(f"The topology '{topology}' is not supported; use one of {TOPOLOGY_LIST}")
+        if num_migrants < 1 or num_migrants > init_pop:
+            raise ValueError("The number of migrants must be between 1 and the population size!")
+
+        # Initialise
+        super().__init__(problem, num_gens, init_pop, offspring, crossover, mutation, surrogate=surrogate, seed=seed)
+        self.num_islands  = num_islands
+        self.interval     = interval
+        self.num_migrants = num_migrants
+        self.topology     = topology
+
+        # Define an algorithm for each island, each with its own random number generator and initial population
+        init_param_dict = self.controller.get_init_param_dict()
+        self.random_state_list = [np.random.default_rng(None if seed == None else seed + i) for i in range(num_islands)]
+        self.algo_list = [self.algo] + [self.get_algorithm(self.get_population(init_param_dict, self.random_state_list[i]))
+                                        for i in range(1, num_islands)]
+
+    def optimise(self) -> None:
+        """
+        Runs the genetic optimisation of the islands
+        """
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+
+            # Initialise the algorithms, each breeding with its island's random number generator
+            for i in range(self.num_islands):
+                self.algo_list[i].setup(self.problem, termination=("n_gen", self.num_gens))
+                self.algo_list[i].random_state = self.random_state_list[i]
+
+            # Evaluate the offspring of all the islands together, and migrate periodically
+            for num_gens in range(1, self.num_gens + 1):
+                infills_list = [algo.ask() for algo in self.algo_list]
+                evaluate_list = [infills for infills in infills_list if isinstance(infills, Population) and len(infills) > 0]
+                if len(evaluate_list) > 0:
+                    Evaluator().eval(self.problem, Population.merge(Population(), *evaluate_list))
+                for algo, infills in zip(self.algo_list, infills_list):
+                    algo.tell(infills=infills)
+                if num_gens % self.interval == 0 and num_gens < self.num_gens:
+                    self.migrate()
+
+    def get_emigrants(self, island:int) -> Population:
+        """
+        Gets the best non-dominated solutions of an island, preferring the least crowded
+
+        Parameters:
+        * `island`: The index of the island
+
+        Returns the copied solutions
+        """
+        population = self.algo_list[island].pop
+        front = population[population.get("rank") == 0]
+        if len(front) > self.num_migrants:
+            front = front[np.argsort(-front.get("crowding"))[:self.num_migrants]]
+        emigrants = Population.new(X=front.get("X"), F=front.get("F"))
+        for individual in emigrants:
+            individual.evaluated = {"F", "G", "H"}
+        return emigrants
+
+    def get_destinations(self, island:int) -> list:
+        """
+        Gets the islands that an island sends its solutions to
+
+        Parameters:
+        * `island`: The index of the island
+
+        Returns the list of indexes of the islands
+        """
+        other_list = [i for i in range(self.num_islands) if i != island]
+        if self.topology == "ring":
+            return [(island + 1) % self.num_islands]
+        elif self.topology == "all":
+            return other_list
+        return [other_list[self.random_state_list[island].integers(len(other_list))]]
+
+    def migrate(self) -> None:
+        """
+        Sends the best solutions of each island to other islands; the solutions that
+        an island receives compete with its population for survival
+        """
+
+        # Gather the solutions to send before changing any island
+        immigrants_list = [Population() for _ in range(self.num_islands)]
+        for island in range(self.num_islands):
+            emigrants = self.get_emigrants(island)
+            for destination in self.get_destinations(island):
+                immigrants_list[destination] = Population.merge(immigrants_list[destination], emigrants)
+
+        # Add the received solutions to each island
+        for algo, immigrants in zip(self.algo_list, immigrants_list):
+            immigrants = DefaultDuplicateElimination().do(immigrants, algo.pop)
+            if len(immigrants) == 0:
+                continue
+            self.controller.add_stat("Migrated solutions", len(immigrants))
+            population = Population.merge(algo.pop, immigrants)
+            algo.pop = algo.survival.do(self.problem, population, n_survive=self.init_pop, algorithm=algo)
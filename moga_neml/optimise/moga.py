@@ -6,29 +6,40 @@
 """
 
 # Libraries
+import os, pickle
 import numpy as np
 import warnings
 from pymoo.algorithms.moo.nsga2 import NSGA2
+from pymoo.core.population import Population
 from pymoo.operators.crossover.sbx import SBX
 from pymoo.operators.mutation.pm import PolynomialMutation
-from pymoo.optimize import minimize
 from moga_neml.optimise.problem import Problem
+from moga_neml.optimise.surrogate import Surrogate, ScreenedNSGA2
 
 # The Multi-Curve Genetic Algorithm (MOGA) class
 class MOGA:
     
     def __init__(self, problem:Problem, num_gens:int, init_pop:int, offspring:int,
-                 crossover:float, mutation:float):
+                 crossover:float, mutation:float, asynchronous:bool=False, checkpoint:dict=None,
+                 surrogate:Surrogate=None, seed:int=None):
         """
         Class for the multi-objective genetic algorithm
 
         Parameters:
-        * `problem`:   The problem to optimise
-        * `num_gens`:  The number of generations to run the optimiser
-        * `init_pop`:  The size of the initial population
-        * `offspring`: The size of the offspring
-        * `crossover`: The crossover probability
-        * `mutation`:  The mutation probability
+        * `problem`:      The problem to optimise
+        * `num_gens`:     The number of generations to run the optimiser
+        * `init_pop`:     The size of the initial population
+        * `offspring`:    The size of the offspring
+        * `crossover`:    The crossover probability
+        * `mutation`:     The mutation probability
+        * `asynchronous`: Whether to breed and evaluate the offspring one at a time, as
+                          the workers become free, instead of one generation at a time
+        * `checkpoint`:   The checkpoint to resume the optimisation from; starts a new
+                          optimisation if undefined
+        * `surrogate`:    The surrogate to pre-screen the offspring with; evaluates all the
+                          offspring if undefined
+        * `seed`:         The seed of the random number generators; the optimisation is not
+                          reproducible if undefined
         """
 
         # Initialise
@@ -40,27 +51,54 @@ class MOGA:
         self.offspring  = offspring
         self.crossover  = crossover
         self.mutation   = mutation
+        self.asynchronous = asynchronous
+        self.checkpoint   = checkpoint
+        self.recorder     = problem.get_recorder()
+        self.surrogate    = surrogate
+        self.seed         = seed
+        
+        # Initialise the progress, which is ahead of pymoo's when resuming from a checkpoint
+        self.gen_offset          = 0
+        self.num_evals_completed = 0
 
-        # Gets initialised parameters
-        init_param_dict = self.controller.get_init_param_dict()
-        population = self.get_population(init_param_dict)
-
-        # Define algorithm
-        self.algo = NSGA2(
-            pop_size     = init_pop,
-            n_offsprings = offspring,
-            sampling     = population,
-            crossover    = SBX(prob=crossover, prob_var=1.0), # simulated binary crossover 
-            mutation     = PolynomialMutation(prob=mutation), # polynomial mutation
-            eliminate_duplicates = True
-        )
+        # Gets initialised parameters, or the evaluated population of the checkpoint
+        if seed != None:
+            np.random.seed(seed)
+        if checkpoint == None:
+            init_param_dict = self.controller.get_init_param_dict()
+            population = self.get_population(init_param_dict)
+        else:
+            population = self.restore_checkpoint(checkpoint)
+        self.init_population = population
+        self.algo = self.get_algorithm(population)
+
+    def get_algorithm(self, population) -> NSGA2:
+        """
+        Defines the algorithm
+
+        Parameters:
+        * `population`: The initial population
 
-    def get_population(self, init_param_dict:dict) -> tuple:
+        Returns the algorithm
+        """
+        algo_kwargs = {
+            "pop_size":     self.init_pop,
+            "n_offsprings": self.offspring,
+            "sampling":     population,
+            "crossover":    SBX(prob=self.crossover, prob_var=1.0), # simulated binary crossover 
+            "mutation":     PolynomialMutation(prob=self.mutation), # polynomial mutation
+            "eliminate_duplicates": True,
+        }
+        return NSGA2(**algo_kwargs) if self.surrogate == None else ScreenedNSGA2(self.surrogate, **algo_kwargs)
+
+    def get_population(self, init_param_dict:dict, random_state:np.random.Generator=None) -> tuple:
         """
         Given a set of parameters, returns a population with some deviation
 
         Parameters:
         * `init_param_dict`: The dictionary of initial parameter values
+        * `random_state`:    The random number generator to sample with; uses numpy's
+                             global random number generator if undefined
 
         Returns a population with the initial parameter values applied
         """
@@ -86,7 +124,8 @@ class MOGA:
                 stdev_list.append(bound_range/4) # std ~= range / 4
 
         # Create the population
-        param_population = np.random.normal(
+        random_state = np.random if random_state == None else random_state
+        param_population = random_state.normal(
             loc   = np.array(mean_list),
             scale = np.array(stdev_list),
             size  = (self.init_pop, len(self.param_dict.keys())),
@@ -103,10 +142,181 @@ class MOGA:
         # Return the population
         return param_population
 
+    def restore_checkpoint(self, checkpoint:dict) -> Population:
+        """
+        Restores the progress of the optimisation from a checkpoint
+
+        Parameters:
+        * `checkpoint`: The checkpoint
+
+        Returns the evaluated population of the checkpoint
+        """
+
+        # Check that the checkpoint is from the same optimisation
+        if checkpoint["param_names"] != list(self.param_dict.keys()):
+            raise ValueError("The parameters of the checkpoint do not match the parameters of the optimisation!")
+        if checkpoint["init_pop"] != self.init_pop or checkpoint["offspring"] != self.offspring:
+            raise ValueError("The population and offspring of the checkpoint do not match the optimisation!")
+
+        # Restore the progress
+        self.gen_offset          = checkpoint["num_gens"] - 1
+        self.num_evals_completed = checkpoint["num_evals"]
+        self.recorder.set_state(checkpoint["recorder"])
+        self.controller.merge_stat_dict(checkpoint["stat_dict"])
+        self.controller.merge_failure_list(checkpoint["failure_list"])
+
+        # Create the population, marked as evaluated so that it is not evaluated again
+        population = Population.new(X=checkpoint["X"], F=checkpoint["F"])
+        for individual in population:
+            individual.evaluated = {"F", "G", "H"}
+            self.problem.add_history(individual.X, individual.F)
+        return population
+
+    def restore_random_states(self) -> None:
+        """
+        Restores the states of the random number generators from the checkpoint, if resuming;
+        must be called after the algorithm is set up, since setting up the algorithm seeds them
+        """
+        if self.checkpoint == None:
+            return
+        np.random.set_state(self.checkpoint["np_random_state"])
+        self.algo.random_state.bit_generator.state = self.checkpoint["algo_random_state"]
+
+    def save_checkpoint(self, num_gens:int, num_evals:int, population:Population) -> None:
+        """
+        Saves the progress of the optimisation to a checkpoint file in the results directory,
+        replacing the previous checkpoint
+
+        Parameters:
+        * `num_gens`:   The number of completed generations
+        * `num_evals`:  The number of completed evaluations
+        * `population`: The current population
+        """
+        checkpoint = {
+            "param_names":       list(self.param_dict.keys()),
+            "init_pop":          self.init_pop,
+            "offspring":         self.offspring,
+            "num_gens":          num_gens,
+            "num_evals":         num_evals,
+            "X":                 population.get("X"),
+            "F":                 population.get("F"),
+            "np_random_state":   np.random.get_state(),
+            "algo_random_state": self.algo.random_state.bit_generator.state,
+            "recorder":          self.recorder.get_state(),
+            "stat_dict":         dict(self.controller.get_stat_dict()),
+            "failure_list":      list(self.controller.get_failure_list()),
+        }
+        checkpoint_path = f"{self.recorder.get_results_dir()}/checkpoint.pkl"
+        with open(f"{checkpoint_path}.tmp", "wb") as file:
+            pickle.dump(checkpoint, file)
+        os.replace(f"{checkpoint_path}.tmp", checkpoint_path)
+
+    def record_generation(self, algorithm:NSGA2) -> None:
+        """
+        Saves a checkpoint after every recorded generation; called by pymoo after each generation
+
+        Parameters:
+        * `algorithm`: The algorithm
+        """
+        num_gens = algorithm.n_gen + self.gen_offset
+        if num_gens % self.recorder.get_interval() == 0 or num_gens == self.num_gens:
+            num_evals = self.init_pop + (num_gens - 1) * self.offspring
+            self.save_checkpoint(num_gens, num_evals, algorithm.pop)
+
     def optimise(self) -> None:
         """
         Runs the genetic optimisation
         """
         with warnings.catch_warnings():
             warnings.simplefilter("ignore")
-            minimize(self.problem, self.algo, ("n_gen", self.num_gens), verbose=False, seed=None)
+            if self.asynchronous:
+                self.optimise_asynchronously()
+            else:
+                num_gens = max(self.num_gens - self.gen_offset, 1)
+                self.algo.setup(self.problem, termination=("n_gen", num_gens), seed=self.seed,
+                                callback=self.record_generation, verbose=False)
+                self.restore_random_states()
+                self.algo.run()
+
+    def optimise_asynchronously(self) -> None:
+        """
+        Runs the genetic optimisation as a steady-state algorithm; whenever a worker becomes
+        free, an offspring is bred from the current population and submitted, and the results
+        are merged into the population as they arrive; the number of evaluations is the same
+        as the generational optimisation (i.e., `init_pop + (num_gens - 1) * offspring`); when
+        resuming from a checkpoint, the offspring that were being evaluated when the checkpoint
+        was saved are dropped, and new offspring are bred in their place
+        """
+
+        # Initialise, continuing from the checkpoint if defined
+        self.algo.setup(self.problem, termination=("n_gen", self.num_gens), seed=self.seed)
+        self.restore_random_states()
+        num_evals     = self.init_pop + (self.num_gens - 1) * self.offspring
+        num_submitted = self.num_evals_completed
+        num_completed = self.num_evals_completed
+        population    = Population()
+        if self.checkpoint != None:
+            population = self.algo.survival.do(self.problem, self.init_population, n_survive=len(self.init_population),
+                                               algorithm=self.algo)
+        
+        # Evaluate until the number of evaluations is reached
+        while num_completed < num_evals:
+            
+            # Keep the workers busy, with the initial population first
+            while num_submitted < num_evals and self.problem.get_num_pending() < self.problem.get_num_workers():
+                if num_submitted < self.init_pop:
+                    params = self.init_population[num_submitted]
+                elif len(population) > 0:
+                    params = self.get_offspring(population)
+                else:
+                    break
+                self.problem.submit(params)
+                num_submitted += 1
+
+            # Merge the next result into the population
+            params, objective_values = self.problem.collect()
+            num_completed += 1
+            individual = Population.new(X=np.array([params]), F=np.array([objective_values], dtype=float))
+            population = Population.merge(population, individual)
+            population = self.algo.survival.do(self.problem, population, n_survive=min(len(population), self.init_pop),
+                                               algorithm=self.algo)
+
+            # Save a checkpoint after every recorded generation's worth of evaluations
+            if num_completed >= self.init_pop and (num_completed - self.init_pop) % self.offspring == 0:
+                num_gens = (num_completed - self.init_pop) // self.offspring + 1
+                if num_gens % self.recorder.get_interval() == 0 or num_gens == self.num_gens:
+                    self.save_checkpoint(num_gens, num_completed, population)
+
+    def get_offspring(self, population:Population) -> np.ndarray:
+        """
+        Breeds an offspring from a population via tournament selection, crossover, and mutation
+
+        Parameters:
+        * `population`: The population to breed from
+
+        Returns the parameters of the offspring
+        """
+        if self.surrogate == None:
+            offspring = self.algo.mating.do(self.problem, population, 1, algorithm=self.algo,
+                                            random_state=self.algo.random_state)
+            if len(offspring) > 0:
+                return offspring.get("X")[0]
+        else:
+            offspring = self.algo.mating.do(self.problem, population, self.surrogate.get_factor(), algorithm=self.algo,
+                                            random_state=self.algo.random_state)
+            if len(offspring) > 0:
+                index = self.surrogate.screen(offspring.get("X"), population.get("F"), 1)[0]
+                return offspring.get("X")[index]
+        return self.algo.random_state.uniform(self.problem.xl, self.problem.xu)
+
+def load_checkpoint(checkpoint_path:str) -> dict:
+    """
+    Loads a checkpoint saved by an optimisation
+
+    Parameters:
+    * `checkpoint_path`: The path to the checkpoint file
+
+    Returns the checkpoint
+    """
+    with open(checkpoint_path, "rb") as file:
+        return pickle.load(file)
@@ -0,0 +1,184 @@
+"""
+ Title:         Pool
+ Description:   For evaluating sets of parameters over a pool of worker processes
+ Author:        Janzen Choi
+
+"""
+
+# Libraries
+import multiprocessing, os, queue, time, warnings
+from moga_neml.optimise.controller import Controller
+
+# The controller held by each worker process
+WORKER_CONTROLLER = None
+
+# The Pool class
+class Pool:
+
+    def __init__(self, controller:Controller, num_workers:int):
+        """
+        Class for evaluating sets of parameters in parallel; each worker process holds its
+        own copy of the controller (i.e., model, curves, errors, and constraints), which is
+        initialised once, so only the parameters and objectives are passed between the processes
+
+        Parameters:
+        * `controller`:  The controller to copy into each worker process
+        * `num_workers`: The number of worker processes
+        """
+
+        # Start the worker processes and wait until they are all ready
+        start_time = time.time()
+        self.controller  = controller
+        self.num_workers = num_workers
+        context = multiprocessing.get_context("fork")
+        self.pool = context.Pool(num_workers, initializer=initialise_worker, initargs=(controller,))
+        self.pool.map(get_worker_id, range(num_workers), chunksize=1)
+        self.startup_time = time.time() - start_time
+
+        # Initialise the timing of the tasks
+        self.num_tasks     = 0
+        self.compute_time  = 0
+        self.overhead_time = 0
+        
+        # Initialise the tasks submitted asynchronously
+        self.result_queue     = queue.Queue()
+        self.submit_time_dict = {}
+
+    def get_num_workers(self) -> int:
+        """
+        Returns the number of worker processes
+        """
+        return self.num_workers
+
+    def get_startup_time(self) -> float:
+        """
+        Returns the time taken to start the worker processes, in seconds
+        """
+        return self.startup_time
+
+    def evaluate(self, params_list:list, abort_bound:tuple=None) -> list:
+        """
+        Calculates the objectives for a list of parameter sets
+
+        Parameters:
+        * `params_list`: The list of parameter sets
+        * `abort_bound`: The archived solutions and threshold for aborting evaluations early
+
+        Returns the list of objective dictionaries, in the same order as the parameter sets
+        """
+
+        # Send the parameters to the workers and timestamp the results as they arrive
+        start_time = time.time()
+        task_list = [(i, tuple(params_list[i]), abort_bound) for i in range(len(params_list))]
+        objective_dict_list = [None] * len(task_list)
+        timing_dict = {}
+        for index, objective_dict, stat_dict, prd_data_dict, worker_id, task_start, task_end in self.pool.imap_unordered(evaluate_task, task_list):
+            objective_dict_list[index] = objective_dict
+            self.controller.merge_stat_dict(stat_dict)
+            self.controller.hold_prd_data(prd_data_dict)
+            timing_dict[worker_id] = timing_dict.get(worker_id, []) + [(task_start, task_end, time.time())]
+
+        # Time spent by each worker waiting for a task and returning its results
+        for timing_list in timing_dict.values():
+            previous_end = start_time
+            for task_start, task_end, task_received in sorted(timing_list):
+                self.compute_time  += task_end - task_start
+                self.overhead_time += (task_start - previous_end) + (task_received - task_end)
+                previous_end = task_end
+        self.num_tasks += len(task_list)
+        return objective_dict_list
+
+    def submit(self, params:tuple, abort_bound:tuple=None) -> int:
+        """
+        Submits a set of parameters to be evaluated asynchronously
+
+        Parameters:
+        * `params`:      The parameter values
+        * `abort_bound`: The archived solutions and threshold for aborting evaluations early
+
+        Returns the ID of the task
+        """
+        task_id = self.num_tasks
+        self.num_tasks += 1
+        self.submit_time_dict[task_id] = time.time()
+        self.pool.apply_async(evaluate_task, ((task_id, tuple(params), abort_bound),),
+                              callback=lambda result: self.result_queue.put((result, time.time())),
+                              error_callback=lambda error: self.result_queue.put((error, time.time())))
+        return task_id
+
+    def collect(self) -> tuple:
+        """
+        Waits for the next asynchronously submitted set of parameters to be evaluated
+
+        Returns the ID of the task and the dictionary of objectives
+        """
+        result, task_received = self.result_queue.get()
+        if isinstance(result, Exception):
+            raise result
+        task_id, objective_dict, stat_dict, prd_data_dict, _, task_start, task_end = result
+        self.controller.merge_stat_dict(stat_dict)
+        self.controller.hold_prd_data(prd_data_dict)
+        task_submitted = self.submit_time_dict.pop(task_id)
+        self.compute_time  += task_end - task_start
+        self.overhead_time += (task_start - task_submitted) + (task_received - task_end)
+        return task_id, objective_dict
+
+    def get_summary(self) -> list:
+        """
+        Returns a summary of the worker processes and the time spent on the tasks
+        """
+        num_tasks = max(self.num_tasks, 1)
+        return [
+            f"Workers ({self.num_workers})",
+            "Start-up ({:0.4}s)".format(float(self.startup_time)),
+            f"Tasks ({self.num_tasks})",
+            "Compute per task ({:0.4}s)".format(float(self.compute_time / num_tasks)),
+            "Overhead per task ({:0.4}s)".format(float(self.overhead_time / num_tasks)),
+        ]
+
+    def close(self) -> None:
+        """
+        Shuts down the worker processes
+        """
+        self.pool.close()
+        self.pool.join()
+
+def initialise_worker(controller:Controller) -> None:
+    """
+    Stores the controller in the worker process
+
+    Parameters:
+    * `controller`: The controller
+    """
+    global WORKER_CONTROLLER
+    WORKER_CONTROLLER = controller
+    WORKER_CONTROLLER.pop_stat_dict()
+
+def get_worker_id(*_) -> int:
+    """
+    Returns the ID of the worker process; used to wait for the worker processes to start
+    """
+    return os.getpid()
+
+def evaluate_task(task:tuple) -> tuple:
+    """
+    Calculates the objectives of a set of parameters in the worker process
+
+    Parameters:
+    * `task`: The index of the task, the parameter values, and the archived solutions
+              and threshold for aborting the evaluation early
+
+    Returns the index of the task, the dictionary of objectives, the statistics of the
+    simulations, the predictions, the ID of the worker process, and the times at which
+    the calculation started and ended
+    """
+    index, params, abort_bound = task
+    if abort_bound != None:
+        WORKER_CONTROLLER.set_abort_bound(*abort_bound)
+    start_time = time.time()
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        objective_dict = WORKER_CONTROLLER.calculate_objectives(*params)
+    stat_dict = WORKER_CONTROLLER.pop_stat_dict()
+    prd_data_dict = WORKER_CONTROLLER.get_prd_data_dict(*params)
+    return index, objective_dict, stat_dict, prd_data_dict, get_worker_id(), start_time, time.time()
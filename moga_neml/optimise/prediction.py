@@ -0,0 +1,271 @@
+"""
+ Title:         Prediction
+ Description:   For storing a predicted curve and the features derived from it
+ Author:        Janzen Choi
+
+"""
+
+# Libraries
+import numpy as np
+from moga_neml.helper.data import get_thin_indexes, get_yield
+from moga_neml.helper.derivative import find_stationary_points
+from moga_neml.helper.interpolator import Interpolator
+
+# The Prediction class
+class Prediction(dict):
+
+    def __init__(self, prd_data:dict):
+        """
+        Class for the predicted data of a curve, which behaves like the dictionary of
+        predicted data; the features derived from the data (e.g., end points, derivatives)
+        are only derived when first requested, and are then shared by all the errors and
+        constraints evaluating the prediction
+
+        Parameters:
+        * `prd_data`: The predicted data
+        """
+        super().__init__(prd_data)
+        self.feature_dict = {}
+
+    def __missing__(self, field:str) -> None:
+        """
+        Raises a key error naming a field that is not in the predicted data; the
+        predicted data only keeps the fields that are plotted or declared by the
+        errors and constraints
+
+        Parameters:
+        * `field`: The field of the predicted data
+        """
+        raise KeyError(f"The field '{field}' is not in the predicted data (which has {list(self.keys())}); "
+                       "errors and constraints that read fields other than their x and y labels must "
+                       "declare them with their `get_field_dict` function")
+
+    def __setitem__(self, field:str, value) -> None:
+        """
+        Changes a field of the predicted data, discarding the derived features
+
+        Parameters:
+        * `field`: The field of the predicted data
+        * `value`: The new values of the field
+        """
+        super().__setitem__(field, value)
+        self.feature_dict = {}
+
+    def __delitem__(self, field:str) -> None:
+        """
+        Removes a field of the predicted data, discarding the derived features
+
+        Parameters:
+        * `field`: The field of the predicted data
+        """
+        super().__delitem__(field)
+        self.feature_dict = {}
+
+    def __ior__(self, other):
+        """
+        Changes the fields of the predicted data in place (i.e., `|=`), discarding the
+        derived features
+
+        Parameters:
+        * `other`: The fields to change and their new values
+
+        Returns the changed predicted data
+        """
+        self.update(other)
+        return self
+
+    def update(self, *args, **kwargs) -> None:
+        """
+        Changes several fields of the predicted data, discarding the derived features
+
+        Parameters:
+        * `args`:   A dictionary (or iterable of pairs) of fields and their new values
+        * `kwargs`: Fields and their new values
+        """
+        super().update(*args, **kwargs)
+        self.feature_dict = {}
+
+    def pop(self, field:str, *default):
+        """
+        Removes a field of the predicted data, discarding the derived features
+
+        Parameters:
+        * `field`:   The field of the predicted data
+        * `default`: The value to return if the field is not defined
+
+        Returns the values of the removed field
+        """
+        value = super().pop(field, *default)
+        self.feature_dict = {}
+        return value
+
+    def popitem(self) -> tuple:
+        """
+        Removes the last field of the predicted data, discarding the derived features
+
+        Returns the removed field and its values
+        """
+        item = super().popitem()
+        self.feature_dict = {}
+        return item
+
+    def setdefault(self, field:str, default=None):
+        """
+        Adds a field to the predicted data if it is not defined, discarding the
+        derived features
+
+        Parameters:
+        * `field`:   The field of the predicted data
+        * `default`: The values of the field if it is not defined
+
+        Returns the values of the field
+        """
+        if not field in self:
+            self[field] = default
+        return self[field]
+
+    def clear(self) -> None:
+        """
+        Removes all the fields of the predicted data, discarding the derived features
+        """
+        super().clear()
+        self.feature_dict = {}
+
+    def get_feature(self, name:str, function, *args):
+        """
+        Gets a feature of the predicted data, deriving it if it has not been requested yet
+
+        Parameters:
+        * `name`:     The name of the feature
+        * `function`: The function to derive the feature with
+        * `args`:     The arguments of the function, which also identify the feature
+
+        Returns the feature
+        """
+        key = (name, *args)
+        if not key in self.feature_dict:
+            self.feature_dict[key] = function(*args)
+        return self.feature_dict[key]
+
+    def get_array(self, label:str) -> np.ndarray:
+        """
+        Gets the values of a field as an array
+
+        Parameters:
+        * `label`: The label of the field
+
+        Returns the array of values
+        """
+        return self.get_feature("array", lambda label: np.asarray(self[label]), label)
+
+    def get_thinned(self, label:str, num_points:int) -> np.ndarray:
+        """
+        Gets the values of a field, thinned to a number of points
+
+        Parameters:
+        * `label`:      The label of the field
+        * `num_points`: The number of points to thin to
+
+        Returns the array of thinned values
+        """
+        def thin(label:str, num_points:int) -> np.ndarray:
+            value_list = self.get_array(label)
+            return value_list[get_thin_indexes(len(value_list), num_points)]
+        return self.get_feature("thinned", thin, label, num_points)
+
+    def get_end(self, label:str) -> float:
+        """
+        Gets the last value of a field
+
+        Parameters:
+        * `label`: The label of the field
+
+        Returns the last value
+        """
+        return self.get_feature("end", lambda label: self[label][-1], label)
+
+    def get_max(self, label:str) -> float:
+        """
+        Gets the maximum value of a field
+
+        Parameters:
+        * `label`: The label of the field
+
+        Returns the maximum value
+        """
+        return self.get_feature("max", lambda label: np.max(self.get_array(label)), label)
+
+    def get_arg_max(self, x_label:str, y_label:str) -> float:
+        """
+        Gets the x value at the (first) maximum y value
+
+        Parameters:
+        * `x_label`: The label of the x values
+        * `y_label`: The label of the y values
+
+        Returns the x value
+        """
+        arg_max = lambda x_label, y_label: self[x_label][np.argmax(self.get_array(y_label))]
+        return self.get_feature("arg_max", arg_max, x_label, y_label)
+
+    def get_interpolator(self, x_label:str, y_label:str, resolution:int=50, mode:str="spline") -> Interpolator:
+        """
+        Gets an interpolator of the predicted data
+
+        Parameters:
+        * `x_label`:    The label of the x values
+        * `y_label`:    The label of the y values
+        * `resolution`: The resolution of the interpolation
+        * `mode`:       The interpolation mode
+
+        Returns the interpolator
+        """
+        def interpolate(x_label:str, y_label:str, resolution:int, mode:str) -> Interpolator:
+            return Interpolator(self.get_array(x_label), self.get_array(y_label), resolution, mode=mode)
+        return self.get_feature("interpolator", interpolate, x_label, y_label, resolution, mode)
+
+    def get_derivative(self, x_label:str, y_label:str) -> Interpolator:
+        """
+        Gets the derivative of the spline of the predicted data
+
+        Parameters:
+        * `x_label`: The label of the x values
+        * `y_label`: The label of the y values
+
+        Returns the interpolator of the derivative
+        """
+        def differentiate(x_label:str, y_label:str) -> Interpolator:
+            interpolator = Interpolator(self.get_array(x_label), self.get_array(y_label))
+            interpolator.differentiate()
+            return interpolator
+        return self.get_feature("derivative", differentiate, x_label, y_label)
+
+    def get_stationary_points(self, x_label:str, y_label:str, window:float, acceptance:float) -> list:
+        """
+        Gets the stationary points of the predicted data
+
+        Parameters:
+        * `x_label`:    The label of the x values
+        * `y_label`:    The label of the y values
+        * `window`:     The window size to determine the stationary point
+        * `acceptance`: The acceptance rate (0..1)
+
+        Returns a list of dictionaries of stationary points
+        """
+        def find(x_label:str, y_label:str, window:float, acceptance:float) -> list:
+            dy_list = self.get_derivative(x_label, y_label).evaluate(self.get_array(x_label))
+            return find_stationary_points(self, dy_list, x_label, y_label, window, acceptance)
+        return self.get_feature("stationary_points", find, x_label, y_label, window, acceptance)
+
+    def get_yield(self, offset:float=0.002) -> tuple:
+        """
+        Gets the yield point of tensile predicted data; raises a value error
+        if the yield point cannot be found
+
+        Parameters:
+        * `offset`: The strain offset to calculate the yield stress
+
+        Returns the yield strain and stress
+        """
+        yield_point = lambda offset: get_yield(self.get_array("strain"), self.get_array("stress"), offset)
+        return self.get_feature("yield", yield_point, offset)
@@ -8,33 +8,47 @@
 # Libraries
 import warnings
 import numpy as np
-from pymoo.core.problem import ElementwiseProblem
+from pymoo.core.problem import Problem as PymooProblem
 from moga_neml.optimise.controller import Controller
 from moga_neml.optimise.recorder import Recorder
+from moga_neml.optimise.pool import Pool
 
 # The Problem class
-class Problem(ElementwiseProblem):
+class Problem(PymooProblem):
 
-    def __init__(self, controller:Controller, recorder:Recorder):
+    def __init__(self, controller:Controller, recorder:Recorder, pool:Pool=None):
         """
         Class for defining the problem
 
         Parameters:
         * `controller`: The controller used to control the optimisation
         * `recorder`:   The recorder used to record the results during the optimisation
+        * `pool`:       The pool (or broker) of worker processes to evaluate the parameters
+                        with; evaluates the parameters in this process if undefined
         """
 
         # Initialise
         self.controller = controller
         self.recorder   = recorder
+        self.pool       = pool
+        
+        # Initialise the sets of parameters submitted for asynchronous evaluation
+        self.pending_dict = {}
+        self.num_submitted = 0
+        
+        # Initialise the history of evaluated sets of parameters and their objectives
+        self.history            = False
+        self.params_history     = []
+        self.objectives_history = []
         
         # Get parameter information
         unfix_param_dict = self.controller.get_unfix_param_dict()
         l_bound_list = [unfix_param_dict[param_name]["l_bound"] for param_name in unfix_param_dict.keys()]
         u_bound_list = [unfix_param_dict[param_name]["u_bound"] for param_name in unfix_param_dict.keys()]
         self.unfixed_param_names = list(unfix_param_dict.keys())
+        self.objective_info_list = self.controller.get_objective_info_list()
         
-        # Define the element wise problem
+        # Define the problem
         super().__init__(
             n_var = len(unfix_param_dict.keys()),
             n_obj = len(self.controller.get_objective_info_list()),
@@ -54,6 +68,116 @@ class Problem(ElementwiseProblem):
         """
         return self.recorder
     
+    def get_num_workers(self) -> int:
+        """
+        Returns the number of processes that can evaluate parameters at the same time
+        """
+        if self.pool == None:
+            return 1
+        return max(self.pool.get_num_workers(), 1)
+
+    def get_num_pending(self) -> int:
+        """
+        Returns the number of submitted sets of parameters that have not been collected
+        """
+        return len(self.pending_dict)
+
+    def get_abort_bound(self) -> tuple:
+        """
+        Gets the solutions that the evaluated sets of parameters must beat, and passes
+        them to the controller; returns none if evaluations are neither aborted early
+        nor screened at a lower fidelity
+        """
+        if self.controller.get_early_abort() == None and self.controller.get_low_fidelity() == None:
+            return None
+        abort_bound = self.recorder.get_abort_bound()
+        self.controller.set_abort_bound(*abort_bound)
+        return abort_bound
+
+    def get_objective_values(self, error_value_dict:dict) -> list:
+        """
+        Orders the objective values consistently, since the dictionaries of objectives
+        may come from other processes
+
+        Parameters:
+        * `error_value_dict`: The dictionary of objective values
+
+        Returns the list of objective values
+        """
+        return [error_value_dict[objective_info] for objective_info in self.objective_info_list]
+
+    def submit(self, params:tuple) -> None:
+        """
+        Submits a set of parameters to be evaluated asynchronously; the parameters are
+        evaluated when collected if there is no pool of worker processes
+
+        Parameters:
+        * `params`: The parameter values
+        """
+        if self.pool == None:
+            task_id = self.num_submitted
+        else:
+            task_id = self.pool.submit(params, self.get_abort_bound())
+        self.pending_dict[task_id] = params
+        self.num_submitted += 1
+
+    def collect(self) -> tuple:
+        """
+        Waits for the next submitted set of parameters to be evaluated and records it
+
+        Returns the parameter values and the objective values
+        """
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            if self.pool == None:
+                task_id = list(self.pending_dict.keys())[0]
+                self.get_abort_bound()
+                error_value_dict = self.controller.calculate_objectives(*self.pending_dict[task_id])
+                self.controller.hold_prd_data(self.controller.get_prd_data_dict(*self.pending_dict[task_id]))
+            else:
+                task_id, error_value_dict = self.pool.collect()
+        params = self.pending_dict.pop(task_id)
+        self.record(params, error_value_dict)
+        return params, self.get_objective_values(error_value_dict)
+
+    def keep_history(self) -> None:
+        """
+        Starts keeping the history of the evaluated sets of parameters (e.g., to
+        train a surrogate on); the history is not kept by default
+        """
+        self.history = True
+
+    def get_history(self) -> tuple:
+        """
+        Returns the evaluated sets of parameters and their objective values, as arrays
+        """
+        return np.array(self.params_history, dtype=float), np.array(self.objectives_history, dtype=float)
+
+    def add_history(self, params:tuple, objective_values:list) -> None:
+        """
+        Adds an evaluated set of parameters to the history, if the history is kept
+
+        Parameters:
+        * `params`:           The parameter values
+        * `objective_values`: The list of objective values
+        """
+        if not self.history:
+            return
+        self.params_history.append(list(params))
+        self.objectives_history.append(list(objective_values))
+
+    def record(self, params:tuple, error_value_dict:dict) -> None:
+        """
+        Updates the recorder and the history with an evaluated set of parameters
+
+        Parameters:
+        * `params`:           The parameter values
+        * `error_value_dict`: The dictionary of objective values
+        """
+        self.add_history(params, self.get_objective_values(error_value_dict))
+        param_value_dict = {key: value for key, value in zip(self.unfixed_param_names, params)}
+        self.recorder.update_iteration(param_value_dict, error_value_dict)
+
     def get_param_value_dict(self, params:tuple) -> dict:
         """
         Creates the parameter dictionary
@@ -70,13 +194,13 @@ class Problem(ElementwiseProblem):
             param_value_dict[param_name] = params[i]
         return param_value_dict
     
-    def _evaluate(self, params:tuple, out:dict, *args, **kwargs) -> None:
+    def _evaluate(self, params_list:list, out:dict, *args, **kwargs) -> None:
         """
         Minimises expression "F" such that the expression "G <= 0" is satisfied
 
         Parameters:
-        * `params`: A list of the parameter values
-        * `out`:    The dictionary to attach the error values
+        * `params_list`: A list of the sets of parameter values
+        * `out`:         The dictionary to attach the error values
         """
 
         # Ignore warnings
@@ -84,10 +208,16 @@ class Problem(ElementwiseProblem):
             warnings.simplefilter("ignore")
             
             # Get error values
-            error_value_dict = self.controller.calculate_objectives(*params)
-            out["F"] = list(error_value_dict.values())
+            abort_bound = self.get_abort_bound()
+            if self.pool == None:
+                error_value_dict_list = []
+                for params in params_list:
+                    error_value_dict_list.append(self.controller.calculate_objectives(*params))
+                    self.controller.hold_prd_data(self.controller.get_prd_data_dict(*params))
+            else:
+                error_value_dict_list = self.pool.evaluate(params_list, abort_bound)
+            out["F"] = np.array([self.get_objective_values(error_value_dict) for error_value_dict in error_value_dict_list])
             
-            # Get parameter values and update recorder
-            param_value_dict = {key: value for key, value in zip(self.unfixed_param_names, params)}
-            self.recorder.update_iteration(param_value_dict, error_value_dict)
-            
\ No newline at end of file
+            # Update recorder in order
+            for params, error_value_dict in zip(params_list, error_value_dict_list):
+                self.record(params, error_value_dict)
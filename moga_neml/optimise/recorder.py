@@ -84,6 +84,9 @@ class Recorder:
             f"Reducing Objectives ({self.controller.get_objective_reduction_method()})",
         ]
         
+        # Initialise summary of the evaluation processes
+        self.pool = None
+        
         # Initialise optimal solution
         self.optimal_prd_data = None
         self.optimal_solution_list = []
@@ -108,6 +111,15 @@ class Recorder:
         hp_values       = [num_gens, population, offspring, crossover, mutation]
         self.moga_summary = [f"{hp_names[i]} ({hp_values[i]})" for i in range(len(hp_names))]
     
+    def set_pool(self, pool) -> None:
+        """
+        Defines the pool of worker processes to summarise when recording the results
+
+        Parameters:
+        * `pool`: The pool of worker processes
+        """
+        self.pool = pool
+
     def update_optimal_solution(self, param_dict:dict, objective_dict:dict) -> None:
         """
         Updates the population
@@ -123,6 +135,10 @@ class Recorder:
         reduced_value    = self.controller.reduce_objectives(objective_values)
         solution         = {"params": param_dict, "objectives": objective_dict, reduction_method: reduced_value}
         
+        # Keep the predictions of the best solution, so that recording it does not simulate it again
+        is_best = self.optimal_solution_list == [] or reduced_value < self.optimal_solution_list[0][reduction_method]
+        self.controller.keep_prd_data(is_best, *param_dict.values())
+
         # If the stored parameters exceed the limit, remove the worst
         if len(self.optimal_solution_list) == self.population:
             if self.optimal_solution_list[-1][reduction_method] < solution[reduction_method]:
@@ -136,6 +152,55 @@ class Recorder:
                 return
         self.optimal_solution_list.append(solution)
     
+    def get_interval(self) -> int:
+        """
+        Returns the number of generations between recording the results
+        """
+        return self.interval
+    
+    def get_results_dir(self) -> str:
+        """
+        Returns the directory to store the results
+        """
+        return self.results_dir
+    
+    def get_state(self) -> dict:
+        """
+        Returns the progress of the recorder, so that it can be stored in a checkpoint
+        """
+        return {
+            "num_evals_completed":   self.num_evals_completed,
+            "num_gens_completed":    self.num_gens_completed,
+            "optimal_solution_list": deepcopy(self.optimal_solution_list),
+            "loss_history":          deepcopy(self.loss_history),
+        }
+    
+    def set_state(self, state:dict) -> None:
+        """
+        Restores the progress of the recorder from a checkpoint
+
+        Parameters:
+        * `state`: The progress of the recorder
+        """
+        self.num_evals_completed   = state["num_evals_completed"]
+        self.num_gens_completed    = state["num_gens_completed"]
+        self.optimal_solution_list = deepcopy(state["optimal_solution_list"])
+        self.loss_history          = deepcopy(state["loss_history"])
+    
+    def get_abort_bound(self) -> tuple:
+        """
+        Gets the solutions that new sets of parameters must beat to be stored
+
+        Returns the list of dictionaries of objectives of the stored solutions and the
+        worst stored reduced objective value (none if fewer solutions have been stored
+        than the population size)
+        """
+        archive = [solution["objectives"] for solution in self.optimal_solution_list]
+        if len(self.optimal_solution_list) < self.population:
+            return archive, None
+        reduction_method = self.controller.get_objective_reduction_method()
+        return archive, self.optimal_solution_list[-1][reduction_method]
+    
     def update_iteration(self, param_dict:dict, objective_dict:dict) -> None:
         """
         Updates the results after a MOGA iteration
@@ -182,7 +247,7 @@ class Recorder:
         Gets the optimisation summary;
         returns the dictionary
         """
-        return {
+        summary_dict = {
             "Progress":     [f"{round(self.num_gens_completed)}/{self.num_gens}"],
             "Start / End":  [self.start_time_str, time.strftime("%A, %D, %H:%M:%S", time.localtime())],
             "Model":        [self.controller.get_model().get_name()],
@@ -193,6 +258,12 @@ class Recorder:
             "MOGA Summary": self.moga_summary,
             "Reduction":    self.reduction_method_list,
         }
+        if self.pool != None:
+            summary_dict["Evaluation"] = self.pool.get_summary()
+        stat_dict = self.controller.get_stat_dict()
+        if stat_dict != {}:
+            summary_dict["Simulations"] = [f"{name} ({value})" for name, value in sorted(stat_dict.items())]
+        return summary_dict
     
     def get_result_dict(self) -> dict:
         """
@@ -295,12 +366,9 @@ class Recorder:
         # Get predicted curves first
         opt_params = self.get_opt_params().values()
         typed_curve_list = [curve for curve in self.curve_list if curve.get_type() == type]
-        prd_data_list = []
-        for curve in typed_curve_list:
-            prd_data = self.controller.get_prd_data(curve, *opt_params)
-            if prd_data == None:
-                return
-            prd_data_list.append(prd_data)
+        prd_data_list = self.controller.get_prd_data_list(typed_curve_list, *opt_params)
+        if prd_data_list == None:
+            return
 
         # Iterate through data field combinations and return the list
         plot_dict_list = []
@@ -341,6 +409,10 @@ class Recorder:
         spreadsheet = Spreadsheet(file_path)
         spreadsheet.write_data(self.get_summary_dict(), "summary")
         spreadsheet.write_data(self.get_result_dict(), "results")
+        failure_list = self.controller.get_failure_list()
+        if failure_list != []:
+            spreadsheet.write_data({key: [failure_dict[key] for failure_dict in failure_list]
+                                    for key in failure_list[0].keys()}, "failures")
         for type in self.controller.get_all_types():
             labels_list = get_labels_list(type)
             for i in range(len(labels_list)):
@@ -0,0 +1,157 @@
+"""
+ Title:         Surrogate
+ Description:   For pre-screening offspring with a cheap model of the objectives
+ Author:        Janzen Choi
+
+"""
+
+# Libraries
+import numpy as np
+from scipy.interpolate import RBFInterpolator
+from pymoo.algorithms.moo.nsga2 import NSGA2
+from pymoo.core.population import Population
+from pymoo.util.nds.non_dominated_sorting import NonDominatedSorting
+from moga_neml.optimise.controller import BIG_VALUE
+from moga_neml.optimise.problem import Problem
+
+# Constants
+MAX_POINTS = 500  # maximum number of recent evaluations to train on
+SMOOTHING  = 1e-3 # smoothing of the radial basis functions, to handle noise and near-duplicates
+MIN_ERROR  = 1e-8 # added to the objectives before taking the logarithm
+
+# The Surrogate class
+class Surrogate:
+
+    def __init__(self, problem:Problem, factor:int=5, explore:float=0.2):
+        """
+        Class for predicting the objectives of sets of parameters with radial basis functions
+        trained on the evaluated sets of parameters, so that only the most promising (or the
+        least explored) offspring are evaluated
+
+        Parameters:
+        * `problem`: The problem, which stores the evaluated sets of parameters
+        * `factor`:  The number of candidate offspring to breed for each evaluated offspring
+        * `explore`: The fraction of the evaluated offspring to choose by how far they are
+                     from the evaluated sets of parameters, rather than by their predicted objectives
+        """
+
+        # Initialise inputs
+        self.problem = problem
+        self.factor  = factor
+        self.explore = explore
+        self.problem.keep_history()
+
+        # Initialise internal variables
+        self.interpolator = None
+        self.num_trained  = 0
+        self.train_x      = None
+
+    def get_factor(self) -> int:
+        """
+        Returns the number of candidate offspring to breed for each evaluated offspring
+        """
+        return self.factor
+
+    def normalise(self, params_list:np.ndarray) -> np.ndarray:
+        """
+        Scales the parameters by their bounds
+
+        Parameters:
+        * `params_list`: The list of sets of parameters
+
+        Returns the scaled parameters, between 0 and 1
+        """
+        return (np.array(params_list) - self.problem.xl) / (self.problem.xu - self.problem.xl)
+
+    def train(self) -> bool:
+        """
+        Trains the radial basis functions on the most recent successful evaluations, if
+        there are new evaluations since the last training; failed evaluations are excluded,
+        since their objectives (i.e., `BIG_VALUE`) would distort the radial basis functions
+
+        Returns whether there are enough evaluations to make predictions
+        """
+        params_list, objectives_list = self.problem.get_history()
+        if len(params_list) == self.num_trained:
+            return self.interpolator != None
+        self.num_trained = len(params_list)
+        is_successful = np.all(objectives_list < BIG_VALUE, axis=1)
+        params_list, objectives_list = params_list[is_successful], objectives_list[is_successful]
+        if len(params_list) < 2 * (self.problem.n_var + 1):
+            self.interpolator = None
+            return False
+        self.train_x = self.normalise(params_list[-MAX_POINTS:])
+        train_y = np.log(objectives_list[-MAX_POINTS:] + MIN_ERROR)
+        self.interpolator = RBFInterpolator(self.train_x, train_y, smoothing=SMOOTHING)
+        return True
+
+    def predict(self, params_list:np.ndarray) -> tuple:
+        """
+        Predicts the objectives of sets of parameters
+
+        Parameters:
+        * `params_list`: The list of sets of parameters
+
+        Returns the predicted objectives and the distance from each set of parameters
+        to the closest evaluated set of parameters (i.e., the uncertainty)
+        """
+        x_list = self.normalise(params_list)
+        objectives_list = np.exp(self.interpolator(x_list)) - MIN_ERROR
+        distance_list = np.array([np.min(np.linalg.norm(self.train_x - x, axis=1)) for x in x_list])
+        return objectives_list, distance_list
+
+    def screen(self, params_list:np.ndarray, population_objectives:np.ndarray, num_select:int) -> list:
+        """
+        Chooses the candidate offspring to evaluate
+
+        Parameters:
+        * `params_list`:           The list of sets of parameters of the candidate offspring
+        * `population_objectives`: The evaluated objectives of the current population
+        * `num_select`:            The number of candidate offspring to choose
+
+        Returns the indexes of the chosen candidate offspring
+        """
+
+        # Choose the first candidates if there are no predictions
+        num_select = min(num_select, len(params_list))
+        if not self.train():
+            return list(range(num_select))
+
+        # Rank the candidates by non-dominated sorting together with the current population
+        objectives_list, distance_list = self.predict(params_list)
+        all_objectives = np.concatenate([population_objectives, objectives_list])
+        rank_list = NonDominatedSorting().do(all_objectives, return_rank=True)[1][len(population_objectives):]
+
+        # Choose the least explored candidates, then the best ranked candidates
+        num_explore = int(round(self.explore * num_select))
+        explore_list = list(np.argsort(-distance_list)[:num_explore])
+        rank_order = np.lexsort((-distance_list, rank_list))
+        exploit_list = [index for index in rank_order if not index in explore_list][:num_select - num_explore]
+        return [int(index) for index in exploit_list + explore_list]
+
+# The NSGA2 class with pre-screened offspring
+class ScreenedNSGA2(NSGA2):
+
+    def __init__(self, surrogate:Surrogate, **kwargs):
+        """
+        Class for the NSGA2 algorithm, which breeds more candidate offspring than
+        needed and only evaluates the candidates chosen by the surrogate
+
+        Parameters:
+        * `surrogate`: The surrogate to choose the candidate offspring with
+        * `kwargs`:    The arguments of the NSGA2 algorithm
+        """
+        super().__init__(**kwargs)
+        self.surrogate = surrogate
+
+    def _infill(self) -> Population:
+        """
+        Breeds the candidate offspring and returns the chosen offspring (for internal use only)
+        """
+        num_candidates = self.n_offsprings * self.surrogate.get_factor()
+        candidates = self.mating.do(self.problem, self.pop, num_candidates, algorithm=self, random_state=self.random_state)
+        if len(candidates) == 0:
+            self.termination.force_termination = True
+            return
+        index_list = self.surrogate.screen(candidates.get("X"), self.pop.get("F"), self.n_offsprings)
+        return candidates[index_list]
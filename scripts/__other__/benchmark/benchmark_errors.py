@@ -0,0 +1,116 @@
+"""
+ Title:         Error Benchmark
+ Description:   Times each call of the errors on the sample data;
+                run with `python3 benchmark_errors.py [results.json]`, where the results
+                of an earlier run (e.g., on another version) are compared against, if given
+ Author:        Janzen Choi
+
+"""
+
+# Libraries
+import importlib.util, json, os, sys, time
+import numpy as np
+from copy import deepcopy
+sys.path += ["../../.."]
+from moga_neml.errors.__error__ import create_error
+from moga_neml.io.reader import read_exp_data
+from moga_neml.optimise.prediction import Prediction
+
+# Constants
+DATA_PATH   = "../../data"
+RESULTS     = "benchmark_errors.json"
+NUM_CALLS   = 200
+FILE_DICT   = {
+    "creep":   "creep/inl_1/AirBase_800_80_G25.csv",
+    "tensile": "tensile/inl/AirBase_800_D7.csv",
+    "cyclic":  "cyclic/Airbase316.csv",
+}
+ERROR_LIST  = [
+    ("area",        "creep",   "time",   "strain", {}),
+    ("area",        "creep",   "time",   "strain", {"lookup": True}),
+    ("area_custom", "creep",   "time",   "strain", {"values": [1000, 2000, 3000, 4000]}),
+    ("area_der",    "creep",   "time",   "strain", {}),
+    ("area_norm",   "creep",   "time",   "strain", {}),
+    ("end",         "creep",   "time",   "",       {}),
+    ("end_cons",    "creep",   "time",   "",       {}),
+    ("end_zero",    "creep",   "time",   "",       {}),
+    ("max",         "creep",   "strain", "",       {}),
+    ("arg_max",     "creep",   "time",   "strain", {}),
+    ("min_data",    "creep",   "time",   "",       {}),
+    ("dummy",       "creep",   "",       "",       {}),
+    ("area",        "tensile", "strain", "stress", {}),
+    ("area",        "tensile", "strain", "stress", {"lookup": True}),
+    ("hardening",   "tensile", "strain", "stress", {"strain_0": 0.05}),
+    ("yield_point", "tensile", "strain", "stress", {}),
+    ("saddle",      "cyclic",  "time",   "stress", {}),
+    ("area_saddle", "cyclic",  "time",   "stress", {}),
+    ("num_peaks",   "cyclic",  "time",   "stress", {}),
+    ("peak_dist",   "cyclic",  "time",   "stress", {}),
+]
+GROUP_DICT  = { # errors that are commonly evaluated on the same predicted curve
+    "creep_area_end": ("creep",  [("area", "time", "strain", {}), ("end", "time", "", {}), ("end", "strain", "", {})]),
+    "cyclic_peaks":   ("cyclic", [("num_peaks", "time", "stress", {}), ("peak_dist", "time", "stress", {})]),
+}
+
+def get_prd_data(exp_data:dict) -> dict:
+    """
+    Imitates a predicted curve by distorting an experimental curve;
+    the driver returns the predicted data as arrays
+
+    Parameters:
+    * `exp_data`: The experimental data
+
+    Returns the distorted data
+    """
+    prd_data = {}
+    for field in ["time", "strain", "stress"]:
+        if isinstance(exp_data.get(field), list):
+            factor = {"time": 0.95, "strain": 1.05, "stress": 0.97}[field]
+            prd_data[field] = np.array(exp_data[field]) * factor
+    return prd_data
+
+def time_errors(data_type:str, error_info_list:list) -> tuple:
+    """
+    Times the calls of errors evaluated on the same predicted curve
+
+    Parameters:
+    * `data_type`:       The type of the sample data
+    * `error_info_list`: The list of the names, x labels, y labels, and arguments of the errors
+
+    Returns the time per predicted curve (in microseconds) and the sum of the values of the errors
+    """
+    file_dir, file_name = os.path.split(FILE_DICT[data_type])
+    exp_data = read_exp_data(f"{DATA_PATH}/{file_dir}", file_name, True, 1000)
+    error_list = [create_error(error_name, x_label, y_label, 1.0, exp_data, None, **kwargs)
+                  for error_name, x_label, y_label, kwargs in error_info_list]
+    prd_data = get_prd_data(exp_data)
+    total_time = 0
+    for _ in range(NUM_CALLS):
+        call_data = Prediction(deepcopy(prd_data))
+        start_time = time.perf_counter()
+        value_list = [error.get_value(call_data) for error in error_list]
+        total_time += time.perf_counter() - start_time
+    value = None if None in value_list else float(sum(value_list))
+    return total_time / NUM_CALLS * 1e6, value
+
+# Time the errors and compare against earlier results
+old_dict = {}
+if len(sys.argv) > 1:
+    with open(sys.argv[1], "r") as file:
+        old_dict = json.load(file)
+result_dict = {}
+print(f"{'error':<22}{'before (us)':>14}{'after (us)':>14}{'speedup':>10}{'value change':>14}")
+run_dict = {f"{error_name}_{data_type}" + ("_lookup" if kwargs.get("lookup") else ""): (data_type, [(error_name, x_label, y_label, kwargs)])
+            for error_name, data_type, x_label, y_label, kwargs in ERROR_LIST}
+for key, (data_type, error_info_list) in {**run_dict, **GROUP_DICT}.items():
+    call_time, value = time_errors(data_type, error_info_list)
+    result_dict[key] = {"time": call_time, "value": value}
+    if key in old_dict:
+        old_time = old_dict[key]["time"]
+        old_value = old_dict[key]["value"]
+        change = "-" if old_value == value else "{:0.2e}".format(abs(value - old_value) / abs(old_value))
+        print(f"{key:<22}{old_time:>14.1f}{call_time:>14.1f}{old_time/call_time:>9.1f}x{change:>14}")
+    else:
+        print(f"{key:<22}{'':>14}{call_time:>14.1f}{'':>10}")
+with open(RESULTS, "w") as file:
+    json.dump(result_dict, file, indent=4)
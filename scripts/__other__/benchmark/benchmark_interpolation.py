@@ -0,0 +1,95 @@
+"""
+ Title:         Interpolation Benchmark
+ Description:   Compares the speed and accuracy of the interpolation modes on the
+                creep and tensile sample data; run with `python3 benchmark_interpolation.py`
+ Author:        Janzen Choi
+
+"""
+
+# Libraries
+import importlib.util, os, sys, time
+import numpy as np
+sys.path += ["../../.."]
+from moga_neml.errors.__error__ import create_error
+from moga_neml.helper.interpolator import Interpolator, MODE_LIST
+from moga_neml.io.reader import read_exp_data
+from moga_neml.optimise.prediction import Prediction
+
+# Constants
+DATA_PATH  = "../../data"
+NUM_CALLS  = 100
+NUM_POINTS = 50
+DIR_DICT   = {
+    "creep":   ("creep/inl_1", "time", "strain"),
+    "tensile": ("tensile/inl", "strain", "stress"),
+}
+
+def time_interpolation(x_list:np.ndarray, y_list:np.ndarray, mode:str) -> float:
+    """
+    Times the fitting and evaluation of an interpolator, as done for each predicted curve
+
+    Parameters:
+    * `x_list`: The array of x values
+    * `y_list`: The array of y values
+    * `mode`:   The interpolation mode
+
+    Returns the time per call, in microseconds
+    """
+    eval_x_list = np.linspace(x_list[0], x_list[-1], NUM_POINTS)
+    start_time = time.perf_counter()
+    for _ in range(NUM_CALLS):
+        Interpolator(x_list, y_list, NUM_POINTS, mode=mode).evaluate(eval_x_list)
+    return (time.perf_counter() - start_time) / NUM_CALLS * 1e6
+
+def get_fit_error(x_list:np.ndarray, y_list:np.ndarray, mode:str) -> float:
+    """
+    Calculates how closely the interpolator passes through all the data points,
+    including the points removed by the thinning
+
+    Parameters:
+    * `x_list`: The array of x values
+    * `y_list`: The array of y values
+    * `mode`:   The interpolation mode
+
+    Returns the NRMSE as a percentage
+    """
+    interp_y_list = Interpolator(x_list, y_list, NUM_POINTS, mode=mode).evaluate(x_list)
+    return np.sqrt(np.average(np.square(interp_y_list - y_list))) / np.average(np.abs(y_list)) * 100
+
+def get_area_value(exp_data:dict, x_label:str, y_label:str, mode:str) -> float:
+    """
+    Calculates the area error between an experimental curve and a distorted copy of it
+
+    Parameters:
+    * `exp_data`: The experimental data
+    * `x_label`:  The label for the x axis
+    * `y_label`:  The label for the y axis
+    * `mode`:     The interpolation mode of the predicted data
+
+    Returns the value of the error
+    """
+    error = create_error("area", x_label, y_label, 1.0, exp_data, None, interpolation=mode)
+    prd_data = Prediction({x_label: np.array(exp_data[x_label]) * 0.95, y_label: np.array(exp_data[y_label]) * 1.03})
+    return error.get_value(prd_data)
+
+# Compare the interpolation modes on each type of data
+print(f"{'data':<10}{'mode':<8}{'time (us)':>11}{'fit NRMSE (%)':>15}{'area vs spline (%)':>20}")
+for data_type, (data_dir, x_label, y_label) in DIR_DICT.items():
+    file_list = sorted([file for file in os.listdir(f"{DATA_PATH}/{data_dir}") if file.endswith(".csv")])
+    exp_data_list = []
+    for file in file_list:
+        try:
+            exp_data_list.append(read_exp_data(f"{DATA_PATH}/{data_dir}", file, True, 1000))
+        except ValueError:
+            print(f"Skipping {file}, which does not reach 80% of its UTS after the UTS")
+    spline_list = [get_area_value(exp_data, x_label, y_label, "spline") for exp_data in exp_data_list]
+    for mode in MODE_LIST:
+        time_list, fit_list, area_list = [], [], []
+        for exp_data, spline_value in zip(exp_data_list, spline_list):
+            x_list = np.array(exp_data[x_label])
+            y_list = np.array(exp_data[y_label])
+            time_list.append(time_interpolation(x_list, y_list, mode))
+            fit_list.append(get_fit_error(x_list, y_list, mode))
+            area_value = get_area_value(exp_data, x_label, y_label, mode)
+            area_list.append(abs(area_value - spline_value) / spline_value * 100)
+        print(f"{data_type:<10}{mode:<8}{np.average(time_list):>11.1f}{np.average(fit_list):>15.3f}{np.average(area_list):>20.3f}")
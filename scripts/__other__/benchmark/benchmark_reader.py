@@ -0,0 +1,49 @@
+"""
+ Title:         Reader Benchmark
+ Description:   Times the reading of the sample creep and cyclic data, with and without
+                the cache of parsed curves; run with `python3 benchmark_reader.py`
+ Author:        Janzen Choi
+
+"""
+
+# Libraries
+import os, shutil, sys, time
+sys.path += ["../../.."]
+from moga_neml.io.reader import read_exp_data_list, CACHE_DIR
+
+# Constants
+DATA_PATH   = "../../data"
+DIR_LIST    = ["creep", "cyclic"]
+NUM_WORKERS = 4
+
+def time_reading(file_list:list, cache:bool, num_processes:int) -> float:
+    """
+    Times the reading of the sample data
+
+    Parameters:
+    * `file_list`:     The list of files relative to the data folder
+    * `cache`:         Whether to cache the parsed curves
+    * `num_processes`: The number of processes to read the files with
+
+    Returns the time to read all the files, in seconds
+    """
+    start_time = time.perf_counter()
+    read_exp_data_list(DATA_PATH, file_list, True, 1000, cache, num_processes)
+    return time.perf_counter() - start_time
+
+# Get the files of the sample data
+file_list = []
+for data_dir in DIR_LIST:
+    for dir_path, _, file_name_list in os.walk(f"{DATA_PATH}/{data_dir}"):
+        file_list += [os.path.relpath(f"{dir_path}/{file_name}", DATA_PATH) for file_name in file_name_list if file_name.endswith(".csv")]
+file_list = sorted(file_list)
+num_lines = sum([sum(1 for _ in open(f"{DATA_PATH}/{file}")) for file in file_list])
+print(f"Reading {len(file_list)} files with {num_lines} lines")
+
+# Time the reading without the cache, when filling the cache, and from the cache
+shutil.rmtree(f"{DATA_PATH}/{CACHE_DIR}", ignore_errors=True)
+print(f"{'parsing':<32}{time_reading(file_list, False, 1):>8.3f}s")
+print(f"{'parsing with {0} processes'.format(NUM_WORKERS):<32}{time_reading(file_list, False, NUM_WORKERS):>8.3f}s")
+print(f"{'parsing and caching':<32}{time_reading(file_list, True, 1):>8.3f}s")
+print(f"{'reading from the cache':<32}{time_reading(file_list, True, 1):>8.3f}s")
+shutil.rmtree(f"{DATA_PATH}/{CACHE_DIR}", ignore_errors=True)
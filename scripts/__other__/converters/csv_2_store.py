@@ -0,0 +1,23 @@
+"""
+ Title:         CSV to Store
+ Description:   Converts the CSV files of experimental data in a folder into stores, which
+                `read_data` opens without copying the data; run with
+                `python3 csv_2_store.py <csv_dir> <store_dir>`
+ Author:        Janzen Choi
+
+"""
+
+# Libraries
+import os, sys
+sys.path += ["../../.."]
+from moga_neml.io.reader import get_curve_dict
+from moga_neml.io.store import write_exp_store
+
+# Convert the unthinned data of each CSV file into a store with the same name
+csv_dir, store_dir = sys.argv[1], sys.argv[2]
+csv_files = sorted([file for file in os.listdir(csv_dir) if file.endswith(".csv")])
+for csv_file in csv_files:
+    with open(f"{csv_dir}/{csv_file}", "r") as file:
+        exp_data = get_curve_dict(file.read().splitlines(), False, 0)
+    write_exp_store(exp_data, f"{store_dir}/{csv_file.replace('.csv', '')}")
+    print(f"Converted '{csv_file}'")
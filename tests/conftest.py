@@ -0,0 +1,47 @@
+"""
+ Title:         Test configuration
+ Description:   Shared fixtures for the tests; run with `python -m pytest` from the root of the repository
+ Author:        Janzen Choi
+
+"""
+
+# Libraries
+import os, sys, tempfile
+import pytest
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from moga_neml.interface import Interface
+
+# Constants
+DATA_PATH   = os.path.join(os.path.dirname(__file__), "../scripts/data")
+CREEP_FILE  = "creep/inl_1/AirBase_800_80_G25.csv"
+TENS_FILE   = "tensile/inl/AirBase_800_D7.csv"
+PARAMS_LIST = [
+    [15.5, 158.4, 0.535, 4.42, 1866.2],
+    [31.3, 105.3, 0.855, 3.73, 2576.7],
+    [11.45, 53.1, 7.18, 3.95, 2205.4],
+]
+
+@pytest.fixture
+def params_list():
+    """
+    Returns a list of sets of parameters for the `evp` model
+    """
+    return [list(params) for params in PARAMS_LIST]
+
+@pytest.fixture
+def get_interface(tmp_path):
+    """
+    Returns a function that creates an interface for calibrating the `evp` model against
+    a creep curve and a tensile curve, writing its results to a new temporary folder
+    """
+    def create_interface() -> Interface:
+        output_path = tempfile.mkdtemp(dir=tmp_path)
+        itf = Interface("test", input_path=DATA_PATH, output_path=output_path, verbose=False)
+        itf.define_model("evp")
+        itf.read_data(CREEP_FILE)
+        itf.add_error("area", "time", "strain")
+        itf.add_error("end", "time", "strain")
+        itf.read_data(TENS_FILE)
+        itf.add_error("area", "strain", "stress")
+        return itf
+    return create_interface
@@ -0,0 +1,94 @@
+"""
+ Title:         Broker tests
+ Description:   Checks that the broker hands the tasks of lost workers to other workers,
+                without handing out the tasks of slow workers again
+ Author:        Janzen Choi
+
+"""
+
+# Libraries
+import multiprocessing, socket, threading, time
+import pytest
+from multiprocessing.connection import Client
+from moga_neml.optimise import broker
+from moga_neml.optimise.broker import Broker, serve
+
+# Constants
+AUTHKEY = "test"
+
+def get_free_port() -> int:
+    """
+    Returns a port on localhost that is not in use
+    """
+    with socket.socket() as sock:
+        sock.bind(("localhost", 0))
+        return sock.getsockname()[1]
+
+def start_worker(controller, port:int):
+    """
+    Starts a worker process that evaluates the tasks of a broker
+
+    Parameters:
+    * `controller`: The controller to evaluate the tasks with
+    * `port`:       The port of the broker on localhost
+
+    Returns the process
+    """
+    context = multiprocessing.get_context("fork")
+    process = context.Process(target=serve, args=(controller, port, AUTHKEY))
+    process.start()
+    return process
+
+def test_requeue_lost_worker(get_interface, params_list):
+    """
+    Checks that the task of a worker that dies is handed to another worker
+    """
+    controller = get_interface().__controller__
+    port = get_free_port()
+    task_broker = Broker(controller, port, AUTHKEY)
+
+    # Connect a worker that dies after receiving its task
+    connection = Client(("localhost", port), authkey=AUTHKEY.encode())
+    while task_broker.get_num_workers() < 1:
+        time.sleep(0.1)
+    result_list = []
+    thread = threading.Thread(target=lambda: result_list.append(task_broker.evaluate(params_list[:1])))
+    thread.start()
+    connection.recv()
+    connection.close()
+
+    # Hand the task to a working worker
+    process = start_worker(controller, port)
+    thread.join()
+    task_broker.close()
+    process.join()
+    assert result_list[0] == [controller.calculate_objectives(*params_list[0])]
+    assert "Requeued (1)" in task_broker.get_summary()
+
+def test_keep_slow_worker(get_interface, params_list, monkeypatch):
+    """
+    Checks that a worker that takes longer than the timeout, but sends heartbeats,
+    keeps its task
+    """
+    monkeypatch.setattr(broker, "HEARTBEAT_TIME", 0.1)
+    controller = get_interface().__controller__
+    calculate_objectives = controller.calculate_objectives
+    def calculate_slowly(*params, **kwargs):
+        time.sleep(1.0)
+        return calculate_objectives(*params, **kwargs)
+    controller.calculate_objectives = calculate_slowly
+    port = get_free_port()
+    task_broker = Broker(controller, port, AUTHKEY, timeout=0.5)
+    process = start_worker(controller, port)
+    result_list = task_broker.evaluate(params_list[:1])
+    task_broker.close()
+    process.join()
+    assert result_list == [calculate_objectives(*params_list[0])]
+    assert "Requeued (0)" in task_broker.get_summary()
+
+def test_timeout_shorter_than_heartbeats(get_interface):
+    """
+    Checks that the timeout must leave time for the heartbeats
+    """
+    with pytest.raises(ValueError):
+        Broker(get_interface().__controller__, get_free_port(), AUTHKEY, timeout=broker.HEARTBEAT_TIME)
@@ -0,0 +1,118 @@
+"""
+ Title:         Cache tests
+ Description:   Checks that the cached predictions give the same objectives as simulating
+                the curves, that recording the results does not simulate them again, and that
+                calibrated models and simulations are shared between curves
+ Author:        Janzen Choi
+
+"""
+
+# Libraries
+import numpy as np
+import pytest
+from conftest import DATA_PATH, CREEP_FILE
+from moga_neml.interface import Interface
+from moga_neml.optimise.controller import Controller
+from moga_neml.optimise.recorder import Recorder
+
+def test_cache_hits(get_interface, params_list):
+    """
+    Checks that evaluating sets of parameters again hits the cache and gives the same objectives
+    """
+    controller = get_interface().__controller__
+    objective_dict_list = [controller.calculate_objectives(*params) for params in params_list]
+    cached_list = [controller.calculate_objectives(*params) for params in params_list]
+    assert cached_list == objective_dict_list
+    assert controller.get_stat_dict()["Cache (misses)"] == 2 * len(params_list)
+    itf = get_interface()
+    itf.set_cache_size(0)
+    controller = itf.__controller__
+    assert [controller.calculate_objectives(*params) for params in params_list] == objective_dict_list
+    assert not "Cache (hits)" in controller.get_stat_dict()
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_record_without_simulating(get_interface, monkeypatch, workers):
+    """
+    Checks that recording the results uses the predictions of the best solution, even
+    if the cache is disabled or the solutions are evaluated by other processes
+    """
+
+    # Count the simulations run while recording the results
+    num_sim_list = []
+    run_driver = Controller.run_driver
+    def count_run_driver(controller, *args):
+        num_sim_list.append(1)
+        return run_driver(controller, *args)
+    create_record = Recorder.create_record
+    def check_create_record(recorder, *args, **kwargs):
+        monkeypatch.setattr(Controller, "run_driver", count_run_driver)
+        create_record(recorder, *args, **kwargs)
+        monkeypatch.setattr(Controller, "run_driver", run_driver)
+    monkeypatch.setattr(Recorder, "create_record", check_create_record)
+
+    # Optimise and record the results after each generation
+    itf = get_interface()
+    itf.set_cache_size(0)
+    itf.set_recorder(1)
+    itf.optimise(2, 4, 2, workers=workers)
+    assert num_sim_list == []
+
+def get_creep_interface(tmp_path, file_list:list) -> Interface:
+    """
+    Creates an interface for calibrating the `evp` model against creep curves
+
+    Parameters:
+    * `tmp_path`:  The temporary folder to write the results to
+    * `file_list`: The list of paths to the creep curves
+
+    Returns the interface
+    """
+    itf = Interface("test", input_path=DATA_PATH, output_path=str(tmp_path), verbose=False)
+    itf.define_model("evp")
+    for file in file_list:
+        itf.read_data(file)
+        itf.add_error("area", "time", "strain")
+    return itf
+
+def get_prd_data_list(controller:Controller, params:list) -> list:
+    """
+    Gets the predictions of all the curves as lists
+
+    Parameters:
+    * `controller`: The controller
+    * `params`:     The parameter values
+
+    Returns the list of dictionaries of predicted data
+    """
+    prd_data_list = [controller.get_prd_data(curve, *params) for curve in controller.get_curve_list()]
+    return [{field: np.asarray(value).tolist() for field, value in prd_data.items()} for prd_data in prd_data_list]
+
+def test_reuse_calibrated_models(tmp_path, params_list):
+    """
+    Checks that curves at the same temperature share the calibrated model, and that
+    their predictions are the same as calibrating the model for each curve
+    """
+    file_list = ["creep/inl_1/AirBase_800_80_G25.csv", "creep/inl_1/AirBase_800_70_G44.csv"]
+    itf = get_creep_interface(tmp_path, file_list)
+    model = itf.__controller__.get_model()
+    num_calibration_list = []
+    calibrate_model = model.calibrate_model
+    def count_calibrate_model(*params):
+        num_calibration_list.append(1)
+        return calibrate_model(*params)
+    model.calibrate_model = count_calibrate_model
+    prd_data_list = get_prd_data_list(itf.__controller__, params_list[0])
+    assert len(num_calibration_list) == 1
+    for file, prd_data in zip(file_list, prd_data_list):
+        assert get_prd_data_list(get_creep_interface(tmp_path, [file]).__controller__, params_list[0]) == [prd_data]
+
+def test_share_simulations(tmp_path, params_list):
+    """
+    Checks that repeated specimens are simulated once, with the same predictions as
+    simulating each specimen
+    """
+    itf = get_creep_interface(tmp_path, [CREEP_FILE, CREEP_FILE])
+    itf.set_cache_size(0)
+    prd_data_list = get_prd_data_list(itf.__controller__, params_list[0])
+    assert itf.__controller__.get_stat_dict()["Shared simulations"] == 1
+    assert prd_data_list == get_prd_data_list(get_creep_interface(tmp_path, [CREEP_FILE]).__controller__, params_list[0]) * 2
@@ -0,0 +1,56 @@
+"""
+ Title:         Checkpoint tests
+ Description:   Checks that optimisations resumed from a checkpoint continue in the same way
+ Author:        Janzen Choi
+
+"""
+
+# Libraries
+import numpy as np
+from moga_neml.optimise.moga import load_checkpoint
+
+def resume(get_interface, checkpoint_path:str, num_gens:int) -> dict:
+    """
+    Resumes an optimisation from a checkpoint
+
+    Parameters:
+    * `get_interface`:   The function to create the interface with
+    * `checkpoint_path`: The path to the checkpoint
+    * `num_gens`:        The number of generations to optimise up to
+
+    Returns the checkpoint saved at the end of the resumed optimisation
+    """
+    itf = get_interface()
+    itf.set_recorder(1)
+    itf.optimise(num_gens, 4, 2, resume_from=checkpoint_path)
+    return load_checkpoint(f"{itf.__output_path__}/checkpoint.pkl")
+
+def test_resume_next_generation(get_interface):
+    """
+    Checks that resuming from the same checkpoint breeds the same next generation
+    """
+    itf = get_interface()
+    itf.set_recorder(1)
+    itf.optimise(2, 4, 2)
+    checkpoint_path = f"{itf.__output_path__}/checkpoint.pkl"
+    assert load_checkpoint(checkpoint_path)["num_gens"] == 2
+    checkpoint_list = [resume(get_interface, checkpoint_path, 3) for _ in range(2)]
+    assert checkpoint_list[0]["num_gens"] == 3
+    assert np.array_equal(checkpoint_list[0]["X"], checkpoint_list[1]["X"])
+    assert np.array_equal(checkpoint_list[0]["F"], checkpoint_list[1]["F"])
+
+def test_resume_seeded(get_interface):
+    """
+    Checks that a seeded optimisation resumed from a checkpoint ends with the same
+    population as the optimisation that was not interrupted
+    """
+    itf = get_interface()
+    itf.set_recorder(1)
+    itf.optimise(3, 4, 2, seed=1)
+    checkpoint = load_checkpoint(f"{itf.__output_path__}/checkpoint.pkl")
+    itf = get_interface()
+    itf.set_recorder(1)
+    itf.optimise(2, 4, 2, seed=1)
+    resumed_checkpoint = resume(get_interface, f"{itf.__output_path__}/checkpoint.pkl", 3)
+    assert np.array_equal(checkpoint["X"], resumed_checkpoint["X"])
+    assert np.array_equal(checkpoint["F"], resumed_checkpoint["F"])
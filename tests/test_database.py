@@ -0,0 +1,39 @@
+"""
+ Title:         Database tests
+ Description:   Checks that the objectives stored in the database are reused by other runs
+                with the same definitions, and only by them
+ Author:        Janzen Choi
+
+"""
+
+def test_database_reuse(get_interface, params_list, tmp_path):
+    """
+    Checks that a new run reuses the stored objectives without simulating the curves
+    """
+    database_path = str(tmp_path / "evaluations.db")
+    itf = get_interface()
+    itf.set_database(database_path)
+    objective_dict_list = [itf.__controller__.calculate_objectives(*params) for params in params_list]
+
+    # Reuse the objectives in a new run
+    itf = get_interface()
+    itf.set_database(database_path)
+    controller = itf.__controller__
+    assert [controller.calculate_objectives(*params) for params in params_list] == objective_dict_list
+    assert controller.get_stat_dict() == {"Database (hits)": len(params_list)}
+
+def test_database_changed_errors(get_interface, params_list, tmp_path):
+    """
+    Checks that a run with different errors does not reuse the stored objectives
+    """
+    database_path = str(tmp_path / "evaluations.db")
+    itf = get_interface()
+    itf.set_database(database_path)
+    itf.__controller__.calculate_objectives(*params_list[0])
+    itf = get_interface()
+    itf.add_error("max", "stress")
+    itf.set_database(database_path)
+    controller = itf.__controller__
+    controller.calculate_objectives(*params_list[0])
+    assert controller.get_stat_dict()["Database (misses)"] == 1
+    assert not "Database (hits)" in controller.get_stat_dict()
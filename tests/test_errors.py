@@ -0,0 +1,173 @@
+"""
+ Title:         Error tests
+ Description:   Checks that the vectorised errors give the same values as evaluating
+                them point by point, and that the `area` lookup table stays within its tolerance
+ Author:        Janzen Choi
+
+"""
+
+# Libraries
+import math, os
+import numpy as np
+import pytest
+from conftest import DATA_PATH, CREEP_FILE, TENS_FILE
+from moga_neml.errors.__error__ import create_error
+from moga_neml.helper.interpolator import Interpolator
+from moga_neml.io.reader import read_exp_data
+from moga_neml.optimise.prediction import Prediction
+
+# Constants
+FACTOR_LIST = [(0.95, 1.03), (1.2, 0.9), (0.8, 1.1)]
+
+def get_exp_data(file:str) -> dict:
+    """
+    Reads a sample curve
+
+    Parameters:
+    * `file`: The path to the curve, relative to the data folder
+
+    Returns the experimental data
+    """
+    file_dir, file_name = os.path.split(file)
+    return read_exp_data(f"{DATA_PATH}/{file_dir}", file_name, True, 1000)
+
+def get_prd_data(exp_data:dict, x_label:str, y_label:str, factors:tuple) -> Prediction:
+    """
+    Imitates a predicted curve by scaling an experimental curve
+
+    Parameters:
+    * `exp_data`: The experimental data
+    * `x_label`:  The label for the x axis
+    * `y_label`:  The label for the y axis
+    * `factors`:  The factors to scale the x and y values by
+
+    Returns the predicted data
+    """
+    return Prediction({
+        x_label: np.array(exp_data[x_label]) * factors[0],
+        y_label: np.array(exp_data[y_label]) * factors[1],
+    })
+
+def get_area(exp_data:dict, prd_data:dict, x_label:str, y_label:str, num_points:int=50) -> float:
+    """
+    Calculates the `area` error point by point
+
+    Parameters:
+    * `exp_data`:   The experimental data
+    * `prd_data`:   The predicted data
+    * `x_label`:    The label for the x axis
+    * `y_label`:    The label for the y axis
+    * `num_points`: The number of points to evaluate
+
+    Returns the error
+    """
+    x_list, y_list = exp_data[x_label], exp_data[y_label]
+    exp_interpolator = Interpolator(x_list, y_list, num_points)
+    prd_x_list = np.linspace(prd_data[x_label][0], min(x_list[-1], prd_data[x_label][-1]), num_points)
+    prd_y_list = Interpolator(prd_data[x_label], prd_data[y_label], num_points).evaluate(prd_x_list)
+    exp_y_list = exp_interpolator.evaluate(prd_x_list)
+    area = [math.pow(prd_y_list[i] - exp_y_list[i], 2) for i in range(num_points) if prd_x_list[i] <= x_list[-1]]
+    return math.sqrt(np.average(area)) / np.average([abs(y) for y in y_list])
+
+def get_area_custom(exp_data:dict, prd_data:dict, x_label:str, y_label:str, values:list) -> float:
+    """
+    Calculates the `area_custom` error point by point
+
+    Parameters:
+    * `exp_data`: The experimental data
+    * `prd_data`: The predicted data
+    * `x_label`:  The label for the x axis
+    * `y_label`:  The label for the y axis
+    * `values`:   The x values to query
+
+    Returns the error
+    """
+    exp_y_list = Interpolator(exp_data[x_label], exp_data[y_label]).evaluate(values)
+    prd_y_list = Interpolator(prd_data[x_label], prd_data[y_label]).evaluate(values)
+    area = [math.pow(prd_y_list[i] - exp_y_list[i], 2) for i in range(len(prd_y_list))]
+    return math.sqrt(np.average(area)) / np.average([abs(y) for y in exp_y_list])
+
+def get_max(exp_data:dict, prd_data:dict, x_label:str) -> float:
+    """
+    Calculates the `max` error point by point
+
+    Parameters:
+    * `exp_data`: The experimental data
+    * `prd_data`: The predicted data
+    * `x_label`:  The label for the x axis
+
+    Returns the error
+    """
+    x_max = abs(max(exp_data[x_label]))
+    return abs(x_max - max(list(prd_data[x_label]))) / x_max
+
+def get_arg_max(exp_data:dict, prd_data:dict, x_label:str, y_label:str) -> float:
+    """
+    Calculates the `arg_max` error point by point
+
+    Parameters:
+    * `exp_data`: The experimental data
+    * `prd_data`: The predicted data
+    * `x_label`:  The label for the x axis
+    * `y_label`:  The label for the y axis
+
+    Returns the error
+    """
+    find_arg_max = lambda x_list, y_list: x_list[y_list.index(max(y_list))]
+    exp_arg_max = find_arg_max(list(exp_data[x_label]), list(exp_data[y_label]))
+    prd_arg_max = find_arg_max(list(prd_data[x_label]), list(prd_data[y_label]))
+    return abs(exp_arg_max - prd_arg_max) / exp_arg_max
+
+def get_hardening(exp_data:dict, prd_data:dict, strain_0:float) -> float:
+    """
+    Calculates the `hardening` error point by point
+
+    Parameters:
+    * `exp_data`: The experimental data
+    * `prd_data`: The predicted data
+    * `strain_0`: The first strain value to calculate hardening
+
+    Returns the error
+    """
+    def fit_hardening(strain_list:list, stress_list:list) -> float:
+        strain_1 = max(exp_data["strain"])
+        index_list = [i for i in range(len(strain_list)) if strain_list[i] >= strain_0 and strain_list[i] <= strain_1]
+        return np.polyfit([strain_list[i] for i in index_list], [stress_list[i] for i in index_list], 1)[0]
+    exp_hardening = fit_hardening(exp_data["strain"], exp_data["stress"])
+    prd_hardening = fit_hardening(list(prd_data["strain"]), list(prd_data["stress"]))
+    return abs((exp_hardening - prd_hardening) / exp_hardening)
+
+@pytest.mark.parametrize("factors", FACTOR_LIST)
+def test_vectorised_errors(factors):
+    """
+    Checks that the vectorised errors give the same values as evaluating them point by point
+    """
+    creep_data = get_exp_data(CREEP_FILE)
+    tensile_data = get_exp_data(TENS_FILE)
+    case_list = [
+        ("area", creep_data, "time", "strain", {}, get_area),
+        ("area", tensile_data, "strain", "stress", {}, get_area),
+        ("area_custom", creep_data, "time", "strain", {"values": [1000, 2000, 3000, 4000]},
+         lambda *args: get_area_custom(*args, [1000, 2000, 3000, 4000])),
+        ("max", creep_data, "strain", "", {}, lambda exp_data, prd_data, x_label, _: get_max(exp_data, prd_data, x_label)),
+        ("arg_max", creep_data, "time", "strain", {}, get_arg_max),
+        ("hardening", tensile_data, "strain", "stress", {"strain_0": 0.05},
+         lambda exp_data, prd_data, *_: get_hardening(exp_data, prd_data, 0.05)),
+    ]
+    for error_name, exp_data, x_label, y_label, kwargs, get_scalar in case_list:
+        error = create_error(error_name, x_label, y_label, 1.0, exp_data, None, **kwargs)
+        prd_data = get_prd_data(exp_data, x_label, y_label or x_label, factors)
+        scalar_value = get_scalar(exp_data, prd_data, x_label, y_label)
+        assert error.get_value(prd_data) == pytest.approx(scalar_value, rel=1e-12, abs=0), error_name
+
+@pytest.mark.parametrize("factors", FACTOR_LIST)
+def test_area_lookup(factors):
+    """
+    Checks that looking up the experimental curve in a table changes the `area` error
+    by less than the documented tolerance
+    """
+    for exp_data, x_label, y_label in [(get_exp_data(CREEP_FILE), "time", "strain"), (get_exp_data(TENS_FILE), "strain", "stress")]:
+        error = create_error("area", x_label, y_label, 1.0, exp_data, None, lookup=True)
+        prd_data = get_prd_data(exp_data, x_label, y_label, factors)
+        scalar_value = get_area(exp_data, prd_data, x_label, y_label)
+        assert error.get_value(prd_data) == pytest.approx(scalar_value, rel=1e-4, abs=0)
@@ -0,0 +1,73 @@
+"""
+ Title:         Isolation tests
+ Description:   Checks that isolated simulations that run out of time or crash are
+                killed and recorded without affecting the calling process
+ Author:        Janzen Choi
+
+"""
+
+# Libraries
+import os, signal, time
+from moga_neml.helper.general import run_isolated
+from moga_neml.optimise.controller import BIG_VALUE, MAX_FAILURES
+
+def return_value() -> int:
+    """
+    Returns a value
+    """
+    return 1
+
+def sleep() -> None:
+    """
+    Runs for longer than the time limit of the tests
+    """
+    time.sleep(10)
+
+def crash() -> None:
+    """
+    Crashes with a segmentation fault
+    """
+    os.kill(os.getpid(), signal.SIGSEGV)
+
+def raise_error() -> None:
+    """
+    Raises an error
+    """
+    raise ValueError
+
+def test_run_isolated():
+    """
+    Checks the returned values and causes of failure of isolated functions
+    """
+    assert run_isolated(return_value, 5) == (1, None)
+    assert run_isolated(sleep, 0.5) == (None, "timeout")
+    assert run_isolated(crash, 5) == (None, "crash")
+    assert run_isolated(raise_error, 5) == (None, "error")
+    assert run_isolated(return_value, 5) == (1, None)
+
+def test_isolated_timeout(get_interface, params_list):
+    """
+    Checks that simulations that run out of time are treated as failed and recorded
+    """
+    itf = get_interface()
+    itf.isolate_simulations(0.001)
+    controller = itf.__controller__
+    objective_dict = controller.calculate_objectives(*params_list[0])
+    assert all(value == BIG_VALUE for value in objective_dict.values())
+    assert controller.get_stat_dict()["Failed (timeout)"] == 1
+    assert controller.get_failure_list()[0]["failure"] == "timeout"
+
+def test_failure_limit(get_interface, params_list):
+    """
+    Checks that only the counts of the failures and the latest failures are kept,
+    including the failures sent back by workers
+    """
+    controller = get_interface().__controller__
+    curve = controller.get_curve_list()[0]
+    for _ in range(MAX_FAILURES + 10):
+        controller.add_failure(curve, "crash", *params_list[0])
+    stat_dict = controller.pop_stat_dict()
+    controller.merge_stat_dict(stat_dict)
+    controller.merge_stat_dict(stat_dict)
+    assert controller.get_stat_dict() == {"Failed (crash)": 2 * (MAX_FAILURES + 10)}
+    assert len(controller.get_failure_list()) == MAX_FAILURES
@@ -0,0 +1,65 @@
+"""
+ Title:         Pool tests
+ Description:   Checks that evaluating sets of parameters over worker processes gives
+                the same objectives as evaluating them in the main process
+ Author:        Janzen Choi
+
+"""
+
+# Libraries
+from conftest import DATA_PATH, CREEP_FILE
+from moga_neml.interface import Interface
+from moga_neml.optimise.pool import Pool
+
+def test_pool_matches_serial(get_interface, params_list):
+    """
+    Checks that the pool of workers returns the objectives of each set of parameters in order
+    """
+    controller = get_interface().__controller__
+    pool = Pool(controller, 2)
+    try:
+        pool_list = pool.evaluate(params_list)
+    finally:
+        pool.close()
+    serial_list = [controller.calculate_objectives(*params) for params in params_list]
+    assert pool_list == serial_list
+
+def test_curve_pool_matches_serial(get_interface, params_list):
+    """
+    Checks that simulating the curves of each set of parameters concurrently gives the
+    same objectives as simulating them one by one
+    """
+    itf = get_interface()
+    itf.parallelise_curves(2)
+    controller = itf.__controller__
+    controller.open_curve_pool()
+    try:
+        pool_list = [controller.calculate_objectives(*params) for params in params_list]
+    finally:
+        controller.close_curve_pool()
+    controller = get_interface().__controller__
+    serial_list = [controller.calculate_objectives(*params) for params in params_list]
+    assert pool_list == serial_list
+
+def test_curve_pool_shares_fields(tmp_path):
+    """
+    Checks that repeated specimens scored by errors reading different fields share one
+    simulation that keeps the fields of both, whether or not the curves are simulated concurrently
+    """
+    objective_dict_list = []
+    for workers in [1, 2]:
+        itf = Interface("test", input_path=DATA_PATH, output_path=str(tmp_path), verbose=False)
+        itf.define_model("evpcd")
+        itf.read_data(CREEP_FILE)
+        itf.add_error("area", "time", "strain")
+        itf.read_data(CREEP_FILE)
+        itf.add_error("damage")
+        itf.parallelise_curves(workers)
+        controller = itf.__controller__
+        controller.open_curve_pool()
+        try:
+            objective_dict_list.append(controller.calculate_objectives(15.5, 158.4, 0.535, 4.42, 1866.2, 1000.0, 10.0, 10.0))
+        finally:
+            controller.close_curve_pool()
+        assert controller.get_stat_dict()["Shared simulations"] == 1
+    assert objective_dict_list[0] == objective_dict_list[1]
@@ -0,0 +1,115 @@
+"""
+ Title:         Reader tests
+ Description:   Checks that the cached curves and the stores give the same experimental
+                data as parsing the CSV files
+ Author:        Janzen Choi
+
+"""
+
+# Libraries
+import glob, os, shutil
+import numpy as np
+import pytest
+from conftest import DATA_PATH, CREEP_FILE, TENS_FILE
+from moga_neml.io import reader
+from moga_neml.io.reader import get_curve_dict, read_exp_data, read_exp_data_list
+from moga_neml.io.store import write_exp_store
+
+# Constants
+OTHER_FILE = "creep/inl_1/AirBase_800_70_G44.csv"
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    """
+    Caches the curves in a temporary folder, which has not been pruned yet
+    """
+    cache_dir = str(tmp_path / "cache")
+    monkeypatch.setattr(reader, "CACHE_DIR", cache_dir)
+    monkeypatch.setattr(reader, "PRUNED_DIRS", set())
+    return cache_dir
+
+def copy_files(tmp_path, file_list:list) -> str:
+    """
+    Copies sample curves into a temporary folder
+
+    Parameters:
+    * `tmp_path`:  The temporary folder
+    * `file_list`: The list of paths to the curves, relative to the data folder
+
+    Returns the path to the folder of the copies
+    """
+    data_dir = str(tmp_path / "data")
+    os.makedirs(data_dir, exist_ok=True)
+    for file in file_list:
+        shutil.copy(f"{DATA_PATH}/{file}", data_dir)
+    return data_dir
+
+@pytest.mark.parametrize("file", [CREEP_FILE, TENS_FILE])
+def test_cached_curve(cache_dir, file):
+    """
+    Checks that parsing a CSV file and loading its cached curve give the same data
+    """
+    file_dir, file_name = os.path.split(f"{DATA_PATH}/{file}")
+    exp_data = read_exp_data(file_dir, file_name, True, 1000)
+    assert read_exp_data(file_dir, file_name, True, 1000, cache=True) == exp_data
+    assert len(glob.glob(f"{cache_dir}/*.npz")) == 1
+    assert read_exp_data(file_dir, file_name, True, 1000, cache=True) == exp_data
+
+def test_changed_file(cache_dir, tmp_path):
+    """
+    Checks that the cached curve of a CSV file is not used once the file changes
+    """
+    data_dir = copy_files(tmp_path, [CREEP_FILE])
+    file_name = os.path.basename(CREEP_FILE)
+    exp_data = read_exp_data(data_dir, file_name, False, 0, cache=True)
+    with open(f"{data_dir}/{file_name}", "r") as file:
+        line_list = file.read().splitlines()
+    with open(f"{data_dir}/{file_name}", "w") as file:
+        file.write("\n".join(line_list[:-1]) + "\n")
+    assert len(read_exp_data(data_dir, file_name, False, 0, cache=True)["time"]) == len(exp_data["time"]) - 1
+
+def test_prune_once(cache_dir, tmp_path, monkeypatch):
+    """
+    Checks that the cache folder is scanned once when reading several files, and that
+    the cached curves of removed files are pruned
+    """
+    data_dir = copy_files(tmp_path, [CREEP_FILE, TENS_FILE, OTHER_FILE])
+    read_exp_data(data_dir, os.path.basename(CREEP_FILE), True, 1000, cache=True)
+    os.remove(f"{data_dir}/{os.path.basename(CREEP_FILE)}")
+
+    # Read the remaining files in a new process (i.e., with the cache folder not yet pruned)
+    monkeypatch.setattr(reader, "PRUNED_DIRS", set())
+    scan_list, scan = [], glob.glob
+    monkeypatch.setattr(reader.glob, "glob", lambda pattern: scan_list.append(pattern) or scan(pattern))
+    file_name_list = [os.path.basename(TENS_FILE), os.path.basename(OTHER_FILE)]
+    read_exp_data_list(data_dir, file_name_list, True, 1000, cache=True)
+    assert len(scan_list) == 1
+    cached_list = []
+    for cache_path in glob.glob(f"{cache_dir}/*.npz"):
+        with np.load(cache_path, allow_pickle=False) as cached:
+            cached_list.append(os.path.basename(str(cached["arr_1"])))
+    assert sorted(cached_list) == sorted(file_name_list)
+
+@pytest.mark.parametrize("thin_data", [True, False])
+def test_store_matches_csv(tmp_path, thin_data):
+    """
+    Checks that reading a store gives the same experimental data as parsing its CSV file,
+    whether the files are read in this process or by several processes
+    """
+    file_list = [CREEP_FILE, TENS_FILE]
+    store_dir = str(tmp_path / "stores")
+    for file in file_list:
+        with open(f"{DATA_PATH}/{file}", "r") as csv_file:
+            write_exp_store(get_curve_dict(csv_file.read().splitlines(), False, 0), f"{store_dir}/{os.path.basename(file)}")
+    for num_processes in [1, 2]:
+        csv_data_list = read_exp_data_list(DATA_PATH, file_list, thin_data, 1000, num_processes=num_processes)
+        store_data_list = read_exp_data_list(store_dir, [os.path.basename(file) for file in file_list], thin_data, 1000, num_processes=num_processes)
+        for csv_data, store_data in zip(csv_data_list, store_data_list):
+            assert csv_data.keys() == store_data.keys()
+            for field, value in csv_data.items():
+                if field == "file_name":
+                    continue
+                if isinstance(value, list):
+                    assert np.array_equal(store_data[field], value), field
+                else:
+                    assert store_data[field] == value, field